@@ -14,6 +14,7 @@ Environment Variables:
     DASHBOARD_SLACK_WEBHOOK_URL: Slack webhook URL
     DASHBOARD_DB_HOST: Database host (default: localhost)
     DASHBOARD_DB_NAME: Database name (default: nick)
+    DASHBOARD_PGBOUNCER_URL: PgBouncer DSN; replaces the in-process pool when set
 
     For email accounts, use indexed variables:
     DASHBOARD_EMAIL_0_ADDRESS: First email address
@@ -22,37 +23,65 @@ Environment Variables:
     DASHBOARD_EMAIL_1_APP_PASSWORD: Second email app password
 """
 
+import copy
+import functools
 import logging
 import os
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Optional
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # libyaml bindings not available
+    from yaml import SafeLoader as _SafeLoader
+
+try:
+    import fastjsonschema
+except ImportError:  # Schema validation is skipped without it
+    fastjsonschema = None
+
 logger = logging.getLogger(__name__)
 
+if _SafeLoader.__name__ != "CSafeLoader":
+    logger.info("libyaml not available, using pure-Python YAML loader")
+
 # Environment variable prefix
 ENV_PREFIX = "DASHBOARD_"
 
+# Matches indexed email account variables (prefix already stripped)
+_EMAIL_ENV_RE = re.compile(r"EMAIL_(\d+)_ADDRESS$")
+
+# Matches a config value that is entirely a ${VAR_NAME} reference
+_ENV_REF_RE = re.compile(r"^\$\{([A-Za-z_][A-Za-z0-9_]*)\}$")
+
+# Parsed YAML cache: resolved path -> (mtime_ns, size, parsed dict, needs_interp)
+_yaml_cache: dict[str, tuple[int, int, dict, bool]] = {}
+
 
 class ConfigurationError(Exception):
     """Raised when configuration is invalid or missing required values."""
     pass
 
 
-@dataclass
+@dataclass(slots=True)
 class DatabaseConfig:
     """Database connection configuration."""
     name: str = "nick"
     host: str = "localhost"
+    pool_min: Optional[int] = None  # None: size from CPU count
+    pool_max: Optional[int] = None
+    pgbouncer_url: str = ""
 
     def to_psycopg2_params(self) -> dict:
         """Return parameters for psycopg2.connect()."""
         return {"dbname": self.name, "host": self.host}
 
 
-@dataclass
+@dataclass(slots=True)
 class TodoistConfig:
     """Todoist integration configuration."""
     token: str = ""
@@ -63,7 +92,7 @@ class TodoistConfig:
         return bool(self.token)
 
 
-@dataclass
+@dataclass(slots=True)
 class LinearConfig:
     """Linear integration configuration."""
     api_key: str = ""
@@ -74,14 +103,14 @@ class LinearConfig:
         return bool(self.api_key and self.team_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class GitConfig:
     """Git repository scanning configuration."""
     scan_paths: list[str] = field(default_factory=lambda: ["~/clawd/projects"])
     history_days: int = 7
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailAccount:
     """Single email account configuration."""
     email: str
@@ -94,7 +123,7 @@ class EmailAccount:
         return bool(self.email and self.app_password)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailConfig:
     """Email integration configuration."""
     accounts: list[EmailAccount] = field(default_factory=list)
@@ -106,7 +135,7 @@ class EmailConfig:
         return [a for a in self.accounts if a.is_configured]
 
 
-@dataclass
+@dataclass(slots=True)
 class TelegramConfig:
     """Telegram notification configuration."""
     enabled: bool = False
@@ -118,7 +147,7 @@ class TelegramConfig:
         return self.enabled and bool(self.bot_token and self.chat_id)
 
 
-@dataclass
+@dataclass(slots=True)
 class SlackConfig:
     """Slack notification configuration."""
     enabled: bool = False
@@ -130,7 +159,7 @@ class SlackConfig:
         return self.enabled and bool(self.webhook_url)
 
 
-@dataclass
+@dataclass(slots=True)
 class NotificationsConfig:
     """Notifications configuration."""
     telegram: TelegramConfig = field(default_factory=TelegramConfig)
@@ -142,7 +171,7 @@ class NotificationsConfig:
     })
 
 
-@dataclass
+@dataclass(slots=True)
 class IntegrationsConfig:
     """External integrations paths."""
     school_db: str = "~/clawd/data/school-automation.db"
@@ -151,7 +180,7 @@ class IntegrationsConfig:
     monzo_api: str = "http://localhost/api/v1"
 
 
-@dataclass
+@dataclass(slots=True)
 class ServerConfig:
     """Server configuration."""
     port: int = 8889
@@ -159,7 +188,7 @@ class ServerConfig:
     refresh_interval: int = 300
 
 
-@dataclass
+@dataclass(slots=True)
 class AppConfig:
     """Complete application configuration."""
     database: DatabaseConfig = field(default_factory=DatabaseConfig)
@@ -175,19 +204,36 @@ class AppConfig:
 
     def to_dict(self) -> dict:
         """Convert to dictionary format (for backward compatibility)."""
-        return {
-            "database": {"name": self.database.name, "host": self.database.host},
-            "todoist": {"token": self.todoist.token, "projects": self.todoist.projects},
-            "linear": {"api_key": self.linear.api_key, "team_id": self.linear.team_id},
-            "git": {"scan_paths": self.git.scan_paths, "history_days": self.git.history_days},
-            "email": {
+        return {name: self.to_section(name) for name in CONFIG_SECTIONS}
+
+    def to_section(self, name: str) -> Any:
+        """
+        Convert a single top-level section to dictionary format.
+
+        A fresh dict is built on every call, so it reflects the current
+        field values; ConfigProxy memoizes the sections it hands out.
+
+        Raises:
+            KeyError: If name is not a known config section
+        """
+        if name == "database":
+            return {"name": self.database.name, "host": self.database.host}
+        if name == "todoist":
+            return {"token": self.todoist.token, "projects": self.todoist.projects}
+        if name == "linear":
+            return {"api_key": self.linear.api_key, "team_id": self.linear.team_id}
+        if name == "git":
+            return {"scan_paths": self.git.scan_paths, "history_days": self.git.history_days}
+        if name == "email":
+            return {
                 "accounts": [
                     {"email": a.email, "name": a.name, "priority": a.priority, "app_password": a.app_password}
                     for a in self.email.accounts
                 ],
                 "extract_pdfs": self.email.extract_pdfs
-            },
-            "notifications": {
+            }
+        if name == "notifications":
+            return {
                 "telegram": {
                     "enabled": self.notifications.telegram.enabled,
                     "bot_token": self.notifications.telegram.bot_token,
@@ -199,26 +245,136 @@ class AppConfig:
                     "channel": self.notifications.slack.channel
                 },
                 "routing": self.notifications.routing
-            },
-            "integrations": {
+            }
+        if name == "integrations":
+            return {
                 "school_db": self.integrations.school_db,
                 "health_data": self.integrations.health_data,
                 "sprint_logs": self.integrations.sprint_logs,
                 "monzo_api": self.integrations.monzo_api
-            },
-            "server": {
+            }
+        if name == "server":
+            return {
                 "port": self.server.port,
                 "host": self.server.host,
                 "refresh_interval": self.server.refresh_interval
+            }
+        if name == "kanban":
+            return self.kanban
+        if name == "scheduling":
+            return self.scheduling
+        raise KeyError(name)
+
+
+# Top-level section names exposed by AppConfig.to_dict() / ConfigProxy
+CONFIG_SECTIONS = (
+    "database", "todoist", "linear", "git", "email",
+    "notifications", "integrations", "server", "kanban", "scheduling"
+)
+
+
+def _section(properties: dict, nullable: bool = False) -> dict:
+    """Build a JSON Schema object definition for one config section."""
+    return {
+        "type": ["object", "null"] if nullable else "object",
+        "properties": properties
+    }
+
+
+_STRING = {"type": "string"}
+_BOOLEAN = {"type": "boolean"}
+_STRING_LIST = {"type": "array", "items": _STRING}
+_STRING_OR_INT = {"type": ["string", "integer"]}
+
+# JSON Schema for the raw YAML. Unknown keys are allowed so that newer
+# config files keep loading on older code.
+CONFIG_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "database": _section({
+            "name": _STRING,
+            "host": _STRING,
+            "pool_min": {"type": "integer", "minimum": 1},
+            "pool_max": {"type": "integer", "minimum": 1},
+            "pgbouncer_url": _STRING
+        }),
+        "todoist": _section({"token": _STRING, "projects": _STRING_LIST}),
+        "linear": _section({"api_key": _STRING, "team_id": _STRING_OR_INT}),
+        "git": _section({
+            "scan_paths": _STRING_LIST,
+            "history_days": {"type": "integer", "minimum": 1}
+        }),
+        "email": _section({
+            "accounts": {
+                "type": "array",
+                "items": _section({
+                    "email": _STRING,
+                    "name": _STRING,
+                    "priority": _STRING,
+                    "app_password": _STRING
+                })
             },
-            "kanban": self.kanban,
-            "scheduling": self.scheduling
-        }
+            "extract_pdfs": _BOOLEAN
+        }),
+        "notifications": _section({
+            "telegram": _section({"enabled": _BOOLEAN, "bot_token": _STRING, "chat_id": _STRING_OR_INT}),
+            "slack": _section({"enabled": _BOOLEAN, "webhook_url": _STRING, "channel": _STRING}),
+            "routing": {"type": "object", "additionalProperties": _STRING_LIST}
+        }),
+        "integrations": _section({
+            "school_db": _STRING,
+            "health_data": _STRING,
+            "sprint_logs": _STRING,
+            "monzo_api": _STRING
+        }),
+        "server": _section({
+            "port": {"type": "integer", "minimum": 1, "maximum": 65535},
+            "host": _STRING,
+            "refresh_interval": {"type": "integer", "minimum": 1}
+        }),
+        "kanban": _section({}, nullable=True),
+        "scheduling": _section({}, nullable=True)
+    }
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _get_schema_validator() -> Optional[Callable[[dict], Any]]:
+    """Compile CONFIG_SCHEMA once; None if fastjsonschema is not installed."""
+    if fastjsonschema is None:
+        logger.debug("fastjsonschema not installed, skipping config schema validation")
+        return None
+    return fastjsonschema.compile(CONFIG_SCHEMA)
+
+
+def _validate_raw_config(raw: dict, config_path: Path) -> None:
+    """
+    Validate raw YAML against CONFIG_SCHEMA.
+
+    Raises:
+        ConfigurationError: With the offending path, rule and value
+    """
+    validator = _get_schema_validator()
+    if validator is None:
+        return
+    try:
+        validator(raw)
+    except fastjsonschema.JsonSchemaValueException as e:
+        path = "/".join(str(p) for p in e.path[1:]) or "<root>"
+        raise ConfigurationError(
+            f"Invalid config in {config_path} at '{path}': {e.message} (got {e.value!r})"
+        )
+
+
+def _snapshot_env() -> dict[str, str]:
+    """Return all DASHBOARD_-prefixed environment variables with the prefix stripped."""
+    prefix_len = len(ENV_PREFIX)
+    return {k[prefix_len:]: v for k, v in os.environ.items() if k.startswith(ENV_PREFIX)}
 
 
-def _get_env(key: str, default: str = "") -> str:
-    """Get environment variable with DASHBOARD_ prefix."""
-    return os.environ.get(f"{ENV_PREFIX}{key}", default)
+def _get_env(env: dict[str, str], key: str, default: str = "") -> str:
+    """Get a DASHBOARD_-prefixed variable from an environment snapshot."""
+    return env.get(key, default)
 
 
 def _resolve_env_value(value: Any) -> Any:
@@ -227,58 +383,86 @@ def _resolve_env_value(value: Any) -> Any:
 
     Supports ${VAR_NAME} syntax for environment variable substitution.
     """
-    if not isinstance(value, str):
+    if not isinstance(value, str) or "${" not in value:
         return value
 
-    if value.startswith("${") and value.endswith("}"):
-        env_var = value[2:-1]
-        return os.environ.get(env_var, "")
+    match = _ENV_REF_RE.match(value)
+    if match:
+        return os.environ.get(match.group(1), "")
 
     return value
 
 
-def _load_yaml_config(config_path: Path) -> dict:
-    """Load and parse YAML config file."""
+def _no_env_value(value: Any) -> Any:
+    """Identity resolver used when the config file has no ${VAR} references."""
+    return value
+
+
+def _load_yaml_config(config_path: Path) -> tuple[dict, bool]:
+    """
+    Load and parse YAML config file.
+
+    Parsed results are cached by resolved path and invalidated when the
+    file's mtime or size changes, so repeated loads skip re-parsing.
+
+    Returns:
+        Tuple of (parsed config dict, whether the file contains ${VAR} references)
+    """
     if not config_path.exists():
         logger.info(f"Config file not found at {config_path}, using defaults")
-        return {}
+        return {}, False
 
     try:
-        with open(config_path) as f:
-            raw_config = yaml.safe_load(f)
-            if raw_config is None:
-                logger.warning(f"Config file {config_path} is empty")
-                return {}
-            return raw_config
+        st = config_path.stat()
+        cache_key = str(config_path.resolve())
+        cached = _yaml_cache.get(cache_key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            return copy.deepcopy(cached[2]), cached[3]
+
+        with open(config_path, "rb") as f:
+            raw_bytes = f.read()
+        needs_interp = b"${" in raw_bytes
+        raw_config = yaml.load(raw_bytes, Loader=_SafeLoader)
+        if raw_config is None:
+            logger.warning(f"Config file {config_path} is empty")
+            raw_config = {}
+
+        _yaml_cache[cache_key] = (st.st_mtime_ns, st.st_size, raw_config, needs_interp)
+        return copy.deepcopy(raw_config), needs_interp
     except yaml.YAMLError as e:
         raise ConfigurationError(f"YAML syntax error in {config_path}: {e}")
     except PermissionError:
         raise ConfigurationError(f"Permission denied reading {config_path}")
 
 
-def _build_database_config(raw: dict) -> DatabaseConfig:
+def _build_database_config(raw: dict, env: dict[str, str]) -> DatabaseConfig:
     """Build database config from raw dict + environment."""
     db_raw = raw.get("database", {})
     return DatabaseConfig(
-        name=_get_env("DB_NAME") or db_raw.get("name", "nick"),
-        host=_get_env("DB_HOST") or db_raw.get("host", "localhost")
+        name=_get_env(env, "DB_NAME") or db_raw.get("name", "nick"),
+        host=_get_env(env, "DB_HOST") or db_raw.get("host", "localhost"),
+        pool_min=db_raw.get("pool_min"),
+        pool_max=db_raw.get("pool_max"),
+        pgbouncer_url=_get_env(env, "PGBOUNCER_URL") or db_raw.get("pgbouncer_url", "")
     )
 
 
-def _build_todoist_config(raw: dict) -> TodoistConfig:
+def _build_todoist_config(raw: dict, env: dict[str, str],
+                           resolve: Callable[[Any], Any] = _resolve_env_value) -> TodoistConfig:
     """Build Todoist config from raw dict + environment."""
     todoist_raw = raw.get("todoist", {})
-    token = _get_env("TODOIST_TOKEN") or _resolve_env_value(todoist_raw.get("token", ""))
+    token = _get_env(env, "TODOIST_TOKEN") or resolve(todoist_raw.get("token", ""))
     return TodoistConfig(
         token=token,
         projects=todoist_raw.get("projects", [])
     )
 
 
-def _build_linear_config(raw: dict) -> LinearConfig:
+def _build_linear_config(raw: dict, env: dict[str, str],
+                          resolve: Callable[[Any], Any] = _resolve_env_value) -> LinearConfig:
     """Build Linear config from raw dict + environment."""
     linear_raw = raw.get("linear", {})
-    api_key = _get_env("LINEAR_API_KEY") or _resolve_env_value(linear_raw.get("api_key", ""))
+    api_key = _get_env(env, "LINEAR_API_KEY") or resolve(linear_raw.get("api_key", ""))
     return LinearConfig(
         api_key=api_key,
         team_id=linear_raw.get("team_id", "")
@@ -294,7 +478,8 @@ def _build_git_config(raw: dict) -> GitConfig:
     )
 
 
-def _build_email_config(raw: dict) -> EmailConfig:
+def _build_email_config(raw: dict, env: dict[str, str],
+                         resolve: Callable[[Any], Any] = _resolve_env_value) -> EmailConfig:
     """Build email config from raw dict + environment."""
     email_raw = raw.get("email", {})
     accounts = []
@@ -305,20 +490,20 @@ def _build_email_config(raw: dict) -> EmailConfig:
             email=acc.get("email", ""),
             name=acc.get("name", ""),
             priority=acc.get("priority", "medium"),
-            app_password=_resolve_env_value(acc.get("app_password", ""))
+            app_password=resolve(acc.get("app_password", ""))
         ))
 
     # Then, check for environment variable overrides/additions
     # Format: DASHBOARD_EMAIL_0_ADDRESS, DASHBOARD_EMAIL_0_APP_PASSWORD
-    idx = 0
-    while True:
-        email_addr = _get_env(f"EMAIL_{idx}_ADDRESS")
+    max_idx = max((int(m.group(1)) for k in env if (m := _EMAIL_ENV_RE.match(k))), default=-1)
+    for idx in range(max_idx + 1):
+        email_addr = _get_env(env, f"EMAIL_{idx}_ADDRESS")
         if not email_addr:
             break
 
-        app_password = _get_env(f"EMAIL_{idx}_APP_PASSWORD")
-        name = _get_env(f"EMAIL_{idx}_NAME") or email_addr.split("@")[0]
-        priority = _get_env(f"EMAIL_{idx}_PRIORITY") or "medium"
+        app_password = _get_env(env, f"EMAIL_{idx}_APP_PASSWORD")
+        name = _get_env(env, f"EMAIL_{idx}_NAME") or email_addr.split("@")[0]
+        priority = _get_env(env, f"EMAIL_{idx}_PRIORITY") or "medium"
 
         # Check if this email already exists in accounts (override)
         found = False
@@ -337,21 +522,20 @@ def _build_email_config(raw: dict) -> EmailConfig:
                 app_password=app_password
             ))
 
-        idx += 1
-
     return EmailConfig(
         accounts=accounts,
         extract_pdfs=email_raw.get("extract_pdfs", True)
     )
 
 
-def _build_notifications_config(raw: dict) -> NotificationsConfig:
+def _build_notifications_config(raw: dict, env: dict[str, str],
+                                 resolve: Callable[[Any], Any] = _resolve_env_value) -> NotificationsConfig:
     """Build notifications config from raw dict + environment."""
     notif_raw = raw.get("notifications", {})
 
     # Telegram
     telegram_raw = notif_raw.get("telegram", {})
-    telegram_token = _get_env("TELEGRAM_BOT_TOKEN") or _resolve_env_value(telegram_raw.get("bot_token", ""))
+    telegram_token = _get_env(env, "TELEGRAM_BOT_TOKEN") or resolve(telegram_raw.get("bot_token", ""))
     telegram = TelegramConfig(
         enabled=telegram_raw.get("enabled", False),
         bot_token=telegram_token,
@@ -360,7 +544,7 @@ def _build_notifications_config(raw: dict) -> NotificationsConfig:
 
     # Slack
     slack_raw = notif_raw.get("slack", {})
-    slack_webhook = _get_env("SLACK_WEBHOOK_URL") or _resolve_env_value(slack_raw.get("webhook_url", ""))
+    slack_webhook = _get_env(env, "SLACK_WEBHOOK_URL") or resolve(slack_raw.get("webhook_url", ""))
     slack = SlackConfig(
         enabled=slack_raw.get("enabled", False),
         webhook_url=slack_webhook,
@@ -412,20 +596,25 @@ def load_config(config_path: Optional[Path] = None) -> AppConfig:
         AppConfig with all settings loaded
 
     Raises:
-        ConfigurationError: If config file has syntax errors or is unreadable
+        ConfigurationError: If config file has syntax errors, is unreadable,
+            or does not match CONFIG_SCHEMA
     """
     if config_path is None:
         config_path = Path(__file__).parent / "config.yaml"
 
-    raw = _load_yaml_config(config_path)
+    raw, needs_interp = _load_yaml_config(config_path)
+    _validate_raw_config(raw, config_path)
+    env = _snapshot_env()
+    # Skip ${VAR} resolution entirely when the file has no references
+    resolve = _resolve_env_value if needs_interp else _no_env_value
 
     config = AppConfig(
-        database=_build_database_config(raw),
-        todoist=_build_todoist_config(raw),
-        linear=_build_linear_config(raw),
+        database=_build_database_config(raw, env),
+        todoist=_build_todoist_config(raw, env, resolve),
+        linear=_build_linear_config(raw, env, resolve),
         git=_build_git_config(raw),
-        email=_build_email_config(raw),
-        notifications=_build_notifications_config(raw),
+        email=_build_email_config(raw, env, resolve),
+        notifications=_build_notifications_config(raw, env, resolve),
         integrations=_build_integrations_config(raw),
         server=_build_server_config(raw),
         kanban=raw.get("kanban", {}),
@@ -478,10 +667,9 @@ def validate_config(config: AppConfig, required_services: Optional[list[str]] =
     if not (1 <= config.server.port <= 65535):
         errors.append(f"Server port {config.server.port} is out of valid range (1-65535)")
 
-    # Validate git scan paths exist (warning only)
-    for path in config.git.scan_paths:
-        expanded = os.path.expanduser(path)
-        if not os.path.isdir(expanded):
+    # Validate git scan paths exist (warning only); duplicates are stat'ed once
+    for expanded in dict.fromkeys(Path(p).expanduser() for p in config.git.scan_paths):
+        if not expanded.is_dir():
             logger.warning(f"Git scan path does not exist: {expanded}")
 
     return errors
@@ -503,9 +691,24 @@ def reload_config(config_path: Optional[Path] = None) -> AppConfig:
     """Force reload of configuration."""
     global _config
     _config = load_config(config_path)
+    if "config" in globals():
+        globals()["config"] = _config
     return _config
 
 
+def __getattr__(name: str) -> Any:
+    """
+    Lazily load the configuration on first access to ``config_loader.config``.
+
+    After the first access the attribute is a plain module global, so
+    ``config_loader.config`` costs no more than any other module lookup.
+    """
+    if name == "config":
+        globals()["config"] = get_config()
+        return globals()["config"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # Backward compatibility: dict-like access
 class ConfigProxy:
     """
@@ -513,18 +716,33 @@ class ConfigProxy:
 
     This allows existing code using config['todoist']['token'] to continue working.
     """
+    __slots__ = ("_config", "_sections")
+
     def __init__(self, config: AppConfig):
         self._config = config
-        self._dict = config.to_dict()
+        self._sections: dict[str, Any] = {}
 
     def __getitem__(self, key: str) -> Any:
-        return self._dict[key]
+        # Sections are converted on first access and cached
+        try:
+            return self._sections[key]
+        except KeyError:
+            pass
+        if key not in CONFIG_SECTIONS:
+            raise KeyError(key)
+        section = self._sections[key] = self._config.to_section(key)
+        return section
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self._dict.get(key, default)
+        if key not in CONFIG_SECTIONS:
+            return default
+        return self[key]
 
     def __contains__(self, key: str) -> bool:
-        return key in self._dict
+        return key in CONFIG_SECTIONS
+
+    def __iter__(self):
+        return iter(CONFIG_SECTIONS)
 
 
 def get_config_dict() -> ConfigProxy:
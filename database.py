@@ -1,78 +1,267 @@
 """
 Database module for Project Dashboard analytics.
 Uses PostgreSQL for storing historical snapshots with connection pooling.
+
+Read helpers return rows straight from RealDictCursor. RealDictRow is a
+dict subclass, so callers that need to mutate a row should copy it first.
 """
 
+import atexit
+import functools
+import io
+import itertools
 import json
 import logging
-from datetime import datetime, date, timedelta
+import os
+import queue
+import re
+import threading
+import time
+import weakref
+from collections import Counter
+from datetime import datetime, timedelta
+from decimal import Decimal
 from pathlib import Path
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 from contextlib import contextmanager
 
-import psycopg2
-from psycopg2.extras import RealDictCursor
-from psycopg2 import pool
-
 from config_loader import get_config
 
+try:
+    import orjson
+except ImportError:  # JSONB parameters fall back to the stdlib encoder
+    orjson = None
+
+if TYPE_CHECKING:
+    from psycopg2 import pool
+
 logger = logging.getLogger(__name__)
 
+# =============================================================================
+# Lazy psycopg2 Import
+# =============================================================================
+
+# psycopg2 (and libpq) are only loaded on first database use, so processes
+# that import this module without touching the database skip that cost.
+psycopg2 = None
+RealDictCursor = None
+Json = None
+execute_values = None
+pool = None
+_psycopg2_loaded = False
+
+
+def _load_psycopg2() -> None:
+    """Import psycopg2 on first use and bind it to module globals."""
+    global psycopg2, RealDictCursor, Json, execute_values, pool, _psycopg2_loaded
+
+    if _psycopg2_loaded:
+        return
+
+    import psycopg2 as _psycopg2
+    from psycopg2 import pool as _pool
+    from psycopg2.extras import Json as _Json
+    from psycopg2.extras import RealDictCursor as _RealDictCursor
+    from psycopg2.extras import execute_values as _execute_values
+
+    psycopg2, RealDictCursor, pool = _psycopg2, _RealDictCursor, _pool
+    Json, execute_values = _Json, _execute_values
+    _psycopg2_loaded = True
+
+
+def _dumps_json(obj: Any) -> str:
+    """Serialize a JSONB parameter, using orjson when it is installed."""
+    if orjson is not None:
+        # Counter-based breakdowns are keyed by int priority
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def _json(obj: Any) -> "Json":
+    """Adapt obj as a JSONB query parameter."""
+    return Json(obj, dumps=_dumps_json)
+
+
+def _loads_json(text: str) -> Any:
+    """Parse a JSON document returned by the server, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _fetch_json_agg(cur, query: str, params, order_by: str,
+                    timestamps: tuple[str, ...] = (), decimals: tuple[str, ...] = ()) -> list[dict]:
+    """
+    Run query and return its rows aggregated into one JSON array server-side.
+
+    Saves building a result row per record on the client for the longer
+    history listings. JSON has no timestamp or exact decimal type, so the
+    timestamps columns are parsed back from ISO 8601 into datetimes, and
+    the decimals columns (selected as ::text by the query) into Decimals,
+    matching what a regular cursor returns.
+    """
+    cur.execute(f"""
+        SELECT COALESCE(json_agg(t ORDER BY {order_by}), '[]')::text AS rows
+        FROM ({query}) t
+    """, params)
+    rows = _loads_json(cur.fetchone()['rows'])
+    for row in rows:
+        for column in timestamps:
+            if row.get(column) is not None:
+                row[column] = datetime.fromisoformat(row[column])
+        for column in decimals:
+            if row.get(column) is not None:
+                row[column] = Decimal(row[column])
+    return rows
+
+
 # =============================================================================
 # Connection Pool Management
 # =============================================================================
 
 # Module-level connection pool
-_connection_pool: Optional[pool.ThreadedConnectionPool] = None
+_connection_pool: Optional["pool.ThreadedConnectionPool"] = None
+_pool_lock = threading.Lock()
+_atexit_registered = False
+# (DatabaseConfig, connect params) for the config last used to connect
+_db_params_cache: Optional[tuple[Any, dict]] = None
 
 
 class PoolConfig:
     """Connection pool configuration constants."""
-    MIN_CONNECTIONS = 2
-    MAX_CONNECTIONS = 10
+    # Defaults when database.pool_min / pool_max are not configured
+    MIN_CONNECTIONS = max(4, os.cpu_count() or 1)
+    MAX_CONNECTIONS = max(20, 4 * (os.cpu_count() or 1))
+    # How long get_connection() waits for a free pooled connection
+    GETCONN_TIMEOUT_SECONDS = 2.0
+    GETCONN_RETRY_SECONDS = 0.005
+
+
+class PoolExhausted(Exception):
+    """Raised when no pooled connection frees up within the wait timeout."""
+    pass
+
+
+class HealthConfig:
+    """Health check configuration constants."""
+    # A connection used successfully this recently counts as healthy
+    RECENT_SUCCESS_SECONDS = 5
+    PROBE_CONNECT_TIMEOUT = 1
+
+
+# time.monotonic() of the last get_connection() block that exited cleanly
+_last_ok_at = 0.0
+# Round-trip time of the last successful health probe, reported on cached results
+_last_probe_latency_ms: Optional[float] = None
+
+# One reusable cursor per open connection; see _scratch_cursor()
+_scratch_cursors: dict[Any, Any] = {}
 
 
 def init_pool() -> bool:
     """
     Initialize the database connection pool.
 
-    Should be called once at application startup.
+    Called at application startup, and lazily by get_connection() on first
+    use so that every caller shares pooled connections.
 
     Returns:
         True if pool initialized successfully, False otherwise
     """
-    global _connection_pool
+    global _connection_pool, _atexit_registered
 
     if _connection_pool is not None:
         logger.debug("Connection pool already initialized")
         return True
 
-    try:
-        config = get_config()
-        db_params = config.database.to_psycopg2_params()
+    _load_psycopg2()
 
-        _connection_pool = pool.ThreadedConnectionPool(
-            minconn=PoolConfig.MIN_CONNECTIONS,
-            maxconn=PoolConfig.MAX_CONNECTIONS,
-            cursor_factory=RealDictCursor,
-            **db_params
-        )
-        logger.info(
-            f"Database connection pool initialized: "
-            f"min={PoolConfig.MIN_CONNECTIONS}, max={PoolConfig.MAX_CONNECTIONS}, "
-            f"host={db_params.get('host')}, dbname={db_params.get('dbname')}"
-        )
-        return True
+    with _pool_lock:
+        if _connection_pool is not None:
+            return True
+
+        try:
+            config = get_config()
+            db_params = _db_params(config.database)
+            min_conn, max_conn = _pool_size(config.database)
+
+            _connection_pool = pool.ThreadedConnectionPool(
+                minconn=min_conn,
+                maxconn=max_conn,
+                cursor_factory=RealDictCursor,
+                **db_params
+            )
+            if not _atexit_registered:
+                atexit.register(close_pool)
+                _atexit_registered = True
+            logger.info(
+                f"Database connection pool initialized: "
+                f"min={min_conn}, max={max_conn}, "
+                f"host={db_params.get('host')}, dbname={db_params.get('dbname')}"
+            )
+            return True
+
+        except psycopg2.Error as e:
+            logger.error(f"Failed to initialize connection pool: {e}")
+            return False
+
+
+def _db_params(db_config) -> dict:
+    """
+    Return psycopg2.connect() parameters for db_config.
+
+    Built once per DatabaseConfig object, so a reloaded config is picked up
+    automatically. The returned dict is shared; don't mutate it.
+    """
+    global _db_params_cache
+    cached = _db_params_cache
+    if cached is None or cached[0] is not db_config:
+        cached = _db_params_cache = (db_config, db_config.to_psycopg2_params())
+    return cached[1]
+
+
+def _pool_size(db_config) -> tuple[int, int]:
+    """Return (min, max) pool size from config, falling back to PoolConfig."""
+    max_conn = db_config.pool_max or PoolConfig.MAX_CONNECTIONS
+    min_conn = min(db_config.pool_min or PoolConfig.MIN_CONNECTIONS, max_conn)
+    return min_conn, max_conn
 
-    except psycopg2.Error as e:
-        logger.error(f"Failed to initialize connection pool: {e}")
-        return False
+
+def _getconn(conn_pool):
+    """
+    Take a connection from the pool, waiting briefly if it is exhausted.
+
+    ThreadedConnectionPool raises immediately when every connection is in
+    use; retry until GETCONN_TIMEOUT_SECONDS so short bursts queue instead
+    of failing.
+
+    Raises:
+        PoolExhausted: If no connection frees up in time
+    """
+    deadline = time.monotonic() + PoolConfig.GETCONN_TIMEOUT_SECONDS
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            return conn_pool.getconn()
+        except pool.PoolError:
+            if conn_pool.closed:
+                raise
+            if time.monotonic() >= deadline:
+                raise PoolExhausted(
+                    f"No pooled connection available after "
+                    f"{PoolConfig.GETCONN_TIMEOUT_SECONDS}s "
+                    f"(max={conn_pool.maxconn}, attempts={attempts})"
+                ) from None
+            time.sleep(PoolConfig.GETCONN_RETRY_SECONDS)
 
 
 def close_pool() -> None:
     """Close the connection pool. Call during application shutdown."""
-    global _connection_pool
+    global _connection_pool, _db_params_cache
 
+    _db_params_cache = None
+    _scratch_cursors.clear()
     if _connection_pool is not None:
         _connection_pool.closeall()
         _connection_pool = None
@@ -81,78 +270,173 @@ def close_pool() -> None:
 
 def get_pool_status() -> dict:
     """Get current status of the connection pool."""
-    if _connection_pool is None:
+    # Read the global once so a concurrent close_pool() can't swap it mid-report
+    conn_pool = _connection_pool
+    if conn_pool is None:
+        db_config = get_config().database
+        min_conn, max_conn = _pool_size(db_config)
         return {
             "initialized": False,
-            "min_connections": PoolConfig.MIN_CONNECTIONS,
-            "max_connections": PoolConfig.MAX_CONNECTIONS
+            "pgbouncer": bool(db_config.pgbouncer_url),
+            "min_connections": min_conn,
+            "max_connections": max_conn
         }
 
     # psycopg2's ThreadedConnectionPool doesn't expose usage stats directly,
     # but we can report configuration
     return {
         "initialized": True,
-        "min_connections": PoolConfig.MIN_CONNECTIONS,
-        "max_connections": PoolConfig.MAX_CONNECTIONS,
-        "closed": _connection_pool.closed
+        "min_connections": conn_pool.minconn,
+        "max_connections": conn_pool.maxconn,
+        "closed": conn_pool.closed
     }
 
 
 @contextmanager
-def get_connection():
+def get_connection(autocommit: bool = False):
     """
     Get a database connection from the pool.
 
-    If the pool is not initialized, falls back to creating a single connection.
+    The pool is created on first use if init_pool() has not been called.
+    If it cannot be created, falls back to a single direct connection.
+    When database.pgbouncer_url is configured the in-process pool is skipped
+    and each block gets its own connection through PgBouncer.
     Connections are automatically returned to the pool when the context exits.
+
+    Args:
+        autocommit: Run each statement in its own implicit transaction. Use
+            for read-only blocks: they then skip the BEGIN, and the rollback
+            the pool would otherwise issue when the connection is returned.
     """
-    global _connection_pool
+    global _last_ok_at
+
     conn = None
+    conn_pool = None
+    _load_psycopg2()
+    db_config = get_config().database
+
+    if _connection_pool is None and not db_config.pgbouncer_url:
+        init_pool()
 
     try:
-        if _connection_pool is not None:
+        conn_pool = _connection_pool
+        if conn_pool is not None:
             # Get from pool
-            conn = _connection_pool.getconn()
-            yield conn
+            conn = _getconn(conn_pool)
+        elif db_config.pgbouncer_url:
+            # PgBouncer does the pooling; its client connections are cheap
+            conn = psycopg2.connect(db_config.pgbouncer_url, cursor_factory=RealDictCursor)
         else:
-            # Fallback: create direct connection (pool not initialized)
-            config = get_config()
-            conn = psycopg2.connect(**config.database.to_psycopg2_params(), cursor_factory=RealDictCursor)
-            yield conn
-
-    except psycopg2.Error as e:
+            # Fallback: create direct connection (pool unavailable)
+            conn = psycopg2.connect(**_db_params(db_config), cursor_factory=RealDictCursor)
+        if autocommit:
+            conn.autocommit = True
+        yield conn
+        _last_ok_at = time.monotonic()
+
+    # PoolExhausted is ours, not a psycopg2.Error, since psycopg2 loads lazily
+    except (psycopg2.Error, PoolExhausted) as e:
         logger.error(f"Database connection error: {e}")
         raise
 
     finally:
         if conn:
-            if _connection_pool is not None:
-                # Return to pool
-                _connection_pool.putconn(conn)
+            if autocommit and not conn.closed:
+                # Pooled connections are handed out in transactional mode
+                conn.autocommit = False
+            if conn_pool is not None:
+                # Return to the pool it came from
+                conn_pool.putconn(conn)
             else:
                 # Close direct connection
                 conn.close()
+            if conn.closed:
+                # The pool closes surplus connections too; drop their cursors
+                _scratch_cursors.pop(conn, None)
+
+
+def _scratch_cursor(conn):
+    """
+    Return the cursor kept for conn, creating it on first use.
+
+    Pooled connections are checked out by one caller at a time, so each
+    can reuse one RealDictCursor instead of allocating a new one per call.
+    """
+    cur = _scratch_cursors.get(conn)
+    if cur is None or cur.closed:
+        cur = conn.cursor()
+        _scratch_cursors[conn] = cur
+    return cur
+
+
+# Lets a transaction's COMMIT return before its WAL record is flushed
+_ASYNC_COMMIT_SQL = "SET LOCAL synchronous_commit = off"
+
+
+@contextmanager
+def transaction(durable: bool = True):
+    """
+    Yield a cursor whose statements commit together.
+
+    Commits once when the block exits cleanly and rolls back if it raises,
+    so related writes share a single commit instead of one per statement.
+
+    Args:
+        durable: When False the commit doesn't wait for the WAL flush. A
+            crash can then lose the last moments of writes, so only use it
+            for data that is re-collected on the next refresh.
+    """
+    with get_connection() as conn:
+        cur = _scratch_cursor(conn)
+        try:
+            if not durable:
+                cur.execute(_ASYNC_COMMIT_SQL)
+            yield cur
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
 
 
 def check_health() -> dict:
     """
     Check database health by executing a simple query.
 
+    If a pooled connection was used successfully in the last few seconds
+    that is reported instead of probing again. Probes use their own
+    short-timeout connection, so they never wait on or hold a pool slot.
+
     Returns:
-        Dict with 'healthy' bool and 'latency_ms' or 'error' string
+        Dict with 'healthy' bool, 'cached' bool, 'latency_ms' (the last
+        measured probe latency on cached results, None if never probed)
+        and 'pool' status, plus an 'error' string when unhealthy
     """
-    import time
+    global _last_probe_latency_ms
+
+    _load_psycopg2()
+    if time.monotonic() - _last_ok_at < HealthConfig.RECENT_SUCCESS_SECONDS:
+        return {
+            "healthy": True,
+            "cached": True,
+            "latency_ms": _last_probe_latency_ms,
+            "pool": get_pool_status()
+        }
 
     start = time.time()
+    conn = None
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("SELECT 1")
-            cur.fetchone()
+        conn = psycopg2.connect(
+            **_db_params(get_config().database),
+            connect_timeout=HealthConfig.PROBE_CONNECT_TIMEOUT
+        )
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.fetchone()
 
-        latency_ms = round((time.time() - start) * 1000, 2)
+        latency_ms = _last_probe_latency_ms = round((time.time() - start) * 1000, 2)
         return {
             "healthy": True,
+            "cached": False,
             "latency_ms": latency_ms,
             "pool": get_pool_status()
         }
@@ -160,34 +444,276 @@ def check_health() -> dict:
     except psycopg2.Error as e:
         return {
             "healthy": False,
+            "cached": False,
+            "latency_ms": None,
             "error": str(e),
             "pool": get_pool_status()
         }
 
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# =============================================================================
+# Server-side Prepared Statements
+# =============================================================================
+
+# Statement names already prepared on each connection. Entries vanish with
+# the connection, so a reconnect starts with nothing prepared.
+_prepared_statements: "weakref.WeakKeyDictionary[Any, set[str]]" = weakref.WeakKeyDictionary()
+_PLACEHOLDER_RE = re.compile(r"%s")
+
+
+def _execute_prepared(cur, name: str, sql: str, params: tuple) -> None:
+    """
+    Execute a hot statement through a named server-side prepared statement.
+
+    The statement is PREPAREd on the cursor's connection the first time it
+    is used there; later calls only send EXECUTE, skipping parse and plan.
+    sql uses the usual %s placeholders, which are numbered for PREPARE.
+    """
+    if get_config().database.pgbouncer_url:
+        # Transaction pooling can't keep named statements on one server session
+        cur.execute(sql, params)
+        return
+
+    prepared = _prepared_statements.setdefault(cur.connection, set())
+    if name not in prepared:
+        counter = itertools.count(1)
+        numbered = _PLACEHOLDER_RE.sub(lambda _: f"${next(counter)}", sql)
+        cur.execute(f"PREPARE {name} AS {numbered}")
+        prepared.add(name)
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
+# =============================================================================
+# Query Result Cache
+# =============================================================================
+
+class QueryCacheConfig:
+    """Query result cache configuration constants."""
+    TTL_SECONDS = 60
+    # Configuration tables change rarely and every write invalidates them
+    REFERENCE_TTL_SECONDS = 300
+    # Bounds the cache when callers vary arguments (e.g. repo names)
+    MAX_ENTRIES = 256
+
+
+# Cached queries are grouped by the data they read. A domain's generation is
+# bumped when that data changes and is part of its cache keys, so a write
+# only invalidates the results that depend on it.
+CACHE_SNAPSHOTS = "snapshots"
+CACHE_PLANNING = "planning"
+CACHE_REFERENCE = "reference"
+CACHE_HISTORY = "history"
+_cache_generations = dict.fromkeys((CACHE_SNAPSHOTS, CACHE_PLANNING, CACHE_REFERENCE, CACHE_HISTORY), 0)
+_query_cache: dict[tuple, tuple[float, Any]] = {}
+
+
+def ttl_cache(seconds: float = QueryCacheConfig.TTL_SECONDS, domain: str = CACHE_SNAPSHOTS):
+    """
+    Cache a read query's result for a short time.
+
+    Results are keyed by domain, function, arguments and the domain's
+    current generation. Empty results are not cached, since the query
+    helpers return an empty value on error as well as when there is no
+    data. Each caller gets its own copy, so reshaping a result can't
+    change what later callers see.
+    """
+    if domain not in _cache_generations:
+        raise ValueError(f"Unknown query cache domain: {domain}")
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (domain, func.__name__, _cache_generations[domain], args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            cached = _query_cache.get(key)
+            if cached is not None and now < cached[0]:
+                return _copy_result(cached[1])
+
+            result = func(*args, **kwargs)
+            if result:
+                if len(_query_cache) >= QueryCacheConfig.MAX_ENTRIES:
+                    _evict_query_cache(now)
+                _query_cache[key] = (now + seconds, _copy_result(result))
+            return result
+        return wrapper
+    return decorator
+
+
+def _copy_result(value: Any) -> Any:
+    """Copy the lists and dicts (including rows) of a query result; leaf values are shared."""
+    if isinstance(value, dict):
+        return {k: _copy_result(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_copy_result(v) for v in value]
+    return value
+
+
+def _evict_query_cache(now: float) -> None:
+    """Drop expired entries, then the oldest one if the cache is still full."""
+    for key, (expires_at, _) in list(_query_cache.items()):
+        if expires_at <= now:
+            _query_cache.pop(key, None)
+    if len(_query_cache) >= QueryCacheConfig.MAX_ENTRIES:
+        # Dicts keep insertion order, so the first key is the oldest entry
+        oldest = next(iter(_query_cache), None)
+        if oldest is not None:
+            _query_cache.pop(oldest, None)
+
+
+def invalidate_query_cache(domain: Optional[str] = None) -> None:
+    """
+    Invalidate cached query results after the data they read changes.
+
+    Args:
+        domain: One of the CACHE_* domains; None invalidates every domain
+    """
+    domains = list(_cache_generations) if domain is None else [domain]
+    for name in domains:
+        _cache_generations[name] += 1
+    for key in list(_query_cache):
+        if key[0] in domains:
+            _query_cache.pop(key, None)
+
 
 # =============================================================================
 # Snapshot Storage
 # =============================================================================
 
+class SnapshotConfig:
+    """Snapshot storage configuration constants."""
+    # Below this many rows COPY's fixed setup cost outweighs its speedup
+    COPY_MIN_ROWS = 32
+    # Each daily trend view refresh rescans its whole snapshot history
+    ROLLUP_REFRESH_INTERVAL_SECONDS = 900
+
+
+_GIT_SNAPSHOT_COLUMNS = ("repo_name", "branch", "commit_count", "is_dirty", "ahead", "behind")
+_INBOX_SNAPSHOT_COLUMNS = ("account", "account_name", "total_unread", "urgent_count",
+                           "from_people_count", "newsletter_count", "status")
+_SCHOOL_SNAPSHOT_COLUMNS = ("child", "email_count", "action_count", "high_urgency",
+                            "medium_urgency", "low_urgency", "info_count")
+
+# Characters COPY's text format treats specially inside a field
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _copy_value(value) -> str:
+    """Render one field for COPY's text format."""
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = _dumps_json(value)
+    return str(value).translate(_COPY_ESCAPES)
+
+
+def _copy_rows(cur, table: str, columns: tuple, rows: list[tuple]) -> None:
+    """Stream rows into table with a single COPY ... FROM STDIN."""
+    buf = io.StringIO()
+    buf.writelines(
+        "\t".join(map(_copy_value, row)) + "\n"
+        for row in rows
+    )
+    buf.seek(0)
+    cur.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT text)", buf
+    )
+
+
+def _insert_snapshot_rows(cur, table: str, columns: tuple, rows: list[tuple]) -> None:
+    """Insert snapshot rows via COPY when there are many, else one multi-row INSERT."""
+    if len(rows) >= SnapshotConfig.COPY_MIN_ROWS:
+        _copy_rows(cur, table, columns, rows)
+    else:
+        execute_values(
+            cur, f"INSERT INTO {table} ({', '.join(columns)}) VALUES %s", rows, page_size=500
+        )
+
+
+def _store_git_snapshot(cur, repos: list[dict]) -> None:
+    """Insert git repository snapshot rows on cur."""
+    rows = [
+        (
+            repo.get('name'),
+            repo.get('branch'),
+            repo.get('commit_count', 0),
+            repo.get('is_dirty', False),
+            repo.get('ahead', 0),
+            repo.get('behind', 0)
+        )
+        for repo in repos
+    ]
+    _insert_snapshot_rows(cur, "dashboard_git_snapshots", _GIT_SNAPSHOT_COLUMNS, rows)
+
+
+def _store_todoist_snapshot(cur, tasks: list[dict]) -> None:
+    """Insert a todoist task snapshot row on cur."""
+    total = len(tasks)
+    overdue = 0
+    today = 0
+    by_project = Counter()
+    # Every standard priority is always present in the stored breakdown
+    by_priority = Counter({1: 0, 2: 0, 3: 0, 4: 0})
+
+    # Count flags and group by project/priority in a single pass
+    for t in tasks:
+        get = t.get
+        if get('is_overdue'):
+            overdue += 1
+        if get('is_today'):
+            today += 1
+        by_project[get('project', 'Unknown')] += 1
+        by_priority[get('priority', 1)] += 1
+
+    cur.execute("""
+        INSERT INTO dashboard_todoist_snapshots
+        (total_tasks, overdue_tasks, today_tasks, by_project, by_priority)
+        VALUES (%s, %s, %s, %s, %s)
+    """, (total, overdue, today, _json(by_project), _json(by_priority)))
+
+
+def _store_kanban_snapshot(cur, by_column: dict) -> None:
+    """Insert a kanban board snapshot row on cur."""
+    # Column sizes in one C-level pass; .get() below allocates nothing for absent columns
+    counts = dict(zip(by_column, map(len, by_column.values())))
+    cur.execute("""
+        INSERT INTO dashboard_kanban_snapshots
+        (backlog_count, ready_count, in_progress_count, review_count, done_count, total_tasks)
+        VALUES (%s, %s, %s, %s, %s, %s)
+    """, (
+        counts.get('backlog', 0),
+        counts.get('ready', 0),
+        counts.get('in-progress', 0),
+        counts.get('review', 0),
+        counts.get('done', 0),
+        sum(counts.values())
+    ))
+
+
+def _store_linear_snapshot(cur, issues: list[dict], by_status: dict) -> None:
+    """Insert a Linear issues snapshot row on cur."""
+    cur.execute("""
+        INSERT INTO dashboard_linear_snapshots
+        (total_issues, by_status, by_assignee)
+        VALUES (%s, %s, %s)
+    """, (
+        len(issues),
+        _json({k: len(v) for k, v in by_status.items()}),
+        _json({})  # Could add assignee grouping later
+    ))
+
+
 def store_git_snapshot(repos: list[dict]) -> None:
     """Store git repository snapshot."""
+    if not repos:
+        return
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            for repo in repos:
-                cur.execute("""
-                    INSERT INTO dashboard_git_snapshots 
-                    (repo_name, branch, commit_count, is_dirty, ahead, behind)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                """, (
-                    repo.get('name'),
-                    repo.get('branch'),
-                    repo.get('commit_count', 0),
-                    repo.get('is_dirty', False),
-                    repo.get('ahead', 0),
-                    repo.get('behind', 0)
-                ))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_git_snapshot(cur, repos)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store git snapshot: {e}")
 
@@ -195,30 +721,9 @@ def store_git_snapshot(repos: list[dict]) -> None:
 def store_todoist_snapshot(tasks: list[dict]) -> None:
     """Store todoist task snapshot."""
     try:
-        total = len(tasks)
-        overdue = sum(1 for t in tasks if t.get('is_overdue'))
-        today = sum(1 for t in tasks if t.get('is_today'))
-        
-        # Group by project
-        by_project = {}
-        for t in tasks:
-            proj = t.get('project', 'Unknown')
-            by_project[proj] = by_project.get(proj, 0) + 1
-        
-        # Group by priority
-        by_priority = {1: 0, 2: 0, 3: 0, 4: 0}
-        for t in tasks:
-            p = t.get('priority', 1)
-            by_priority[p] = by_priority.get(p, 0) + 1
-        
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO dashboard_todoist_snapshots
-                (total_tasks, overdue_tasks, today_tasks, by_project, by_priority)
-                VALUES (%s, %s, %s, %s, %s)
-            """, (total, overdue, today, json.dumps(by_project), json.dumps(by_priority)))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_todoist_snapshot(cur, tasks)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store todoist snapshot: {e}")
 
@@ -226,21 +731,9 @@ def store_todoist_snapshot(tasks: list[dict]) -> None:
 def store_kanban_snapshot(by_column: dict) -> None:
     """Store kanban board snapshot."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO dashboard_kanban_snapshots
-                (backlog_count, ready_count, in_progress_count, review_count, done_count, total_tasks)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (
-                len(by_column.get('backlog', [])),
-                len(by_column.get('ready', [])),
-                len(by_column.get('in-progress', [])),
-                len(by_column.get('review', [])),
-                len(by_column.get('done', [])),
-                sum(len(v) for v in by_column.values())
-            ))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_kanban_snapshot(cur, by_column)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store kanban snapshot: {e}")
 
@@ -248,77 +741,155 @@ def store_kanban_snapshot(by_column: dict) -> None:
 def store_linear_snapshot(issues: list[dict], by_status: dict) -> None:
     """Store Linear issues snapshot."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO dashboard_linear_snapshots
-                (total_issues, by_status, by_assignee)
-                VALUES (%s, %s, %s)
-            """, (
-                len(issues),
-                json.dumps({k: len(v) for k, v in by_status.items()}),
-                json.dumps({})  # Could add assignee grouping later
-            ))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_linear_snapshot(cur, issues, by_status)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store linear snapshot: {e}")
 
 
+class _StatementBatch:
+    """
+    Cursor stand-in that queues statements and sends them as one batch.
+
+    The _store_* helpers only call execute(), mogrify() and copy_expert(),
+    so they can write through a batch unchanged. Queued statements are
+    rendered client-side and sent together on flush(); COPY flushes first
+    so statement order is kept.
+    """
+
+    def __init__(self, cur):
+        self._cur = cur
+        self._statements: list[bytes] = []
+        # execute_values reads the connection's client encoding
+        self.connection = cur.connection
+
+    def mogrify(self, sql, params=None) -> bytes:
+        return self._cur.mogrify(sql, params)
+
+    def execute(self, sql, params=None) -> None:
+        self._statements.append(self._cur.mogrify(sql, params))
+
+    def copy_expert(self, sql: str, file) -> None:
+        self.flush()
+        self._cur.copy_expert(sql, file)
+
+    def flush(self) -> None:
+        """Send every queued statement in a single round-trip."""
+        if self._statements:
+            self._cur.execute(b";".join(self._statements))
+            self._statements.clear()
+
+
+def store_refresh_snapshots(git_repos: list[dict] = None, todoist_tasks: list[dict] = None,
+                            kanban_by_column: dict = None, linear_issues: list[dict] = None,
+                            linear_by_status: dict = None) -> None:
+    """
+    Store one dashboard refresh's snapshots and update daily stats.
+
+    Sources passed as None are skipped. Every write goes through a single
+    pooled connection: the snapshot inserts and daily stats upsert are sent
+    as one statement batch and commit together, instead of one acquisition,
+    round-trip and commit per source. The daily trend views are refreshed
+    afterwards when due; see _refresh_daily_rollups.
+
+    Raises:
+        Exception: If storing fails; snapshots and stats are rolled back
+    """
+    with get_connection() as conn:
+        cur = _scratch_cursor(conn)
+        batch = _StatementBatch(cur)
+        try:
+            # Snapshots are re-collected every refresh, so skip the WAL flush wait
+            batch.execute(_ASYNC_COMMIT_SQL)
+            if git_repos:
+                _store_git_snapshot(batch, git_repos)
+            if todoist_tasks is not None:
+                _store_todoist_snapshot(batch, todoist_tasks)
+            if kanban_by_column is not None:
+                _store_kanban_snapshot(batch, kanban_by_column)
+            if linear_issues is not None:
+                _store_linear_snapshot(batch, linear_issues, linear_by_status or {})
+            _upsert_daily_stats(batch)
+            batch.flush()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    # Only views over snapshot tables this refresh wrote to can have changed
+    _refresh_daily_rollups(tuple(
+        view for view, written in (
+            ("dashboard_git_daily", bool(git_repos)),
+            ("dashboard_todoist_daily", todoist_tasks is not None),
+            ("dashboard_kanban_daily", kanban_by_column is not None),
+        ) if written
+    ))
+    invalidate_query_cache(CACHE_SNAPSHOTS)
+
+
+def _store_inbox_snapshot(cur, accounts_data: list[dict]) -> None:
+    """Insert one inbox snapshot row per account on cur."""
+    rows = [
+        (
+            account.get('account', ''),
+            account.get('name', ''),
+            account.get('total_unread', 0),
+            len(account.get('urgent', [])),
+            len(account.get('from_people', [])),
+            account.get('newsletters', 0),
+            account.get('status', 'unknown')
+        )
+        for account in accounts_data
+    ]
+    _insert_snapshot_rows(cur, "dashboard_inbox_snapshots", _INBOX_SNAPSHOT_COLUMNS, rows)
+
+
+def _store_school_snapshot(cur, by_child: dict, by_urgency: dict) -> None:
+    """Insert one school snapshot row per child on cur."""
+    # Urgency totals are board-wide, so every child's row carries the same values
+    urgency = (
+        by_urgency.get('HIGH', 0),
+        by_urgency.get('MEDIUM', 0),
+        by_urgency.get('LOW', 0),
+        by_urgency.get('INFO', 0)
+    )
+    rows = [
+        (child, stats.get('emails', 0), stats.get('actions', 0), *urgency)
+        for child, stats in by_child.items()
+    ]
+    _insert_snapshot_rows(cur, "dashboard_school_snapshots", _SCHOOL_SNAPSHOT_COLUMNS, rows)
+
+
 def store_inbox_snapshot(accounts_data: list[dict]) -> None:
     """Store inbox digest snapshot."""
+    if not accounts_data:
+        return
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            for account in accounts_data:
-                cur.execute("""
-                    INSERT INTO dashboard_inbox_snapshots
-                    (account, account_name, total_unread, urgent_count, 
-                     from_people_count, newsletter_count, status)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    account.get('account', ''),
-                    account.get('name', ''),
-                    account.get('total_unread', 0),
-                    len(account.get('urgent', [])),
-                    len(account.get('from_people', [])),
-                    account.get('newsletters', 0),
-                    account.get('status', 'unknown')
-                ))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_inbox_snapshot(cur, accounts_data)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store inbox snapshot: {e}")
 
 
 def store_school_snapshot(by_child: dict, by_urgency: dict) -> None:
     """Store school email snapshot."""
+    if not by_child:
+        return
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            for child, stats in by_child.items():
-                cur.execute("""
-                    INSERT INTO dashboard_school_snapshots
-                    (child, email_count, action_count, high_urgency, 
-                     medium_urgency, low_urgency, info_count)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """, (
-                    child,
-                    stats.get('emails', 0),
-                    stats.get('actions', 0),
-                    by_urgency.get('HIGH', 0),
-                    by_urgency.get('MEDIUM', 0),
-                    by_urgency.get('LOW', 0),
-                    by_urgency.get('INFO', 0)
-                ))
-            conn.commit()
+        with transaction(durable=False) as cur:
+            _store_school_snapshot(cur, by_child, by_urgency)
+        invalidate_query_cache(CACHE_SNAPSHOTS)
     except Exception as e:
         logger.error(f"Failed to store school snapshot: {e}")
 
 
+@ttl_cache()
 def get_inbox_trends(days: int = 7) -> list[dict]:
     """Get inbox trends for the last N days."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT 
                     DATE(snapshot_at) as date,
@@ -326,21 +897,22 @@ def get_inbox_trends(days: int = 7) -> list[dict]:
                     AVG(total_unread) as avg_unread,
                     MAX(urgent_count) as max_urgent
                 FROM dashboard_inbox_snapshots
-                WHERE snapshot_at > NOW() - INTERVAL '%s days'
+                WHERE snapshot_at > NOW() - INTERVAL '1 day' * %s::int
                 GROUP BY DATE(snapshot_at), account
                 ORDER BY date DESC
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get inbox trends: {e}")
         return []
 
 
+@ttl_cache()
 def get_school_trends(days: int = 30) -> list[dict]:
     """Get school email trends for the last N days."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT 
                     DATE(snapshot_at) as date,
@@ -349,176 +921,242 @@ def get_school_trends(days: int = 30) -> list[dict]:
                     SUM(action_count) as actions,
                     SUM(high_urgency) as high_urgency
                 FROM dashboard_school_snapshots
-                WHERE snapshot_at > NOW() - INTERVAL '%s days'
+                WHERE snapshot_at > NOW() - INTERVAL '1 day' * %s::int
                 GROUP BY DATE(snapshot_at), child
                 ORDER BY date DESC
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get school trends: {e}")
         return []
 
 
-def update_daily_stats(git_data: dict, todoist_data: dict, kanban_data: dict) -> None:
-    """Update daily aggregate stats."""
-    try:
-        today = date.today()
-        
-        git_repos = git_data.get('repos', [])
-        git_commits = sum(r.get('commit_count', 0) for r in git_repos)
-        git_active = sum(1 for r in git_repos if r.get('commit_count', 0) > 0)
-        git_dirty = sum(1 for r in git_repos if r.get('is_dirty'))
-        
-        todoist_tasks = todoist_data.get('tasks', [])
-        todoist_overdue = sum(1 for t in todoist_tasks if t.get('is_overdue'))
-        
-        kanban_cols = kanban_data.get('by_column', {})
-        
+def _upsert_daily_stats(cur) -> None:
+    """
+    Upsert today's aggregate stats from the latest stored snapshots on cur.
+
+    Aggregates are computed in the database from today's most recent git
+    snapshot batch (rows from one store share a snapshot_at) and latest
+    todoist snapshot.
+    """
+    cur.execute("""
+        WITH latest_git AS (
+            SELECT commit_count, is_dirty
+            FROM dashboard_git_snapshots
+            WHERE snapshot_at = (
+                SELECT MAX(snapshot_at) FROM dashboard_git_snapshots
+                WHERE snapshot_at >= CURRENT_DATE
+            )
+        ), latest_todoist AS (
+            SELECT overdue_tasks
+            FROM dashboard_todoist_snapshots
+            WHERE snapshot_at >= CURRENT_DATE
+            ORDER BY snapshot_at DESC
+            LIMIT 1
+        )
+        INSERT INTO dashboard_daily_stats 
+        (stat_date, git_total_commits, git_active_repos, git_dirty_repos, todoist_overdue)
+        SELECT
+            CURRENT_DATE,
+            COALESCE(SUM(commit_count), 0),
+            COUNT(*) FILTER (WHERE commit_count > 0),
+            COUNT(*) FILTER (WHERE is_dirty),
+            COALESCE((SELECT overdue_tasks FROM latest_todoist), 0)
+        FROM latest_git
+        ON CONFLICT (stat_date) DO UPDATE SET
+            git_total_commits = EXCLUDED.git_total_commits,
+            git_active_repos = EXCLUDED.git_active_repos,
+            git_dirty_repos = EXCLUDED.git_dirty_repos,
+            todoist_overdue = EXCLUDED.todoist_overdue,
+            updated_at = CURRENT_TIMESTAMP
+    """)
+
+
+# Per-day materialized views read by the *_trends functions
+_DAILY_ROLLUPS = ("dashboard_git_daily", "dashboard_todoist_daily", "dashboard_kanban_daily")
+# time.monotonic() of each view's last refresh
+_rollups_refreshed_at: dict[str, float] = {}
+_rollups_lock = threading.Lock()
+
+
+def _refresh_daily_rollups(views: tuple[str, ...] = _DAILY_ROLLUPS) -> None:
+    """
+    Refresh the per-day trend views that are due, on their own connection.
+
+    A refresh rescans the view's whole snapshot history, so each view is
+    refreshed at most once per ROLLUP_REFRESH_INTERVAL_SECONDS rather than
+    on every store. Failures are logged and retried on a later call; the
+    snapshots that triggered the refresh are already committed.
+    """
+    if not views:
+        return
+    now = time.monotonic()
+    interval = SnapshotConfig.ROLLUP_REFRESH_INTERVAL_SECONDS
+    with _rollups_lock:
+        due = [
+            view for view in views
+            if view not in _rollups_refreshed_at or now - _rollups_refreshed_at[view] >= interval
+        ]
+        # Claim them so concurrent stores don't refresh the same view twice
+        for view in due:
+            _rollups_refreshed_at[view] = now
+    if not due:
+        return
+
+    pending = list(due)
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            while pending:
+                cur.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {pending[0]}")
+                pending.pop(0)
+    except Exception as e:
+        logger.error(f"Failed to refresh daily rollups {', '.join(pending)}: {e}")
+        with _rollups_lock:
+            for view in pending:
+                _rollups_refreshed_at.pop(view, None)
+
+
+def update_daily_stats() -> None:
+    """
+    Update today's aggregate stats from the latest stored snapshots.
+
+    Call this after the store_* functions.
+    """
+    try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO dashboard_daily_stats 
-                (stat_date, git_total_commits, git_active_repos, git_dirty_repos, todoist_overdue)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (stat_date) DO UPDATE SET
-                    git_total_commits = EXCLUDED.git_total_commits,
-                    git_active_repos = EXCLUDED.git_active_repos,
-                    git_dirty_repos = EXCLUDED.git_dirty_repos,
-                    todoist_overdue = EXCLUDED.todoist_overdue,
-                    updated_at = CURRENT_TIMESTAMP
-            """, (today, git_commits, git_active, git_dirty, todoist_overdue))
+            cur = _scratch_cursor(conn)
+            _upsert_daily_stats(cur)
             conn.commit()
     except Exception as e:
         logger.error(f"Failed to update daily stats: {e}")
+        return
+    _refresh_daily_rollups()
+    invalidate_query_cache(CACHE_SNAPSHOTS)
 
 
 # =============================================================================
 # Analytics Queries
 # =============================================================================
 
+@ttl_cache()
 def get_git_trends(days: int = 30) -> list[dict]:
     """Get git activity trends over time."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
-                    DATE(snapshot_at) as date,
-                    SUM(commit_count) as total_commits,
-                    COUNT(DISTINCT repo_name) as repos_with_activity,
-                    SUM(CASE WHEN is_dirty THEN 1 ELSE 0 END) as dirty_repos
-                FROM dashboard_git_snapshots
-                WHERE snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s
-                GROUP BY DATE(snapshot_at)
-                ORDER BY date
+                    stat_date as date,
+                    total_commits,
+                    repos_with_activity,
+                    dirty_repos
+                FROM dashboard_git_daily
+                WHERE stat_date >= CURRENT_DATE - INTERVAL '1 day' * %s::int
+                ORDER BY stat_date
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get git trends: {e}")
         return []
 
 
+@ttl_cache()
 def get_todoist_trends(days: int = 30) -> list[dict]:
     """Get todoist task trends over time."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
-                    DATE(snapshot_at) as date,
-                    AVG(total_tasks) as avg_tasks,
-                    AVG(overdue_tasks) as avg_overdue,
-                    AVG(today_tasks) as avg_today
-                FROM dashboard_todoist_snapshots
-                WHERE snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s
-                GROUP BY DATE(snapshot_at)
-                ORDER BY date
+                    stat_date as date,
+                    avg_tasks,
+                    avg_overdue,
+                    avg_today
+                FROM dashboard_todoist_daily
+                WHERE stat_date >= CURRENT_DATE - INTERVAL '1 day' * %s::int
+                ORDER BY stat_date
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get todoist trends: {e}")
         return []
 
 
+@ttl_cache()
 def get_kanban_trends(days: int = 30) -> list[dict]:
     """Get kanban board trends over time."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
-                    DATE(snapshot_at) as date,
-                    AVG(backlog_count) as avg_backlog,
-                    AVG(ready_count) as avg_ready,
-                    AVG(in_progress_count) as avg_in_progress,
-                    AVG(done_count) as avg_done,
-                    AVG(total_tasks) as avg_total
-                FROM dashboard_kanban_snapshots
-                WHERE snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s
-                GROUP BY DATE(snapshot_at)
-                ORDER BY date
+                    stat_date as date,
+                    avg_backlog,
+                    avg_ready,
+                    avg_in_progress,
+                    avg_done,
+                    avg_total
+                FROM dashboard_kanban_daily
+                WHERE stat_date >= CURRENT_DATE - INTERVAL '1 day' * %s::int
+                ORDER BY stat_date
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get kanban trends: {e}")
         return []
 
 
+@ttl_cache()
 def get_linear_trends(days: int = 30) -> list[dict]:
     """Get Linear issues trends over time."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            # Statuses come from each day's latest snapshot, so counts aren't
+            # summed across the day's refreshes
             cur.execute("""
                 SELECT
-                    DATE(snapshot_at) as date,
-                    AVG(total_issues) as avg_total,
-                    by_status
+                    DATE(snapshot_at)::text as date,
+                    COALESCE(AVG(total_issues), 0)::float as avg_total,
+                    COALESCE(
+                        (ARRAY_AGG(by_status ORDER BY snapshot_at DESC))[1],
+                        '{}'::jsonb
+                    ) as statuses
                 FROM dashboard_linear_snapshots
-                WHERE snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s
-                GROUP BY DATE(snapshot_at), by_status
+                WHERE snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s::int
+                GROUP BY DATE(snapshot_at)
                 ORDER BY date
             """, (days,))
-            rows = cur.fetchall()
-            
-            # Aggregate by date
-            by_date = {}
-            for row in rows:
-                d = str(row['date'])
-                if d not in by_date:
-                    by_date[d] = {'date': d, 'avg_total': 0, 'statuses': {}}
-                by_date[d]['avg_total'] = float(row['avg_total'] or 0)
-                if row['by_status']:
-                    for status, count in row['by_status'].items():
-                        by_date[d]['statuses'][status] = count
-            
-            return list(by_date.values())
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get linear trends: {e}")
         return []
 
 
+@ttl_cache()
 def get_daily_summary(days: int = 7) -> list[dict]:
     """Get daily summary stats."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT * FROM dashboard_daily_stats
-                WHERE stat_date >= CURRENT_DATE - INTERVAL '1 day' * %s
+                WHERE stat_date >= CURRENT_DATE - INTERVAL '1 day' * %s::int
                 ORDER BY stat_date DESC
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get daily summary: {e}")
         return []
 
 
+@ttl_cache()
 def get_repo_history(repo_name: str, days: int = 30) -> list[dict]:
     """Get history for a specific repo."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
                     DATE(snapshot_at) as date,
@@ -526,11 +1164,11 @@ def get_repo_history(repo_name: str, days: int = 30) -> list[dict]:
                     BOOL_OR(is_dirty) as was_dirty
                 FROM dashboard_git_snapshots
                 WHERE repo_name = %s
-                  AND snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s
+                  AND snapshot_at >= CURRENT_DATE - INTERVAL '1 day' * %s::int
                 GROUP BY DATE(snapshot_at)
                 ORDER BY date
             """, (repo_name, days))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get repo history: {e}")
         return []
@@ -544,15 +1182,15 @@ def create_planning_session(initial_context: dict) -> dict | None:
     """Create a new planning session. Returns session info or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO planning_sessions (initial_context)
                 VALUES (%s)
                 RETURNING id, started_at
-            """, (json.dumps(initial_context),))
+            """, (_json(initial_context),))
             result = cur.fetchone()
             conn.commit()
-            return dict(result) if result else None
+            return result
     except Exception as e:
         logger.error(f"Failed to create planning session: {e}")
         return None
@@ -562,20 +1200,28 @@ def end_planning_session(session_id: int, final_state: dict) -> dict | None:
     """End a planning session. Returns session stats or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
+            # Both counts are computed once in the CTE and joined into the UPDATE
             cur.execute("""
+                WITH counts AS (
+                    SELECT
+                        (SELECT COUNT(*) FROM planning_messages WHERE session_id = %(id)s) AS messages,
+                        (SELECT COUNT(*) FROM planning_actions WHERE session_id = %(id)s) AS actions
+                )
                 UPDATE planning_sessions
                 SET ended_at = NOW(),
                     duration_seconds = EXTRACT(EPOCH FROM (NOW() - started_at))::INTEGER,
-                    final_state = %s,
-                    messages_count = (SELECT COUNT(*) FROM planning_messages WHERE session_id = %s),
-                    actions_count = (SELECT COUNT(*) FROM planning_actions WHERE session_id = %s)
-                WHERE id = %s
+                    final_state = %(final_state)s,
+                    messages_count = counts.messages,
+                    actions_count = counts.actions
+                FROM counts
+                WHERE id = %(id)s
                 RETURNING id, duration_seconds, messages_count, actions_count
-            """, (json.dumps(final_state), session_id, session_id, session_id))
+            """, {'id': session_id, 'final_state': _json(final_state)})
             result = cur.fetchone()
             conn.commit()
-            return dict(result) if result else None
+            invalidate_query_cache(CACHE_PLANNING)
+            return result
     except Exception as e:
         logger.error(f"Failed to end planning session: {e}")
         return None
@@ -587,16 +1233,17 @@ def insert_planning_action(session_id: int, action_type: str, target_type: str =
     """Insert a planning action. Returns action ID or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
+            cur = _scratch_cursor(conn)
+            _execute_prepared(cur, "insert_planning_action", """
                 INSERT INTO planning_actions
                 (session_id, action_type, target_type, target_id, target_title, details)
                 VALUES (%s, %s, %s, %s, %s, %s)
                 RETURNING id
             """, (session_id, action_type, target_type, target_id, target_title,
-                  json.dumps(details or {})))
+                  _json(details or {})))
             result = cur.fetchone()
             conn.commit()
+            invalidate_query_cache(CACHE_PLANNING)
             return result['id'] if result else None
     except Exception as e:
         logger.error(f"Failed to insert planning action: {e}")
@@ -608,8 +1255,8 @@ def insert_planning_message(session_id: int, role: str, content: str,
     """Insert a planning message. Returns message ID or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
+            cur = _scratch_cursor(conn)
+            _execute_prepared(cur, "insert_planning_message", """
                 INSERT INTO planning_messages
                 (session_id, role, content, tokens_used)
                 VALUES (%s, %s, %s, %s)
@@ -623,48 +1270,117 @@ def insert_planning_message(session_id: int, role: str, content: str,
         return None
 
 
+def insert_planning_actions(session_id: int, actions: list[dict]) -> list[int]:
+    """
+    Insert several planning actions in one statement.
+
+    Each action dict takes the keyword arguments of insert_planning_action
+    (action_type, target_type, target_id, target_title, details).
+
+    Returns:
+        The new action IDs in input order, or an empty list on error
+    """
+    if not actions:
+        return []
+    try:
+        with get_connection() as conn:
+            cur = _scratch_cursor(conn)
+            # Built once connected: _json needs psycopg2 loaded
+            rows = [
+                (session_id, a['action_type'], a.get('target_type'), a.get('target_id'),
+                 a.get('target_title'), _json(a.get('details') or {}))
+                for a in actions
+            ]
+            # RETURNING hands back every ID from the same round-trip
+            result = execute_values(cur, """
+                INSERT INTO planning_actions
+                (session_id, action_type, target_type, target_id, target_title, details)
+                VALUES %s
+                RETURNING id
+            """, rows, page_size=500, fetch=True)
+            conn.commit()
+            invalidate_query_cache(CACHE_PLANNING)
+            return [row['id'] for row in result]
+    except Exception as e:
+        logger.error(f"Failed to insert planning actions: {e}")
+        return []
+
+
+def insert_planning_messages(session_id: int, messages: list[dict]) -> list[int]:
+    """
+    Insert several planning messages in one statement.
+
+    Each message dict takes role, content and optionally tokens_used.
+
+    Returns:
+        The new message IDs in input order, or an empty list on error
+    """
+    if not messages:
+        return []
+    rows = [
+        (session_id, m['role'], m['content'], m.get('tokens_used'))
+        for m in messages
+    ]
+    try:
+        with get_connection() as conn:
+            cur = _scratch_cursor(conn)
+            result = execute_values(cur, """
+                INSERT INTO planning_messages
+                (session_id, role, content, tokens_used)
+                VALUES %s
+                RETURNING id
+            """, rows, page_size=500, fetch=True)
+            conn.commit()
+            return [row['id'] for row in result]
+    except Exception as e:
+        logger.error(f"Failed to insert planning messages: {e}")
+        return []
+
+
 def get_planning_sessions(days: int = 30, limit: int = 20) -> list[dict]:
     """Get recent planning sessions."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT id, started_at, ended_at, duration_seconds,
                        messages_count, actions_count
                 FROM planning_sessions
-                WHERE started_at > NOW() - INTERVAL '1 day' * %s
+                WHERE started_at > NOW() - INTERVAL '1 day' * %s::int
                 ORDER BY started_at DESC
                 LIMIT %s
             """, (days, limit))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get planning sessions: {e}")
         return []
 
 
+@ttl_cache(domain=CACHE_PLANNING)
 def get_planning_action_breakdown(days: int = 30) -> list[dict]:
     """Get action type breakdown for planning analytics."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT action_type, COUNT(*) as count
                 FROM planning_actions
-                WHERE action_at > NOW() - INTERVAL '1 day' * %s
+                WHERE action_at > NOW() - INTERVAL '1 day' * %s::int
                 GROUP BY action_type
                 ORDER BY count DESC
             """, (days,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get planning action breakdown: {e}")
         return []
 
 
+@ttl_cache(domain=CACHE_PLANNING)
 def get_planning_totals(days: int = 30) -> dict:
     """Get planning session totals for analytics."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
                     COUNT(*) as total_sessions,
@@ -673,11 +1389,11 @@ def get_planning_totals(days: int = 30) -> dict:
                     COALESCE(SUM(actions_count), 0) as total_actions,
                     COALESCE(AVG(duration_seconds), 0) as avg_duration
                 FROM planning_sessions
-                WHERE started_at > NOW() - INTERVAL '1 day' * %s
+                WHERE started_at > NOW() - INTERVAL '1 day' * %s::int
                   AND ended_at IS NOT NULL
             """, (days,))
             result = cur.fetchone()
-            return dict(result) if result else {}
+            return result or {}
     except Exception as e:
         logger.error(f"Failed to get planning totals: {e}")
         return {}
@@ -687,104 +1403,270 @@ def get_planning_totals(days: int = 30) -> dict:
 # Overnight Sprint Operations
 # =============================================================================
 
+_SPRINT_COLUMNS = (
+    "sprint_date", "task_id", "task_title", "status",
+    "started_at", "completed_at", "window_start", "window_end",
+    "gate_tests_passing", "gate_no_lint_errors", "gate_docs_updated",
+    "gate_committed", "gate_self_validated", "gate_happy_path",
+    "gate_edge_cases", "gate_pal_reviewed",
+    "tasks_completed", "tasks_total", "gates_passed",
+    "block_reason", "obsidian_path",
+)
+# The sprint's date and original window are kept when it is re-synced
+_SPRINT_UPDATE_COLUMNS = tuple(
+    c for c in _SPRINT_COLUMNS if c not in ("sprint_date", "window_start", "window_end")
+)
+
+_UPSERT_SPRINT_SQL = f"""
+    INSERT INTO overnight_sprints ({", ".join(_SPRINT_COLUMNS)}, updated_at)
+    VALUES ({", ".join(["%s"] * len(_SPRINT_COLUMNS))}, NOW())
+    ON CONFLICT (sprint_date) DO UPDATE SET
+        ({", ".join(_SPRINT_UPDATE_COLUMNS)}, updated_at)
+        = ({", ".join("EXCLUDED." + c for c in _SPRINT_UPDATE_COLUMNS)}, NOW())
+    RETURNING id
+"""
+
+
+def _upsert_sprint(cur, sprint: dict, quality_gates: dict) -> int | None:
+    """Insert or update a sprint record on cur. Returns the sprint ID."""
+    _execute_prepared(cur, "upsert_sprint", _UPSERT_SPRINT_SQL, (
+        sprint['date'], sprint.get('task_id'), sprint.get('task_title'),
+        sprint.get('status', 'pending'),
+        sprint.get('started_at'), sprint.get('completed_at'),
+        sprint.get('started_at'), sprint.get('completed_at'),
+        quality_gates.get('tests_passing', False),
+        quality_gates.get('no_lint_errors', False),
+        quality_gates.get('docs_updated', False),
+        quality_gates.get('committed_to_branch', False),
+        quality_gates.get('self_validated', False),
+        quality_gates.get('happy_path_works', False),
+        quality_gates.get('edge_cases_handled', False),
+        quality_gates.get('pal_reviewed', False),
+        sprint.get('tasks_completed', 0), sprint.get('tasks_total', 0),
+        sprint.get('gates_passed', 0),
+        sprint.get('block_reason'), sprint.get('obsidian_path')
+    ))
+    result = cur.fetchone()
+    return result['id'] if result else None
+
+
+_CLEAR_SPRINT_RELATED_SQL = """
+    WITH deleted_activity AS (
+        DELETE FROM overnight_activity WHERE sprint_id = %(sprint_id)s
+    ), deleted_decisions AS (
+        DELETE FROM overnight_decisions WHERE sprint_id = %(sprint_id)s
+    )
+    DELETE FROM overnight_deviations WHERE sprint_id = %(sprint_id)s
+"""
+
+_INSERT_SPRINT_ACTIVITY_SQL = """
+    INSERT INTO overnight_activity (sprint_id, activity_at, activity_type, what, why, outcome)
+    VALUES %s
+"""
+
+_INSERT_SPRINT_DECISION_SQL = """
+    INSERT INTO overnight_decisions
+    (sprint_id, decided_at, question, context, decision, rationale, confidence, pal_responses, consensus)
+    VALUES %s
+"""
+
+_INSERT_SPRINT_DEVIATION_SQL = """
+    INSERT INTO overnight_deviations
+    (sprint_id, deviated_at, original_scope, deviation, reason, flagged)
+    VALUES %s
+"""
+
+
+def _sprint_activity_rows(sprint_id: int, activities: list[dict]) -> list[tuple]:
+    """Build overnight_activity parameter rows."""
+    return [
+        (sprint_id, a.get('activity_at'), a.get('activity_type'),
+         a.get('what'), a.get('why'), a.get('outcome'))
+        for a in activities
+    ]
+
+
+def _sprint_decision_rows(sprint_id: int, decisions: list[dict]) -> list[tuple]:
+    """Build overnight_decisions parameter rows."""
+    return [
+        (sprint_id, d.get('decided_at'), d.get('question'), d.get('context'),
+         d.get('decision', ''), d.get('rationale'), d.get('confidence'),
+         _json(d.get('pal_responses') or {}), d.get('consensus'))
+        for d in decisions
+    ]
+
+
+def _sprint_deviation_rows(sprint_id: int, deviations: list[dict]) -> list[tuple]:
+    """Build overnight_deviations parameter rows."""
+    return [
+        (sprint_id, d.get('deviated_at'), d.get('original_scope'),
+         d.get('deviation', ''), d.get('reason'), d.get('flagged', False))
+        for d in deviations
+    ]
+
+
+def _render_values(cur, sql: str, rows: list[tuple]) -> bytes:
+    """Render a multi-row INSERT client-side, as execute_values does for one page."""
+    placeholders = "(" + ", ".join(["%s"] * len(rows[0])) + ")"
+    values = b", ".join(cur.mogrify(placeholders, row) for row in rows)
+    head, tail = sql.split("%s")
+    return head.encode() + values + tail.encode()
+
+
+def _clear_sprint_related_data(cur, sprint_id: int) -> None:
+    """Delete activity, decisions, and deviations for a sprint on cur."""
+    # Data-modifying CTEs clear all three tables in one round-trip
+    cur.execute(_CLEAR_SPRINT_RELATED_SQL, {'sprint_id': sprint_id})
+
+
+def _insert_sprint_activities(cur, sprint_id: int, activities: list[dict]) -> None:
+    """Insert sprint activity rows on cur with one execute_values statement."""
+    if activities:
+        execute_values(cur, _INSERT_SPRINT_ACTIVITY_SQL,
+                       _sprint_activity_rows(sprint_id, activities), page_size=500)
+
+
+def _insert_sprint_decisions(cur, sprint_id: int, decisions: list[dict]) -> None:
+    """Insert sprint decision rows on cur with one execute_values statement."""
+    if decisions:
+        execute_values(cur, _INSERT_SPRINT_DECISION_SQL,
+                       _sprint_decision_rows(sprint_id, decisions), page_size=500)
+
+
+def _insert_sprint_deviations(cur, sprint_id: int, deviations: list[dict]) -> None:
+    """Insert sprint deviation rows on cur with one execute_values statement."""
+    if deviations:
+        execute_values(cur, _INSERT_SPRINT_DEVIATION_SQL,
+                       _sprint_deviation_rows(sprint_id, deviations), page_size=500)
+
+
+def _replace_sprint_related_data(cur, sprint_id: int, activities: list[dict],
+                                 decisions: list[dict], deviations: list[dict]) -> None:
+    """
+    Clear and re-insert a sprint's child records in a single round-trip.
+
+    The DELETE and every multi-row INSERT are rendered client-side and sent
+    as one multi-statement batch, so the server receives them together
+    rather than one request per statement.
+    """
+    statements = [cur.mogrify(_CLEAR_SPRINT_RELATED_SQL, {'sprint_id': sprint_id})]
+    for sql, rows in (
+        (_INSERT_SPRINT_ACTIVITY_SQL, _sprint_activity_rows(sprint_id, activities)),
+        (_INSERT_SPRINT_DECISION_SQL, _sprint_decision_rows(sprint_id, decisions)),
+        (_INSERT_SPRINT_DEVIATION_SQL, _sprint_deviation_rows(sprint_id, deviations)),
+    ):
+        if rows:
+            statements.append(_render_values(cur, sql, rows))
+    cur.execute(b";".join(statements))
+
+
 def upsert_sprint(sprint: dict, quality_gates: dict) -> int | None:
     """
     Insert or update a sprint record.
     Returns sprint ID or None on error.
     """
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO overnight_sprints (
-                    sprint_date, task_id, task_title, status,
-                    started_at, completed_at, window_start, window_end,
-                    gate_tests_passing, gate_no_lint_errors, gate_docs_updated,
-                    gate_committed, gate_self_validated, gate_happy_path,
-                    gate_edge_cases, gate_pal_reviewed,
-                    tasks_completed, tasks_total, gates_passed,
-                    block_reason, obsidian_path, updated_at
-                ) VALUES (
-                    %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, %s, %s, %s,
-                    %s, %s, %s, %s, %s, NOW()
-                )
-                ON CONFLICT (sprint_date) DO UPDATE SET
-                    task_id = EXCLUDED.task_id,
-                    task_title = EXCLUDED.task_title,
-                    status = EXCLUDED.status,
-                    started_at = EXCLUDED.started_at,
-                    completed_at = EXCLUDED.completed_at,
-                    gate_tests_passing = EXCLUDED.gate_tests_passing,
-                    gate_no_lint_errors = EXCLUDED.gate_no_lint_errors,
-                    gate_docs_updated = EXCLUDED.gate_docs_updated,
-                    gate_committed = EXCLUDED.gate_committed,
-                    gate_self_validated = EXCLUDED.gate_self_validated,
-                    gate_happy_path = EXCLUDED.gate_happy_path,
-                    gate_edge_cases = EXCLUDED.gate_edge_cases,
-                    gate_pal_reviewed = EXCLUDED.gate_pal_reviewed,
-                    tasks_completed = EXCLUDED.tasks_completed,
-                    tasks_total = EXCLUDED.tasks_total,
-                    gates_passed = EXCLUDED.gates_passed,
-                    block_reason = EXCLUDED.block_reason,
-                    obsidian_path = EXCLUDED.obsidian_path,
-                    updated_at = NOW()
-                RETURNING id
-            """, (
-                sprint['date'], sprint.get('task_id'), sprint.get('task_title'),
-                sprint.get('status', 'pending'),
-                sprint.get('started_at'), sprint.get('completed_at'),
-                sprint.get('started_at'), sprint.get('completed_at'),
-                quality_gates.get('tests_passing', False),
-                quality_gates.get('no_lint_errors', False),
-                quality_gates.get('docs_updated', False),
-                quality_gates.get('committed_to_branch', False),
-                quality_gates.get('self_validated', False),
-                quality_gates.get('happy_path_works', False),
-                quality_gates.get('edge_cases_handled', False),
-                quality_gates.get('pal_reviewed', False),
-                sprint.get('tasks_completed', 0), sprint.get('tasks_total', 0),
-                sprint.get('gates_passed', 0),
-                sprint.get('block_reason'), sprint.get('obsidian_path')
-            ))
-            result = cur.fetchone()
-            conn.commit()
-            return result['id'] if result else None
+        with transaction() as cur:
+            return _upsert_sprint(cur, sprint, quality_gates)
     except Exception as e:
         logger.error(f"Failed to upsert sprint: {e}")
         return None
 
 
-def clear_sprint_related_data(sprint_id: int) -> bool:
-    """Delete activity, decisions, and deviations for a sprint (for re-sync)."""
+def save_sprint_with_related(sprint: dict, quality_gates: dict, activities: list[dict],
+                             decisions: list[dict], deviations: list[dict]) -> int | None:
+    """
+    Upsert a sprint and replace its activity, decisions, and deviations.
+
+    All writes share one transaction, so a re-sync commits once and never
+    leaves a sprint with partially replaced child records.
+    Returns sprint ID or None on error.
+    """
+    try:
+        with transaction() as cur:
+            sprint_id = _upsert_sprint(cur, sprint, quality_gates)
+            if not sprint_id:
+                return None
+            _replace_sprint_related_data(cur, sprint_id, activities, decisions, deviations)
+            return sprint_id
+    except Exception as e:
+        logger.error(f"Failed to save sprint: {e}")
+        return None
+
+
+def clear_sprint_related_data(sprint_id: int) -> bool:
+    """Delete activity, decisions, and deviations for a sprint (for re-sync)."""
+    try:
+        with transaction() as cur:
+            _clear_sprint_related_data(cur, sprint_id)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to clear sprint related data: {e}")
+        return False
+
+
+def insert_sprint_activities_bulk(sprint_id: int, activities: list[dict]) -> bool:
+    """
+    Insert sprint activity records in a single statement.
+
+    Each activity dict uses the overnight_activity column names
+    (activity_at, activity_type, what, why, outcome).
+    """
+    if not activities:
+        return True
+    try:
+        with transaction() as cur:
+            _insert_sprint_activities(cur, sprint_id, activities)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to insert sprint activities: {e}")
+        return False
+
+
+def insert_sprint_decisions_bulk(sprint_id: int, decisions: list[dict]) -> bool:
+    """
+    Insert sprint decision records in a single statement.
+
+    Each decision dict uses the overnight_decisions column names
+    (decided_at, question, context, decision, rationale, confidence,
+    pal_responses, consensus).
+    """
+    if not decisions:
+        return True
+    try:
+        with transaction() as cur:
+            _insert_sprint_decisions(cur, sprint_id, decisions)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to insert sprint decisions: {e}")
+        return False
+
+
+def insert_sprint_deviations_bulk(sprint_id: int, deviations: list[dict]) -> bool:
+    """
+    Insert sprint deviation records in a single statement.
+
+    Each deviation dict uses the overnight_deviations column names
+    (deviated_at, original_scope, deviation, reason, flagged).
+    """
+    if not deviations:
+        return True
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("DELETE FROM overnight_activity WHERE sprint_id = %s", (sprint_id,))
-            cur.execute("DELETE FROM overnight_decisions WHERE sprint_id = %s", (sprint_id,))
-            cur.execute("DELETE FROM overnight_deviations WHERE sprint_id = %s", (sprint_id,))
-            conn.commit()
-            return True
+        with transaction() as cur:
+            _insert_sprint_deviations(cur, sprint_id, deviations)
+        return True
     except Exception as e:
-        logger.error(f"Failed to clear sprint related data: {e}")
+        logger.error(f"Failed to insert sprint deviations: {e}")
         return False
 
 
 def insert_sprint_activity(sprint_id: int, activity_at, activity_type: str,
                            what: str, why: str = None, outcome: str = None) -> bool:
     """Insert a sprint activity record."""
-    try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO overnight_activity (sprint_id, activity_at, activity_type, what, why, outcome)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (sprint_id, activity_at, activity_type, what, why, outcome))
-            conn.commit()
-            return True
-    except Exception as e:
-        logger.error(f"Failed to insert sprint activity: {e}")
-        return False
+    return insert_sprint_activities_bulk(sprint_id, [{
+        'activity_at': activity_at, 'activity_type': activity_type,
+        'what': what, 'why': why, 'outcome': outcome
+    }])
 
 
 def insert_sprint_decision(sprint_id: int, decided_at, question: str,
@@ -792,46 +1674,28 @@ def insert_sprint_decision(sprint_id: int, decided_at, question: str,
                            rationale: str = None, confidence: str = None,
                            pal_responses: dict = None, consensus: str = None) -> bool:
     """Insert a sprint decision record."""
-    try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO overnight_decisions
-                (sprint_id, decided_at, question, context, decision, rationale, confidence, pal_responses, consensus)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (sprint_id, decided_at, question, context, decision, rationale,
-                  confidence, json.dumps(pal_responses or {}), consensus))
-            conn.commit()
-            return True
-    except Exception as e:
-        logger.error(f"Failed to insert sprint decision: {e}")
-        return False
+    return insert_sprint_decisions_bulk(sprint_id, [{
+        'decided_at': decided_at, 'question': question, 'context': context,
+        'decision': decision, 'rationale': rationale, 'confidence': confidence,
+        'pal_responses': pal_responses, 'consensus': consensus
+    }])
 
 
 def insert_sprint_deviation(sprint_id: int, deviated_at, original_scope: str = None,
                             deviation: str = '', reason: str = None,
                             flagged: bool = False) -> bool:
     """Insert a sprint deviation record."""
-    try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO overnight_deviations
-                (sprint_id, deviated_at, original_scope, deviation, reason, flagged)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (sprint_id, deviated_at, original_scope, deviation, reason, flagged))
-            conn.commit()
-            return True
-    except Exception as e:
-        logger.error(f"Failed to insert sprint deviation: {e}")
-        return False
+    return insert_sprint_deviations_bulk(sprint_id, [{
+        'deviated_at': deviated_at, 'original_scope': original_scope,
+        'deviation': deviation, 'reason': reason, 'flagged': flagged
+    }])
 
 
 def get_sprints(limit: int = 20) -> list[dict]:
     """Get recent sprints from database."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT id, sprint_date, task_id, task_title, status,
                        started_at, completed_at,
@@ -844,7 +1708,7 @@ def get_sprints(limit: int = 20) -> list[dict]:
                 ORDER BY sprint_date DESC
                 LIMIT %s
             """, (limit,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get sprints: {e}")
         return []
@@ -853,15 +1717,15 @@ def get_sprints(limit: int = 20) -> list[dict]:
 def get_sprint_activities(sprint_id: int) -> list[dict]:
     """Get activities for a sprint."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT activity_at, activity_type, what, why, outcome
                 FROM overnight_activity
                 WHERE sprint_id = %s
                 ORDER BY activity_at
             """, (sprint_id,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get sprint activities: {e}")
         return []
@@ -870,8 +1734,8 @@ def get_sprint_activities(sprint_id: int) -> list[dict]:
 def get_sprint_decisions(sprint_id: int) -> list[dict]:
     """Get decisions for a sprint."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT decided_at, question, context, decision, rationale,
                        confidence, pal_responses, consensus
@@ -879,7 +1743,7 @@ def get_sprint_decisions(sprint_id: int) -> list[dict]:
                 WHERE sprint_id = %s
                 ORDER BY decided_at
             """, (sprint_id,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get sprint decisions: {e}")
         return []
@@ -888,29 +1752,96 @@ def get_sprint_decisions(sprint_id: int) -> list[dict]:
 def get_sprint_deviations(sprint_id: int) -> list[dict]:
     """Get deviations for a sprint."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT deviated_at, original_scope, deviation, reason, flagged
                 FROM overnight_deviations
                 WHERE sprint_id = %s
                 ORDER BY deviated_at
             """, (sprint_id,))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get sprint deviations: {e}")
         return []
 
 
+def _group_by_sprint(rows: list[dict]) -> dict[int, list[dict]]:
+    """Group rows ordered by sprint_id into {sprint_id: rows}, dropping the key column."""
+    grouped: dict[int, list[dict]] = {}
+    for row in rows:
+        grouped.setdefault(row.pop('sprint_id'), []).append(row)
+    return grouped
+
+
+def get_sprint_activities_bulk(sprint_ids: list[int]) -> dict[int, list[dict]]:
+    """Get activities for several sprints in one query, keyed by sprint ID."""
+    if not sprint_ids:
+        return {}
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute("""
+                SELECT sprint_id, activity_at, activity_type, what, why, outcome
+                FROM overnight_activity
+                WHERE sprint_id = ANY(%s)
+                ORDER BY sprint_id, activity_at
+            """, (list(sprint_ids),))
+            return _group_by_sprint(cur.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to get sprint activities: {e}")
+        return {}
+
+
+def get_sprint_decisions_bulk(sprint_ids: list[int]) -> dict[int, list[dict]]:
+    """Get decisions for several sprints in one query, keyed by sprint ID."""
+    if not sprint_ids:
+        return {}
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute("""
+                SELECT sprint_id, decided_at, question, context, decision, rationale,
+                       confidence, pal_responses, consensus
+                FROM overnight_decisions
+                WHERE sprint_id = ANY(%s)
+                ORDER BY sprint_id, decided_at
+            """, (list(sprint_ids),))
+            return _group_by_sprint(cur.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to get sprint decisions: {e}")
+        return {}
+
+
+def get_sprint_deviations_bulk(sprint_ids: list[int]) -> dict[int, list[dict]]:
+    """Get deviations for several sprints in one query, keyed by sprint ID."""
+    if not sprint_ids:
+        return {}
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute("""
+                SELECT sprint_id, deviated_at, original_scope, deviation, reason, flagged
+                FROM overnight_deviations
+                WHERE sprint_id = ANY(%s)
+                ORDER BY sprint_id, deviated_at
+            """, (list(sprint_ids),))
+            return _group_by_sprint(cur.fetchall())
+    except Exception as e:
+        logger.error(f"Failed to get sprint deviations: {e}")
+        return {}
+
+
 # =============================================================================
 # Configuration Tables
 # =============================================================================
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_activity_types(active_only: bool = True) -> list[dict]:
     """Get all activity types for XP logging."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             query = """
                 SELECT code, name, description, area_code, base_xp, icon, color,
                        duration_bonus, active, sort_order
@@ -920,35 +1851,55 @@ def get_activity_types(active_only: bool = True) -> list[dict]:
                 query += " WHERE active = TRUE"
             query += " ORDER BY sort_order, name"
             cur.execute(query)
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get activity types: {e}")
         return []
 
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_activity_type(code: str) -> Optional[dict]:
     """Get a single activity type by code."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            _execute_prepared(cur, "get_activity_type", """
                 SELECT code, name, description, area_code, base_xp, icon, color,
                        duration_bonus, active, sort_order
                 FROM activity_types
                 WHERE code = %s
             """, (code,))
             row = cur.fetchone()
-            return dict(row) if row else None
+            return row
     except Exception as e:
         logger.error(f"Failed to get activity type {code}: {e}")
         return None
 
 
+def get_activity_types_by_codes(codes: list[str]) -> dict[str, dict]:
+    """Get several activity types in one query, keyed by code."""
+    if not codes:
+        return {}
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute("""
+                SELECT code, name, description, area_code, base_xp, icon, color,
+                       duration_bonus, active, sort_order
+                FROM activity_types
+                WHERE code = ANY(%s)
+            """, (list(codes),))
+            return {row['code']: row for row in cur}
+    except Exception as e:
+        logger.error(f"Failed to get activity types: {e}")
+        return {}
+
+
 def upsert_activity_type(data: dict) -> bool:
     """Create or update an activity type."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO activity_types (code, name, description, area_code, base_xp,
                                            icon, color, duration_bonus, active, sort_order)
@@ -967,6 +1918,7 @@ def upsert_activity_type(data: dict) -> bool:
                     updated_at = NOW()
             """, data)
             conn.commit()
+            invalidate_query_cache(CACHE_REFERENCE)
             return True
     except Exception as e:
         logger.error(f"Failed to upsert activity type: {e}")
@@ -977,20 +1929,22 @@ def delete_activity_type(code: str) -> bool:
     """Delete an activity type."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("DELETE FROM activity_types WHERE code = %s", (code,))
             conn.commit()
+            invalidate_query_cache(CACHE_REFERENCE)
             return cur.rowcount > 0
     except Exception as e:
         logger.error(f"Failed to delete activity type: {e}")
         return False
 
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_game_config(key: str = None) -> Any:
     """Get game configuration value(s)."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             if key:
                 cur.execute("""
                     SELECT key, value, data_type, description, category
@@ -1006,23 +1960,26 @@ def get_game_config(key: str = None) -> Any:
                     FROM game_config ORDER BY category, key
                 """)
                 return {row['key']: _convert_config_value(row['value'], row['data_type'])
-                        for row in cur.fetchall()}
+                        for row in cur}
     except Exception as e:
         logger.error(f"Failed to get game config: {e}")
         return {} if key is None else None
 
 
+_TRUE_STRINGS = frozenset(('true', '1', 'yes'))
+
+_CONFIG_CONVERTERS = {
+    'integer': int,
+    'float': float,
+    'boolean': lambda value: value.lower() in _TRUE_STRINGS,
+    'json': _loads_json,
+}
+
+
 def _convert_config_value(value: str, data_type: str) -> Any:
     """Convert config value to appropriate Python type."""
-    if data_type == 'integer':
-        return int(value)
-    elif data_type == 'float':
-        return float(value)
-    elif data_type == 'boolean':
-        return value.lower() in ('true', '1', 'yes')
-    elif data_type == 'json':
-        return json.loads(value)
-    return value
+    converter = _CONFIG_CONVERTERS.get(data_type)
+    return converter(value) if converter else value
 
 
 def set_game_config(key: str, value: Any, data_type: str = 'string',
@@ -1030,7 +1987,7 @@ def set_game_config(key: str, value: Any, data_type: str = 'string',
     """Set a game configuration value."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO game_config (key, value, data_type, description, category)
                 VALUES (%s, %s, %s, %s, %s)
@@ -1042,17 +1999,19 @@ def set_game_config(key: str, value: Any, data_type: str = 'string',
                     updated_at = NOW()
             """, (key, str(value), data_type, description, category))
             conn.commit()
+            invalidate_query_cache(CACHE_REFERENCE)
             return True
     except Exception as e:
         logger.error(f"Failed to set game config: {e}")
         return False
 
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_kanban_columns(active_only: bool = True) -> list[dict]:
     """Get all kanban column definitions."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             query = """
                 SELECT code, title, label, icon, color, wip_limit, sort_order, active
                 FROM kanban_columns
@@ -1061,7 +2020,7 @@ def get_kanban_columns(active_only: bool = True) -> list[dict]:
                 query += " WHERE active = TRUE"
             query += " ORDER BY sort_order"
             cur.execute(query)
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get kanban columns: {e}")
         return []
@@ -1071,7 +2030,7 @@ def upsert_kanban_column(data: dict) -> bool:
     """Create or update a kanban column."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO kanban_columns (code, title, label, icon, color, wip_limit, sort_order, active)
                 VALUES (%(code)s, %(title)s, %(label)s, %(icon)s, %(color)s,
@@ -1086,17 +2045,19 @@ def upsert_kanban_column(data: dict) -> bool:
                     active = EXCLUDED.active
             """, data)
             conn.commit()
+            invalidate_query_cache(CACHE_REFERENCE)
             return True
     except Exception as e:
         logger.error(f"Failed to upsert kanban column: {e}")
         return False
 
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_xp_rules(source: str = None, active_only: bool = True) -> list[dict]:
     """Get XP calculation rules."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             query = """
                 SELECT code, name, description, source, area_code, rule_type,
                        condition, xp_per_unit, max_xp, active
@@ -1111,7 +2072,7 @@ def get_xp_rules(source: str = None, active_only: bool = True) -> list[dict]:
                 params.append(source)
             query += " ORDER BY source, code"
             cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get XP rules: {e}")
         return []
@@ -1121,13 +2082,12 @@ def upsert_xp_rule(data: dict) -> bool:
     """Create or update an XP rule."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            condition_json = json.dumps(data.get('condition', {})) if isinstance(data.get('condition'), dict) else data.get('condition')
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO xp_rules (code, name, description, source, area_code, rule_type,
                                      condition, xp_per_unit, max_xp, active)
                 VALUES (%(code)s, %(name)s, %(description)s, %(source)s, %(area_code)s,
-                        %(rule_type)s, %(condition)s::jsonb, %(xp_per_unit)s, %(max_xp)s, %(active)s)
+                        %(rule_type)s, %(condition)s, %(xp_per_unit)s, %(max_xp)s, %(active)s)
                 ON CONFLICT (code) DO UPDATE SET
                     name = EXCLUDED.name,
                     description = EXCLUDED.description,
@@ -1138,30 +2098,200 @@ def upsert_xp_rule(data: dict) -> bool:
                     xp_per_unit = EXCLUDED.xp_per_unit,
                     max_xp = EXCLUDED.max_xp,
                     active = EXCLUDED.active
-            """, {**data, 'condition': condition_json})
+            """, {**data, 'condition': _json(data.get('condition') or {})})
             conn.commit()
+            invalidate_query_cache(CACHE_REFERENCE)
             return True
     except Exception as e:
         logger.error(f"Failed to upsert XP rule: {e}")
         return False
 
 
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
 def get_priority_levels() -> list[dict]:
     """Get all priority level definitions."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT level, code, name, color, emoji, sort_order
                 FROM priority_levels
                 ORDER BY sort_order
             """)
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get priority levels: {e}")
         return []
 
 
+_REFERENCE_BUNDLE_SQL = """
+    SELECT 'activity_types' AS t, COALESCE(json_agg(a ORDER BY a.sort_order, a.name), '[]') AS j
+    FROM (SELECT code, name, description, area_code, base_xp, icon, color,
+                 duration_bonus, active, sort_order
+          FROM activity_types WHERE active = TRUE) a
+    UNION ALL
+    SELECT 'kanban_columns', COALESCE(json_agg(k ORDER BY k.sort_order), '[]')
+    FROM (SELECT code, title, label, icon, color, wip_limit, sort_order, active
+          FROM kanban_columns WHERE active = TRUE) k
+    UNION ALL
+    SELECT 'priority_levels', COALESCE(json_agg(p ORDER BY p.sort_order), '[]')
+    FROM (SELECT level, code, name, color, emoji, sort_order
+          FROM priority_levels) p
+    UNION ALL
+    SELECT 'xp_rules', COALESCE(json_agg(x ORDER BY x.source, x.code), '[]')
+    FROM (SELECT code, name, description, source, area_code, rule_type,
+                 condition, xp_per_unit, max_xp, active
+          FROM xp_rules WHERE active = TRUE) x
+    UNION ALL
+    SELECT 'game_config', COALESCE(json_agg(g ORDER BY g.category, g.key), '[]')
+    FROM (SELECT key, value, data_type, description, category
+          FROM game_config) g
+"""
+
+
+@ttl_cache(QueryCacheConfig.REFERENCE_TTL_SECONDS, domain=CACHE_REFERENCE)
+def get_reference_bundle() -> dict:
+    """
+    Get all active reference tables in a single round trip.
+
+    Returns a dict keyed by table name with the same rows the individual
+    getters return for their default arguments; ``game_config`` is the
+    converted key/value mapping from get_game_config().
+    """
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute(_REFERENCE_BUNDLE_SQL)
+            bundle = {row['t']: row['j'] for row in cur}
+            bundle['game_config'] = {
+                row['key']: _convert_config_value(row['value'], row['data_type'])
+                for row in bundle.get('game_config', [])
+            }
+            return bundle
+    except Exception as e:
+        logger.error(f"Failed to get reference bundle: {e}")
+        return {}
+
+
+# =============================================================================
+# Write-behind History Logging
+# =============================================================================
+
+class WriteBehindConfig:
+    """Background history writer configuration constants."""
+    # How long the writer waits after the first row for a burst to accumulate
+    FLUSH_INTERVAL_SECONDS = 0.1
+    MAX_BATCH_ROWS = 500
+    # How long shutdown waits for the writer to finish its last batch
+    STOP_TIMEOUT_SECONDS = 5
+
+
+_HISTORY_INSERT_SQL = {
+    "notification_history": """
+        INSERT INTO notification_history
+        (channel, source, title, body, priority, success, error_message, message_id)
+        VALUES %s
+    """,
+    "email_fetch_logs": """
+        INSERT INTO email_fetch_logs
+        (account, operation, details, success, error_message)
+        VALUES %s
+    """,
+}
+
+_history_queue: "queue.Queue" = queue.Queue()
+_history_writer: Optional[threading.Thread] = None
+_history_writer_lock = threading.Lock()
+_history_atexit_registered = False
+_HISTORY_STOP = object()
+
+
+def _enqueue_history(table: str, row: tuple) -> None:
+    """Queue a history row for the background writer, starting it if needed."""
+    global _history_writer, _history_atexit_registered
+
+    _history_queue.put((table, row))
+    if _history_writer is None or not _history_writer.is_alive():
+        with _history_writer_lock:
+            if _history_writer is None or not _history_writer.is_alive():
+                _history_writer = threading.Thread(
+                    target=_run_history_writer, name="db-history-writer", daemon=True
+                )
+                _history_writer.start()
+                if not _history_atexit_registered:
+                    atexit.register(flush_history_writes)
+                    _history_atexit_registered = True
+
+
+def _take_history_batch(first) -> tuple[list, bool]:
+    """Collect queued rows after first without blocking; report a stop request."""
+    batch = [first]
+    while len(batch) < WriteBehindConfig.MAX_BATCH_ROWS:
+        try:
+            item = _history_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is _HISTORY_STOP:
+            return batch, True
+        batch.append(item)
+    return batch, False
+
+
+def _write_history_batch(batch: list[tuple[str, tuple]]) -> None:
+    """Insert queued history rows, one execute_values per table, in one commit."""
+    by_table: dict[str, list[tuple]] = {}
+    for table, row in batch:
+        by_table.setdefault(table, []).append(row)
+    try:
+        with get_connection() as conn:
+            cur = _scratch_cursor(conn)
+            for table, rows in by_table.items():
+                execute_values(cur, _HISTORY_INSERT_SQL[table], rows, page_size=500)
+            conn.commit()
+    except Exception as e:
+        logger.error(f"Failed to write {len(batch)} history rows: {e}")
+
+
+def _run_history_writer() -> None:
+    """Background loop: wait for a row, let a burst gather, write it as one batch."""
+    while True:
+        first = _history_queue.get()
+        if first is _HISTORY_STOP:
+            return
+        time.sleep(WriteBehindConfig.FLUSH_INTERVAL_SECONDS)
+        batch, stop = _take_history_batch(first)
+        _write_history_batch(batch)
+        if stop:
+            return
+
+
+def flush_history_writes() -> None:
+    """
+    Write every queued history row before returning.
+
+    Stops the background writer (a later queued row starts a new one).
+    Registered with atexit so rows queued just before shutdown are kept.
+    """
+    global _history_writer
+
+    with _history_writer_lock:
+        writer, _history_writer = _history_writer, None
+    if writer is not None and writer.is_alive():
+        _history_queue.put(_HISTORY_STOP)
+        writer.join(WriteBehindConfig.STOP_TIMEOUT_SECONDS)
+
+    batch = []
+    while True:
+        try:
+            item = _history_queue.get_nowait()
+        except queue.Empty:
+            break
+        if item is not _HISTORY_STOP:
+            batch.append(item)
+    if batch:
+        _write_history_batch(batch)
+
+
 # =============================================================================
 # Email Automation: Notification History
 # =============================================================================
@@ -1179,7 +2309,7 @@ def log_notification(
     """Log a notification to history. Returns notification ID or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO notification_history
                 (channel, source, title, body, priority, success, error_message, message_id)
@@ -1194,6 +2324,26 @@ def log_notification(
         return None
 
 
+def queue_notification_log(
+    channel: str,
+    source: str,
+    title: str,
+    body: str,
+    priority: str,
+    success: bool,
+    error: Optional[str] = None,
+    message_id: Optional[str] = None
+) -> None:
+    """
+    Log a notification to history without waiting for the database.
+
+    Same arguments as log_notification(), for callers that don't need the
+    new ID. The row is written by the background history writer.
+    """
+    _enqueue_history("notification_history",
+                     (channel, source, title, body, priority, success, error, message_id))
+
+
 def get_notification_history(
     days: int = 7,
     channel: Optional[str] = None,
@@ -1202,13 +2352,13 @@ def get_notification_history(
 ) -> list[dict]:
     """Get notification history with optional filters."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             query = """
                 SELECT id, channel, source, title, body, priority,
                        sent_at, success, error_message, message_id
                 FROM notification_history
-                WHERE sent_at > NOW() - INTERVAL '%s days'
+                WHERE sent_at > NOW() - INTERVAL '1 day' * %s::int
             """
             params = [days]
 
@@ -1222,39 +2372,43 @@ def get_notification_history(
             query += " ORDER BY sent_at DESC LIMIT %s"
             params.append(limit)
 
-            cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
+            return _fetch_json_agg(cur, query, params, "sent_at DESC", timestamps=("sent_at",))
     except Exception as e:
         logger.error(f"Failed to get notification history: {e}")
         return []
 
 
+@ttl_cache(domain=CACHE_HISTORY)
 def get_notification_stats(days: int = 7) -> dict:
     """Get notification statistics for the last N days."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            # Both breakdowns from one scan; GROUPING() tells the sets apart
             cur.execute("""
                 SELECT
                     channel,
-                    COUNT(*) as total,
-                    SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful,
-                    SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) as failed
-                FROM notification_history
-                WHERE sent_at > NOW() - INTERVAL '%s days'
-                GROUP BY channel
-            """, (days,))
-            by_channel = {row['channel']: dict(row) for row in cur.fetchall()}
-
-            cur.execute("""
-                SELECT
                     source,
-                    COUNT(*) as total
+                    GROUPING(source) = 1 as is_channel,
+                    COUNT(*) as total,
+                    COUNT(*) FILTER (WHERE success) as successful,
+                    COUNT(*) FILTER (WHERE NOT success) as failed
                 FROM notification_history
-                WHERE sent_at > NOW() - INTERVAL '%s days'
-                GROUP BY source
+                WHERE sent_at > NOW() - INTERVAL '1 day' * %s::int
+                GROUP BY GROUPING SETS ((channel), (source))
             """, (days,))
-            by_source = {row['source']: row['total'] for row in cur.fetchall()}
+            by_channel = {}
+            by_source = {}
+            for row in cur:
+                if row['is_channel']:
+                    by_channel[row['channel']] = {
+                        'channel': row['channel'],
+                        'total': row['total'],
+                        'successful': row['successful'],
+                        'failed': row['failed'],
+                    }
+                else:
+                    by_source[row['source']] = row['total']
 
             return {
                 'by_channel': by_channel,
@@ -1274,7 +2428,7 @@ def start_job_run(job_id: str, trigger_type: str = 'scheduled') -> Optional[int]
     """Record start of a scheduled job run. Returns run ID or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO scheduled_job_runs (job_id, trigger_type, status)
                 VALUES (%s, %s, 'running')
@@ -1297,7 +2451,7 @@ def complete_job_run(
     """Record completion of a scheduled job run."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 UPDATE scheduled_job_runs
                 SET completed_at = NOW(),
@@ -1306,7 +2460,7 @@ def complete_job_run(
                     error_message = %s,
                     duration_seconds = EXTRACT(EPOCH FROM (NOW() - started_at))
                 WHERE id = %s
-            """, (status, json.dumps(result) if result else None, error, run_id))
+            """, (status, _json(result) if result else None, error, run_id))
             conn.commit()
             return cur.rowcount > 0
     except Exception as e:
@@ -1321,13 +2475,14 @@ def get_job_runs(
 ) -> list[dict]:
     """Get recent job runs with optional job ID filter."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             query = """
                 SELECT id, job_id, started_at, completed_at, status,
-                       trigger_type, result, error_message, duration_seconds
+                       trigger_type, result, error_message,
+                       duration_seconds::text AS duration_seconds
                 FROM scheduled_job_runs
-                WHERE started_at > NOW() - INTERVAL '%s days'
+                WHERE started_at > NOW() - INTERVAL '1 day' * %s::int
             """
             params = [days]
 
@@ -1338,8 +2493,9 @@ def get_job_runs(
             query += " ORDER BY started_at DESC LIMIT %s"
             params.append(limit)
 
-            cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
+            return _fetch_json_agg(cur, query, params, "started_at DESC",
+                                   timestamps=("started_at", "completed_at"),
+                                   decimals=("duration_seconds",))
     except Exception as e:
         logger.error(f"Failed to get job runs: {e}")
         return []
@@ -1348,9 +2504,9 @@ def get_job_runs(
 def get_last_successful_run(job_id: str) -> Optional[dict]:
     """Get the last successful run of a job."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            _execute_prepared(cur, "get_last_successful_run", """
                 SELECT id, job_id, started_at, completed_at, result, duration_seconds
                 FROM scheduled_job_runs
                 WHERE job_id = %s AND status = 'success'
@@ -1358,7 +2514,7 @@ def get_last_successful_run(job_id: str) -> Optional[dict]:
                 LIMIT 1
             """, (job_id,))
             row = cur.fetchone()
-            return dict(row) if row else None
+            return row
     except Exception as e:
         logger.error(f"Failed to get last successful run: {e}")
         return None
@@ -1378,7 +2534,7 @@ def log_email_fetch(
     """Log an email fetch operation. Returns log ID or None on error."""
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 INSERT INTO email_fetch_logs
                 (account, operation, details, success, error_message)
@@ -1393,6 +2549,49 @@ def log_email_fetch(
         return None
 
 
+def queue_email_fetch_log(
+    account: str,
+    operation: str,
+    details: str,
+    success: bool,
+    error: Optional[str] = None
+) -> None:
+    """
+    Log an email fetch operation without waiting for the database.
+
+    Same arguments as log_email_fetch(), for callers that don't need the
+    new ID. The row is written by the background history writer.
+    """
+    _enqueue_history("email_fetch_logs", (account, operation, details, success, error))
+
+
+_EMAIL_FETCH_LOG_COLUMNS = "id, account, operation, details, success, error_message, logged_at"
+# Leaves out the free-text details and error_message columns
+_EMAIL_FETCH_LOG_SUMMARY_COLUMNS = "id, account, operation, success, logged_at"
+
+
+def _select_email_fetch_logs(cur, columns: str, account: Optional[str], hours: int,
+                             success_only: bool, limit: int) -> list[dict]:
+    """Run the filtered, newest-first email fetch log listing for columns."""
+    query = f"""
+        SELECT {columns}
+        FROM email_fetch_logs
+        WHERE logged_at > NOW() - INTERVAL '1 hour' * %s::int
+    """
+    params = [hours]
+
+    if account:
+        query += " AND account = %s"
+        params.append(account)
+    if success_only:
+        query += " AND success = TRUE"
+
+    query += " ORDER BY logged_at DESC LIMIT %s"
+    params.append(limit)
+
+    return _fetch_json_agg(cur, query, params, "logged_at DESC", timestamps=("logged_at",))
+
+
 def get_email_fetch_logs(
     account: Optional[str] = None,
     hours: int = 24,
@@ -1401,59 +2600,90 @@ def get_email_fetch_logs(
 ) -> list[dict]:
     """Get email fetch logs with optional filters."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-            query = """
-                SELECT id, account, operation, details, success, error_message, logged_at
-                FROM email_fetch_logs
-                WHERE logged_at > NOW() - INTERVAL '%s hours'
-            """
-            params = [hours]
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            return _select_email_fetch_logs(cur, _EMAIL_FETCH_LOG_COLUMNS,
+                                            account, hours, success_only, limit)
+    except Exception as e:
+        logger.error(f"Failed to get email fetch logs: {e}")
+        return []
 
-            if account:
-                query += " AND account = %s"
-                params.append(account)
-            if success_only:
-                query += " AND success = TRUE"
 
-            query += " ORDER BY logged_at DESC LIMIT %s"
-            params.append(limit)
+def get_email_fetch_log_summaries(
+    account: Optional[str] = None,
+    hours: int = 24,
+    success_only: bool = False,
+    limit: int = 100
+) -> list[dict]:
+    """
+    Get email fetch logs without their text columns, for list views.
 
-            cur.execute(query, params)
-            return [dict(row) for row in cur.fetchall()]
+    Same filters as get_email_fetch_logs(); use get_email_fetch_log() to
+    load the details and error message of one entry.
+    """
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            return _select_email_fetch_logs(cur, _EMAIL_FETCH_LOG_SUMMARY_COLUMNS,
+                                            account, hours, success_only, limit)
     except Exception as e:
-        logger.error(f"Failed to get email fetch logs: {e}")
+        logger.error(f"Failed to get email fetch log summaries: {e}")
         return []
 
 
+def get_email_fetch_log(log_id: int) -> Optional[dict]:
+    """Get a single email fetch log entry with all columns."""
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute(f"""
+                SELECT {_EMAIL_FETCH_LOG_COLUMNS}
+                FROM email_fetch_logs
+                WHERE id = %s
+            """, (log_id,))
+            return cur.fetchone()
+    except Exception as e:
+        logger.error(f"Failed to get email fetch log {log_id}: {e}")
+        return None
+
+
+@ttl_cache(domain=CACHE_HISTORY)
 def get_email_fetch_stats(hours: int = 24) -> dict:
     """Get email fetch statistics."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            # Both breakdowns from one scan; GROUPING() tells the sets apart
             cur.execute("""
                 SELECT
                     account,
+                    operation,
+                    GROUPING(operation) = 1 as is_account,
                     COUNT(*) as total_ops,
-                    SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful,
-                    SUM(CASE WHEN NOT success THEN 1 ELSE 0 END) as failed,
+                    COUNT(*) FILTER (WHERE success) as successful,
+                    COUNT(*) FILTER (WHERE NOT success) as failed,
                     MAX(logged_at) as last_fetch
                 FROM email_fetch_logs
-                WHERE logged_at > NOW() - INTERVAL '%s hours'
-                GROUP BY account
-            """, (hours,))
-            by_account = {row['account']: dict(row) for row in cur.fetchall()}
-
-            cur.execute("""
-                SELECT
-                    operation,
-                    COUNT(*) as count,
-                    SUM(CASE WHEN success THEN 1 ELSE 0 END) as successful
-                FROM email_fetch_logs
-                WHERE logged_at > NOW() - INTERVAL '%s hours'
-                GROUP BY operation
+                WHERE logged_at > NOW() - INTERVAL '1 hour' * %s::int
+                GROUP BY GROUPING SETS ((account), (operation))
             """, (hours,))
-            by_operation = {row['operation']: dict(row) for row in cur.fetchall()}
+            by_account = {}
+            by_operation = {}
+            for row in cur:
+                if row['is_account']:
+                    by_account[row['account']] = {
+                        'account': row['account'],
+                        'total_ops': row['total_ops'],
+                        'successful': row['successful'],
+                        'failed': row['failed'],
+                        'last_fetch': row['last_fetch'],
+                    }
+                else:
+                    by_operation[row['operation']] = {
+                        'operation': row['operation'],
+                        'count': row['total_ops'],
+                        'successful': row['successful'],
+                    }
 
             return {
                 'by_account': by_account,
@@ -1477,25 +2707,59 @@ def cache_inbox_message(
     body_text: Optional[str] = None
 ) -> bool:
     """Cache an inbox message for analytics. Upserts on conflict."""
+    return cache_inbox_messages([{
+        'account': account,
+        'message_id': message_id,
+        'subject': subject,
+        'from_name': from_name,
+        'from_email': from_email,
+        'date_header': date_header,
+        'is_urgent': is_urgent,
+        'is_from_person': is_from_person,
+        'body_text': body_text,
+    }])
+
+
+def cache_inbox_messages(messages: list[dict]) -> bool:
+    """
+    Cache several inbox messages in one statement. Upserts on conflict.
+
+    Each message dict takes the keyword arguments of cache_inbox_message.
+    A message listed twice is written once, keeping its last entry.
+    """
+    if not messages:
+        return True
+    # One INSERT can't upsert the same key twice
+    latest = {}
+    for m in messages:
+        key = (m['account'], m['message_id'])
+        previous = latest.get(key)
+        body_text = m.get('body_text')
+        if body_text is None and previous is not None:
+            body_text = previous[8]
+        latest[key] = (
+            m['account'], m['message_id'], m.get('subject'), m.get('from_name'),
+            m.get('from_email'), m.get('date_header'), m.get('is_urgent', False),
+            m.get('is_from_person', False), body_text
+        )
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
+            cur = _scratch_cursor(conn)
+            execute_values(cur, """
                 INSERT INTO inbox_message_cache
                 (account, message_id, subject, from_name, from_email, date_header,
                  is_urgent, is_from_person, body_text)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                VALUES %s
                 ON CONFLICT (account, message_id) DO UPDATE SET
                     last_seen_at = CURRENT_TIMESTAMP,
                     is_urgent = EXCLUDED.is_urgent,
                     is_from_person = EXCLUDED.is_from_person,
                     body_text = COALESCE(EXCLUDED.body_text, inbox_message_cache.body_text)
-            """, (account, message_id, subject, from_name, from_email, date_header,
-                  is_urgent, is_from_person, body_text))
+            """, list(latest.values()), page_size=500)
             conn.commit()
             return True
     except Exception as e:
-        logger.error(f"Failed to cache inbox message: {e}")
+        logger.error(f"Failed to cache inbox messages: {e}")
         return False
 
 
@@ -1510,14 +2774,25 @@ def get_email_content_for_processing(account: str, message_id: str) -> dict:
          'attachments': [{'filename': str, 'text': str, 'content_type': str}]}
     """
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
-
-            # Get message body and metadata
-            cur.execute("""
-                SELECT subject, from_name, from_email, body_text
-                FROM inbox_message_cache
-                WHERE account = %s AND message_id = %s
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+
+            # Message body, metadata and attachment text in one round-trip
+            _execute_prepared(cur, "get_email_content", """
+                SELECT m.subject, m.from_name, m.from_email, m.body_text,
+                       COALESCE((
+                           SELECT json_agg(json_build_object(
+                                      'filename', a.filename,
+                                      'content_type', a.content_type,
+                                      'text', a.extracted_text
+                                  ) ORDER BY a.filename)
+                           FROM email_attachments a
+                           WHERE a.account = m.account AND a.message_id = m.message_id
+                             AND a.extraction_status = 'success'
+                             AND a.extracted_text IS NOT NULL
+                       ), '[]') as attachments
+                FROM inbox_message_cache m
+                WHERE m.account = %s AND m.message_id = %s
             """, (account, message_id))
             msg_row = cur.fetchone()
 
@@ -1525,28 +2800,12 @@ def get_email_content_for_processing(account: str, message_id: str) -> dict:
                 return {'body': '', 'subject': '', 'from_name': '', 'from_email': '',
                         'attachments': [], 'error': 'Message not found'}
 
-            # Get attachment content
-            cur.execute("""
-                SELECT filename, content_type, extracted_text
-                FROM email_attachments
-                WHERE account = %s AND message_id = %s
-                  AND extraction_status = 'success'
-                  AND extracted_text IS NOT NULL
-                ORDER BY filename
-            """, (account, message_id))
-            attachments = [
-                {'filename': row['filename'],
-                 'content_type': row['content_type'],
-                 'text': row['extracted_text']}
-                for row in cur.fetchall()
-            ]
-
             return {
                 'body': msg_row['body_text'] or '',
                 'subject': msg_row['subject'] or '',
                 'from_name': msg_row['from_name'] or '',
                 'from_email': msg_row['from_email'] or '',
-                'attachments': attachments
+                'attachments': msg_row['attachments']
             }
     except Exception as e:
         logger.error(f"Failed to get email content for processing: {e}")
@@ -1557,21 +2816,21 @@ def get_email_content_for_processing(account: str, message_id: str) -> dict:
 def get_inbox_message_stats(days: int = 7) -> dict:
     """Get inbox message cache statistics."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
                     account,
                     COUNT(*) as total_messages,
-                    SUM(CASE WHEN is_urgent THEN 1 ELSE 0 END) as urgent_count,
-                    SUM(CASE WHEN is_from_person THEN 1 ELSE 0 END) as from_people_count,
+                    COUNT(*) FILTER (WHERE is_urgent) as urgent_count,
+                    COUNT(*) FILTER (WHERE is_from_person) as from_people_count,
                     MIN(first_seen_at) as earliest,
                     MAX(last_seen_at) as latest
                 FROM inbox_message_cache
-                WHERE last_seen_at > NOW() - INTERVAL '%s days'
+                WHERE last_seen_at > NOW() - INTERVAL '1 day' * %s::int
                 GROUP BY account
             """, (days,))
-            return {row['account']: dict(row) for row in cur.fetchall()}
+            return {row['account']: row for row in cur}
     except Exception as e:
         logger.error(f"Failed to get inbox message stats: {e}")
         return {}
@@ -1592,34 +2851,103 @@ def store_attachment(
     extraction_error: Optional[str] = None
 ) -> Optional[int]:
     """Store email attachment metadata and extracted content."""
+    ids = store_attachments([{
+        'account': account,
+        'message_id': message_id,
+        'filename': filename,
+        'content_type': content_type,
+        'size_bytes': size_bytes,
+        'extracted_text': extracted_text,
+        'extraction_status': extraction_status,
+        'extraction_error': extraction_error,
+    }])
+    return ids[0] if ids else None
+
+
+_ATTACHMENT_COLUMNS = ("account", "message_id", "filename", "content_type", "size_bytes",
+                       "extracted_text", "extraction_status", "extraction_error")
+
+_ATTACHMENT_UPSERT_SUFFIX = """
+    ON CONFLICT (account, message_id, filename) DO UPDATE SET
+        extracted_text = EXCLUDED.extracted_text,
+        extraction_status = EXCLUDED.extraction_status,
+        extraction_error = EXCLUDED.extraction_error
+    RETURNING id
+"""
+
+
+def _merge_attachments_via_copy(cur, rows: list[tuple]) -> list[dict]:
+    """COPY attachment rows into a session temp table, then upsert them in one statement."""
+    # ON COMMIT DELETE ROWS leaves the table empty for the connection's next batch
+    cur.execute("""
+        CREATE TEMP TABLE IF NOT EXISTS tmp_email_attachments (
+            account VARCHAR(255),
+            message_id VARCHAR(255),
+            filename VARCHAR(500),
+            content_type VARCHAR(100),
+            size_bytes INTEGER,
+            extracted_text TEXT,
+            extraction_status VARCHAR(20),
+            extraction_error TEXT
+        ) ON COMMIT DELETE ROWS
+    """)
+    _copy_rows(cur, "tmp_email_attachments", _ATTACHMENT_COLUMNS, rows)
+    columns = ', '.join(_ATTACHMENT_COLUMNS)
+    cur.execute(f"""
+        INSERT INTO email_attachments ({columns})
+        SELECT {columns} FROM tmp_email_attachments
+    """ + _ATTACHMENT_UPSERT_SUFFIX)
+    return cur.fetchall()
+
+
+def store_attachments(attachments: list[dict]) -> list[int]:
+    """
+    Store several email attachments in one statement.
+
+    Each attachment dict takes the keyword arguments of store_attachment.
+    A (account, message_id, filename) key listed twice is written once,
+    keeping its last entry. Large batches, such as mailbox backfills, are
+    streamed with COPY and merged from a temp table.
+
+    Returns:
+        The attachment IDs in the order their keys first appear, or an
+        empty list on error
+    """
+    if not attachments:
+        return []
+    # One INSERT can't upsert the same key twice
+    latest = {}
+    for a in attachments:
+        latest[(a['account'], a['message_id'], a['filename'])] = (
+            a['account'], a['message_id'], a['filename'], a.get('content_type'),
+            a.get('size_bytes'), a.get('extracted_text'),
+            a.get('extraction_status', 'success'), a.get('extraction_error')
+        )
+    rows = list(latest.values())
     try:
         with get_connection() as conn:
-            cur = conn.cursor()
-            cur.execute("""
-                INSERT INTO email_attachments
-                (account, message_id, filename, content_type, size_bytes,
-                 extracted_text, extraction_status, extraction_error)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (account, message_id, filename) DO UPDATE SET
-                    extracted_text = EXCLUDED.extracted_text,
-                    extraction_status = EXCLUDED.extraction_status,
-                    extraction_error = EXCLUDED.extraction_error
-                RETURNING id
-            """, (account, message_id, filename, content_type, size_bytes,
-                  extracted_text, extraction_status, extraction_error))
-            result = cur.fetchone()
+            cur = _scratch_cursor(conn)
+            if len(rows) >= SnapshotConfig.COPY_MIN_ROWS:
+                result = _merge_attachments_via_copy(cur, rows)
+            else:
+                result = execute_values(
+                    cur,
+                    f"INSERT INTO email_attachments ({', '.join(_ATTACHMENT_COLUMNS)}) VALUES %s"
+                    + _ATTACHMENT_UPSERT_SUFFIX,
+                    rows, page_size=500, fetch=True
+                )
             conn.commit()
-            return result['id'] if result else None
+            return [row['id'] for row in result]
     except Exception as e:
-        logger.error(f"Failed to store attachment: {e}")
-        return None
+        logger.error(f"Failed to store attachments: {e}")
+        return []
 
 
 def get_attachments_for_message(account: str, message_id: str) -> list[dict]:
     """Get all attachments for a specific message."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT id, filename, content_type, size_bytes,
                        extracted_text, extraction_status, extraction_error,
@@ -1628,12 +2956,51 @@ def get_attachments_for_message(account: str, message_id: str) -> list[dict]:
                 WHERE account = %s AND message_id = %s
                 ORDER BY filename
             """, (account, message_id))
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to get attachments: {e}")
         return []
 
 
+def get_attachments_for_messages(
+    messages: list[tuple[str, str]]
+) -> dict[tuple[str, str], list[dict]]:
+    """
+    Get attachments for several messages in one query.
+
+    Args:
+        messages: (account, message_id) pairs
+
+    Returns:
+        {(account, message_id): attachments}, with the same columns as
+        get_attachments_for_message(); messages without attachments are omitted
+    """
+    if not messages:
+        return {}
+    accounts, message_ids = (list(col) for col in zip(*messages))
+    try:
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
+            cur.execute("""
+                SELECT account, message_id, id, filename, content_type, size_bytes,
+                       extracted_text, extraction_status, extraction_error,
+                       first_seen_at
+                FROM email_attachments
+                WHERE (account, message_id) IN (
+                    SELECT * FROM unnest(%s::text[], %s::text[])
+                )
+                ORDER BY account, message_id, filename
+            """, (accounts, message_ids))
+            grouped: dict[tuple[str, str], list[dict]] = {}
+            for row in cur:
+                key = (row.pop('account'), row.pop('message_id'))
+                grouped.setdefault(key, []).append(row)
+            return grouped
+    except Exception as e:
+        logger.error(f"Failed to get attachments: {e}")
+        return {}
+
+
 def search_attachment_content(
     query: str,
     account: Optional[str] = None,
@@ -1642,51 +3009,53 @@ def search_attachment_content(
 ) -> list[dict]:
     """Full-text search across attachment content."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             sql = """
                 SELECT a.id, a.account, a.message_id, a.filename,
                        a.content_type, a.size_bytes, a.first_seen_at,
-                       ts_headline('english', a.extracted_text, plainto_tsquery('english', %s),
-                                   'MaxWords=50, MinWords=20') as snippet
-                FROM email_attachments a
-                WHERE a.extracted_text IS NOT NULL
-                  AND to_tsvector('english', a.extracted_text) @@ plainto_tsquery('english', %s)
-                  AND a.first_seen_at > NOW() - INTERVAL '%s days'
+                       ts_headline('english', a.extracted_text, q.query,
+                                   'MaxWords=50, MinWords=20') as snippet,
+                       ts_rank_cd(a.content_tsv, q.query) as rank
+                FROM email_attachments a,
+                     plainto_tsquery('english', %s) AS q(query)
+                WHERE a.content_tsv @@ q.query
+                  AND a.first_seen_at > NOW() - INTERVAL '1 day' * %s::int
             """
-            params = [query, query, days]
+            params = [query, days]
 
             if account:
                 sql += " AND a.account = %s"
                 params.append(account)
 
-            sql += " ORDER BY a.first_seen_at DESC LIMIT %s"
+            sql += " ORDER BY rank DESC, a.first_seen_at DESC LIMIT %s"
             params.append(limit)
 
             cur.execute(sql, params)
-            return [dict(row) for row in cur.fetchall()]
+            return cur.fetchall()
     except Exception as e:
         logger.error(f"Failed to search attachments: {e}")
         return []
 
 
+@ttl_cache(domain=CACHE_HISTORY)
 def get_attachment_stats(days: int = 7) -> dict:
     """Get attachment statistics."""
     try:
-        with get_connection() as conn:
-            cur = conn.cursor()
+        with get_connection(autocommit=True) as conn:
+            cur = _scratch_cursor(conn)
             cur.execute("""
                 SELECT
                     COUNT(*) as total_attachments,
                     SUM(size_bytes) as total_bytes,
-                    COUNT(CASE WHEN extraction_status = 'success' THEN 1 END) as extracted,
-                    COUNT(CASE WHEN extraction_status = 'failed' THEN 1 END) as failed,
-                    COUNT(CASE WHEN content_type LIKE 'application/pdf%%' THEN 1 END) as pdfs
+                    COUNT(*) FILTER (WHERE extraction_status = 'success') as extracted,
+                    COUNT(*) FILTER (WHERE extraction_status = 'failed') as failed,
+                    COUNT(*) FILTER (WHERE content_type LIKE 'application/pdf%%') as pdfs
                 FROM email_attachments
-                WHERE first_seen_at > NOW() - INTERVAL '%s days'
+                WHERE first_seen_at > NOW() - INTERVAL '1 day' * %s::int
             """, (days,))
             row = cur.fetchone()
-            return dict(row) if row else {}
+            return row or {}
     except Exception as e:
         logger.error(f"Failed to get attachment stats: {e}")
         return {}
@@ -1,13 +1,18 @@
 """Inbox digest formatting for notifications with database integration."""
 
 import logging
+import time
 from datetime import datetime
+from itertools import chain
 from typing import Optional, Callable
 
 from .fetcher import InboxFetcher, FetchResult
 
 logger = logging.getLogger(__name__)
 
+# How long one fetch is reused across generate()/format_*() calls
+DIGEST_CACHE_TTL = 30  # seconds
+
 
 class InboxDigest:
     """Generates formatted inbox digests for notifications."""
@@ -15,17 +20,61 @@ class InboxDigest:
     def __init__(
         self,
         fetcher: InboxFetcher,
-        db_cache_message: Optional[Callable] = None
+        db_cache_message: Optional[Callable] = None,
+        db_cache_messages: Optional[Callable] = None,
+        cache_ttl: float = DIGEST_CACHE_TTL
     ):
         """Initialize with an InboxFetcher instance.
 
         Args:
             fetcher: Configured InboxFetcher to use for data retrieval
-            db_cache_message: Optional callback to cache messages to database
+            db_cache_message: Optional callback to cache one message to database
                              Signature matches database.cache_inbox_message
+            db_cache_messages: Optional callback to cache all messages in one batch
+                              Signature matches database.cache_inbox_messages;
+                              used instead of db_cache_message when both are given
+            cache_ttl: Seconds a fetch is reused by later calls (0 disables)
         """
         self.fetcher = fetcher
         self.db_cache_message = db_cache_message
+        self.db_cache_messages = db_cache_messages
+        self.cache_ttl = cache_ttl
+        self._cached_result: Optional[FetchResult] = None
+        self._cached_at = 0.0
+        self._cached_stored = False
+
+    def invalidate(self) -> None:
+        """Drop the cached fetch so the next call hits IMAP again."""
+        self._cached_result = None
+        self._cached_at = 0.0
+        self._cached_stored = False
+
+    def generate_raw(self, store_to_db: bool = True) -> FetchResult:
+        """Fetch all accounts, reusing a recent result within cache_ttl.
+
+        Returns the FetchResult as-is; use generate() for a JSON-ready dict.
+        A cached fetch that skipped the snapshot store is not reused when
+        the caller asks for store_to_db, so the snapshot is still written.
+        """
+        now = time.monotonic()
+        if (
+            self._cached_result is not None
+            and now - self._cached_at < self.cache_ttl
+            and (self._cached_stored or not store_to_db)
+        ):
+            logger.debug("Reusing inbox fetch from %.1fs ago", now - self._cached_at)
+            return self._cached_result
+
+        result = self.fetcher.fetch_all_accounts(store_to_db=store_to_db)
+
+        # Cache individual messages if callback provided
+        if self.db_cache_messages or self.db_cache_message:
+            self._cache_messages(result)
+
+        self._cached_result = result
+        self._cached_at = now
+        self._cached_stored = store_to_db
+        return result
 
     def generate(self, store_to_db: bool = True) -> dict:
         """Generate complete inbox digest data.
@@ -37,11 +86,7 @@ class InboxDigest:
             Dict with summary and per-account data
         """
         logger.info("Generating inbox digest")
-        result = self.fetcher.fetch_all_accounts(store_to_db=store_to_db)
-
-        # Cache individual messages if callback provided
-        if self.db_cache_message:
-            self._cache_messages(result)
+        result = self.generate_raw(store_to_db)
 
         return {
             "generated_at": result.fetched_at.isoformat(),
@@ -57,48 +102,47 @@ class InboxDigest:
         }
 
     def _cache_messages(self, result: FetchResult) -> None:
-        """Cache messages to database for analytics."""
-        cached_count = 0
+        """Cache messages to database for analytics, in one batch when possible."""
+        messages = []
         for account in result.accounts:
             if account.status != "ok":
                 continue
 
-            # Cache urgent messages
-            for msg in account.urgent:
-                try:
-                    self.db_cache_message(
-                        account=account.account,
-                        message_id=msg.id,
-                        subject=msg.subject,
-                        from_name=msg.from_name,
-                        from_email=msg.from_email,
-                        date_header=msg.date,
-                        is_urgent=True,
-                        is_from_person=True
-                    )
-                    cached_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to cache urgent message: {e}")
-
-            # Cache messages from people
-            for msg in account.from_people:
-                try:
-                    self.db_cache_message(
-                        account=account.account,
-                        message_id=msg.id,
-                        subject=msg.subject,
-                        from_name=msg.from_name,
-                        from_email=msg.from_email,
-                        date_header=msg.date,
-                        is_urgent=False,
-                        is_from_person=True
-                    )
-                    cached_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to cache person message: {e}")
-
-        if cached_count > 0:
-            logger.debug(f"Cached {cached_count} messages to database")
+            # Urgent messages, then messages from people not already listed,
+            # so a flagged message from a person stays marked urgent
+            urgent_ids = {msg.id for msg in account.urgent}
+            people = (msg for msg in account.from_people if msg.id not in urgent_ids)
+            for msg in chain(account.urgent, people):
+                messages.append({
+                    "account": account.account,
+                    "message_id": msg.id,
+                    "subject": msg.subject,
+                    "from_name": msg.from_name,
+                    "from_email": msg.from_email,
+                    "date_header": msg.date,
+                    "is_urgent": msg.id in urgent_ids,
+                    "is_from_person": True,
+                })
+
+        if not messages:
+            return
+
+        if self.db_cache_messages:
+            try:
+                if self.db_cache_messages(messages):
+                    logger.debug("Cached %d messages to database", len(messages))
+            except Exception as e:
+                logger.warning("Failed to cache messages: %s", e)
+            return
+
+        cached_count = 0
+        for message in messages:
+            try:
+                self.db_cache_message(**message)
+                cached_count += 1
+            except Exception as e:
+                logger.warning("Failed to cache message: %s", e)
+        logger.debug("Cached %d messages to database", cached_count)
 
     def format_for_notification(self, include_details: bool = True) -> tuple[str, str]:
         """Generate digest formatted for notification delivery.
@@ -109,43 +153,45 @@ class InboxDigest:
         Returns:
             Tuple of (title, body) for notification
         """
-        data = self.generate()
-        summary = data["summary"]
+        result = self.generate_raw()
+        total_unread = result.total_unread
+        total_urgent = result.total_urgent
 
-        title = f"Inbox: {summary['total_unread']} unread"
-        if summary["total_urgent"] > 0:
-            title += f" ({summary['total_urgent']} urgent)"
+        title = f"Inbox: {total_unread} unread"
+        if total_urgent > 0:
+            title += f" ({total_urgent} urgent)"
 
         lines = []
 
         if include_details:
-            for account in data["accounts"]:
-                if account["status"] != "ok":
-                    lines.append(f"*{account['name']}*: {account['error']}")
+            for account in result.accounts:
+                if account.status != "ok":
+                    lines.append(f"*{account.name}*: {account.error}")
                     continue
 
-                line = f"*{account['name']}*: {account['total_unread']} unread"
-                if account["urgent"]:
-                    line += f" ({len(account['urgent'])} urgent)"
+                urgent = account.urgent
+                from_people = account.from_people
+
+                line = f"*{account.name}*: {account.total_unread} unread"
+                if urgent:
+                    line += f" ({len(urgent)} urgent)"
                 lines.append(line)
 
                 # List urgent items
-                for msg in account["urgent"][:3]:
-                    lines.append(f"  - {msg['subject'][:40]}")
+                lines.extend(f"  - {msg.subject[:40]}" for msg in urgent[:3])
 
                 # List messages from people
-                if account["from_people"]:
-                    people_line = f"  From people: {len(account['from_people'])} messages"
-                    lines.append(people_line)
+                if from_people:
+                    lines.append(f"  From people: {len(from_people)} messages")
 
         else:
             # Compact format
-            lines.append(f"Total: {summary['total_unread']} unread across {summary['accounts_checked']} accounts")
-            if summary["total_urgent"] > 0:
-                lines.append(f"Urgent: {summary['total_urgent']} messages need attention")
+            lines.append(f"Total: {total_unread} unread across {len(result.accounts)} accounts")
+            if total_urgent > 0:
+                lines.append(f"Urgent: {total_urgent} messages need attention")
 
-        if summary["errors"] > 0:
-            lines.append(f"\n_{summary['errors']} account(s) had errors_")
+        if result.errors:
+            lines.append(f"\n_{len(result.errors)} account(s) had errors_")
 
         body = "\n".join(lines)
         return title, body
@@ -156,29 +202,29 @@ class InboxDigest:
         Returns:
             Tuple of (title, body) or None if no urgent items
         """
-        data = self.generate()
+        result = self.generate_raw()
 
+        # Most runs have nothing urgent; skip walking the accounts
         urgent_items = []
-        for account in data["accounts"]:
-            if account["status"] == "ok":
-                for msg in account["urgent"]:
-                    urgent_items.append({
-                        "account": account["name"],
-                        "subject": msg["subject"],
-                        "from": msg["from"],
-                    })
+        if result.total_urgent:
+            urgent_items = [
+                (account.name, msg)
+                for account in result.accounts
+                if account.status == "ok"
+                for msg in account.urgent
+            ]
 
         if not urgent_items:
             logger.debug("No urgent items found")
             return None
 
-        logger.info(f"Found {len(urgent_items)} urgent items")
+        logger.info("Found %d urgent items", len(urgent_items))
         title = f"{len(urgent_items)} Urgent Email(s)"
 
         lines = []
-        for item in urgent_items[:5]:
-            lines.append(f"*{item['account']}*: {item['subject']}")
-            lines.append(f"  From: {item['from']}")
+        for name, msg in urgent_items[:5]:
+            lines.append(f"*{name}*: {msg.subject}")
+            lines.append(f"  From: {msg.from_name}")
 
         if len(urgent_items) > 5:
             lines.append(f"... and {len(urgent_items) - 5} more")
@@ -192,31 +238,34 @@ class InboxDigest:
         Returns:
             Dict with account-level stats only
         """
-        result = self.fetcher.fetch_all_accounts(store_to_db=False)
-
-        stats = {
-            "total_unread": result.total_unread,
-            "total_urgent": result.total_urgent,
-            "total_newsletters": 0,
-            "fetch_duration_ms": result.total_duration_ms,
-            "accounts": {},
-            "errors": result.errors,
-        }
+        result = self.generate_raw(store_to_db=False)
 
+        accounts = {}
+        total_newsletters = 0
         for account in result.accounts:
             if account.status == "ok":
-                stats["total_newsletters"] += account.newsletters
-                stats["accounts"][account.name] = {
+                newsletters = account.newsletters
+                total_newsletters += newsletters
+                accounts[account.name] = {
                     "unread": account.total_unread,
                     "urgent": len(account.urgent),
                     "from_people": len(account.from_people),
-                    "newsletters": account.newsletters,
+                    "newsletters": newsletters,
                     "fetch_duration_ms": account.fetch_duration_ms,
                 }
             else:
-                stats["accounts"][account.name] = {
+                accounts[account.name] = {
                     "error": account.error,
                     "status": account.status,
                 }
 
+        stats = {
+            "total_unread": result.total_unread,
+            "total_urgent": result.total_urgent,
+            "total_newsletters": total_newsletters,
+            "fetch_duration_ms": result.total_duration_ms,
+            "accounts": accounts,
+            "errors": result.errors,
+        }
+
         return stats
@@ -4,6 +4,7 @@ import email
 import imaplib
 import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from email.header import decode_header
@@ -15,6 +16,7 @@ logger = logging.getLogger(__name__)
 GMAIL_IMAP_HOST = "imap.gmail.com"
 GMAIL_IMAP_PORT = 993
 IMAP_TIMEOUT = 30  # seconds
+MAX_FETCH_WORKERS = 8  # accounts fetched concurrently
 
 # Attachment settings
 MAX_ATTACHMENT_SIZE = 10 * 1024 * 1024  # 10MB max for PDF extraction
@@ -48,7 +50,7 @@ def extract_pdf_text(pdf_bytes: bytes) -> tuple[str, Optional[str]]:
         return "", str(e)
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailAttachment:
     """An email attachment with optional extracted content."""
     filename: str
@@ -70,7 +72,7 @@ class EmailAttachment:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EmailMessage:
     """A single email message summary with attachments."""
     id: str
@@ -100,7 +102,7 @@ class EmailMessage:
         return ", ".join(names)
 
 
-@dataclass
+@dataclass(slots=True)
 class AccountInbox:
     """Inbox data for a single email account."""
     account: str
@@ -156,7 +158,7 @@ class AccountInbox:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FetchResult:
     """Result of a complete inbox fetch operation."""
     accounts: list[AccountInbox]
@@ -221,28 +223,29 @@ class InboxFetcher:
         start_time = datetime.now()
         logger.info(f"Starting inbox fetch for {len(self.accounts)} accounts")
 
-        results = []
-        errors = []
-        total_attachments = 0
-        total_pdfs = 0
-
-        for account_info in self.accounts:
+        def fetch_one(account_info: dict) -> AccountInbox:
             account_email = account_info["email"]
             logger.debug(f"Fetching inbox for {account_email}")
-
-            inbox = self.fetch_account(
+            return self.fetch_account(
                 account=account_email,
                 app_password=account_info.get("app_password", ""),
                 name=account_info.get("name", account_email),
                 priority=account_info.get("priority", "medium"),
                 max_results=max_results
             )
-            results.append(inbox)
-            total_attachments += inbox.attachments_processed
-            total_pdfs += inbox.pdfs_extracted
 
-            if inbox.status != "ok":
-                errors.append(f"{account_email}: {inbox.error}")
+        # Each account is its own IMAP session, so fetch them concurrently;
+        # map() keeps results in configured account order.
+        if len(self.accounts) > 1:
+            workers = min(len(self.accounts), MAX_FETCH_WORKERS)
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(fetch_one, self.accounts))
+        else:
+            results = [fetch_one(a) for a in self.accounts]
+
+        errors = [f"{a.account}: {a.error}" for a in results if a.status != "ok"]
+        total_attachments = sum(a.attachments_processed for a in results)
+        total_pdfs = sum(a.pdfs_extracted for a in results)
 
         total_duration = int((datetime.now() - start_time).total_seconds() * 1000)
         total_unread = sum(a.total_unread for a in results if a.status == "ok")
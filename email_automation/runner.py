@@ -46,8 +46,8 @@ def setup_notifications(config: dict):
     # Optional: setup database logging callback
     db_callback = None
     try:
-        from database import log_notification
-        db_callback = log_notification
+        from database import queue_notification_log
+        db_callback = queue_notification_log
     except ImportError:
         logger.warning("Database module not available, notifications won't be logged")
 
@@ -109,8 +109,8 @@ def cmd_inbox(args, config: dict) -> int:
     try:
         import database as db
         db_store = db.store_inbox_snapshot
-        db_log = db.log_email_fetch
-        db_cache = db.cache_inbox_message
+        db_log = db.queue_email_fetch_log
+        db_cache = db.cache_inbox_messages
         db_attachment = db.store_attachment
         logger.info("Database callbacks configured")
     except ImportError:
@@ -125,7 +125,7 @@ def cmd_inbox(args, config: dict) -> int:
         db_log_callback=db_log,
         db_attachment_callback=db_attachment
     )
-    digest = InboxDigest(fetcher, db_cache_message=db_cache)
+    digest = InboxDigest(fetcher, db_cache_messages=db_cache)
 
     if args.json:
         data = digest.generate()
@@ -159,7 +159,7 @@ def cmd_daily(args, config: dict) -> int:
     try:
         import database as db
         db_store = db.store_inbox_snapshot
-        db_log = db.log_email_fetch
+        db_log = db.queue_email_fetch_log
     except ImportError:
         logger.warning("Database module not available")
 
@@ -120,52 +120,45 @@ def save_sprint_to_db(sprint: dict) -> int | None:
     try:
         qg = sprint.get('quality_gates', {})
 
-        # Upsert the main sprint record
-        sprint_id = db.upsert_sprint(sprint, qg)
+        activities = [
+            {
+                'activity_at': item.get('started_at') or datetime.now(),
+                'activity_type': item.get('activity_type', 'progress'),
+                'what': item.get('title', ''),
+                'why': item.get('why'),
+                'outcome': item.get('result')
+            }
+            for item in sprint.get('items', [])
+        ]
+        decisions = [
+            {
+                'decided_at': d.get('timestamp') or datetime.now(),
+                'question': d.get('question', ''),
+                'context': d.get('context'),
+                'decision': d.get('decision', ''),
+                'rationale': d.get('rationale'),
+                'confidence': d.get('confidence'),
+                'pal_responses': d.get('pal_responses', {}),
+                'consensus': d.get('consensus')
+            }
+            for d in sprint.get('decisions', []) if isinstance(d, dict)
+        ]
+        deviations = [
+            {
+                'deviated_at': d.get('timestamp') or datetime.now(),
+                'original_scope': d.get('original_scope'),
+                'deviation': d.get('deviation', ''),
+                'reason': d.get('reason'),
+                'flagged': d.get('flagged', False)
+            }
+            for d in sprint.get('deviations', []) if isinstance(d, dict)
+        ]
+
+        # Upsert the sprint and replace its related data in one transaction
+        sprint_id = db.save_sprint_with_related(sprint, qg, activities, decisions, deviations)
         if not sprint_id:
             return None
 
-        # Clear existing related data for re-sync
-        db.clear_sprint_related_data(sprint_id)
-
-        # Insert activity items
-        for item in sprint.get('items', []):
-            db.insert_sprint_activity(
-                sprint_id=sprint_id,
-                activity_at=item.get('started_at') or datetime.now(),
-                activity_type=item.get('activity_type', 'progress'),
-                what=item.get('title', ''),
-                why=item.get('why'),
-                outcome=item.get('result')
-            )
-
-        # Insert decisions
-        for d in sprint.get('decisions', []):
-            if isinstance(d, dict):
-                db.insert_sprint_decision(
-                    sprint_id=sprint_id,
-                    decided_at=d.get('timestamp') or datetime.now(),
-                    question=d.get('question', ''),
-                    context=d.get('context'),
-                    decision=d.get('decision', ''),
-                    rationale=d.get('rationale'),
-                    confidence=d.get('confidence'),
-                    pal_responses=d.get('pal_responses', {}),
-                    consensus=d.get('consensus')
-                )
-
-        # Insert deviations
-        for d in sprint.get('deviations', []):
-            if isinstance(d, dict):
-                db.insert_sprint_deviation(
-                    sprint_id=sprint_id,
-                    deviated_at=d.get('timestamp') or datetime.now(),
-                    original_scope=d.get('original_scope'),
-                    deviation=d.get('deviation', ''),
-                    reason=d.get('reason'),
-                    flagged=d.get('flagged', False)
-                )
-
         logger.info(f"Saved sprint {sprint['date']} to database (id={sprint_id})")
         return sprint_id
 
@@ -174,15 +167,9 @@ def save_sprint_to_db(sprint: dict) -> int | None:
         return None
 
 
-def _build_sprint_response(row: dict) -> dict:
-    """Build a sprint response dict from a database row with related data."""
-    sprint_id = row['id']
-
-    # Get related data
-    activities = db.get_sprint_activities(sprint_id)
-    decisions = db.get_sprint_decisions(sprint_id)
-    deviations = db.get_sprint_deviations(sprint_id)
-
+def _build_sprint_response(row: dict, activities: list[dict], decisions: list[dict],
+                           deviations: list[dict]) -> dict:
+    """Build a sprint response dict from a database row and its related data."""
     # Build items from activities
     items = []
     for idx, a in enumerate(activities):
@@ -239,7 +226,22 @@ def get_sprints_from_db(limit: int = 20) -> list[dict]:
     """
     try:
         rows = db.get_sprints(limit=limit)
-        return [_build_sprint_response(row) for row in rows]
+
+        # Related data for every sprint in three queries rather than three per sprint
+        sprint_ids = [row['id'] for row in rows]
+        activities = db.get_sprint_activities_bulk(sprint_ids)
+        decisions = db.get_sprint_decisions_bulk(sprint_ids)
+        deviations = db.get_sprint_deviations_bulk(sprint_ids)
+
+        return [
+            _build_sprint_response(
+                row,
+                activities.get(row['id'], []),
+                decisions.get(row['id'], []),
+                deviations.get(row['id'], []),
+            )
+            for row in rows
+        ]
     except Exception as e:
         logger.error(f"Failed to get sprints from DB: {e}")
         return []
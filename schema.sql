@@ -13,7 +13,10 @@ CREATE TABLE IF NOT EXISTS dashboard_git_snapshots (
     snapshot_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_git_snapshots_repo ON dashboard_git_snapshots(repo_name);
+-- Covers get_repo_history (repo filter + time range) as an index-only scan
+DROP INDEX IF EXISTS idx_git_snapshots_repo;
+CREATE INDEX IF NOT EXISTS idx_git_snapshots_repo_time ON dashboard_git_snapshots(repo_name, snapshot_at)
+    INCLUDE (commit_count, is_dirty);
 CREATE INDEX IF NOT EXISTS idx_git_snapshots_time ON dashboard_git_snapshots(snapshot_at);
 
 -- Todoist task snapshots
@@ -68,7 +71,10 @@ CREATE TABLE IF NOT EXISTS dashboard_inbox_snapshots (
     snapshot_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_inbox_snapshots_time ON dashboard_inbox_snapshots(snapshot_at);
+-- Covers get_inbox_trends as an index-only scan
+DROP INDEX IF EXISTS idx_inbox_snapshots_time;
+CREATE INDEX IF NOT EXISTS idx_inbox_snapshots_time_cover ON dashboard_inbox_snapshots(snapshot_at)
+    INCLUDE (account, total_unread, urgent_count);
 CREATE INDEX IF NOT EXISTS idx_inbox_snapshots_account ON dashboard_inbox_snapshots(account);
 
 -- School email snapshots
@@ -84,7 +90,10 @@ CREATE TABLE IF NOT EXISTS dashboard_school_snapshots (
     snapshot_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_school_snapshots_time ON dashboard_school_snapshots(snapshot_at);
+-- Covers get_school_trends as an index-only scan
+DROP INDEX IF EXISTS idx_school_snapshots_time;
+CREATE INDEX IF NOT EXISTS idx_school_snapshots_time_cover ON dashboard_school_snapshots(snapshot_at)
+    INCLUDE (child, email_count, action_count, high_urgency);
 CREATE INDEX IF NOT EXISTS idx_school_snapshots_child ON dashboard_school_snapshots(child);
 
 -- School email actions log (individual actions for analytics)
@@ -128,6 +137,45 @@ CREATE TABLE IF NOT EXISTS dashboard_daily_stats (
 
 CREATE INDEX IF NOT EXISTS idx_daily_stats_date ON dashboard_daily_stats(stat_date);
 
+-- Per-day git rollup backing get_git_trends (refreshed by update_daily_stats)
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_git_daily AS
+SELECT
+    DATE(snapshot_at) AS stat_date,
+    SUM(commit_count) AS total_commits,
+    COUNT(DISTINCT repo_name) AS repos_with_activity,
+    SUM(CASE WHEN is_dirty THEN 1 ELSE 0 END) AS dirty_repos
+FROM dashboard_git_snapshots
+GROUP BY DATE(snapshot_at);
+
+-- Unique index required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_git_daily_date ON dashboard_git_daily(stat_date);
+
+-- Per-day todoist rollup backing get_todoist_trends (refreshed by update_daily_stats)
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_todoist_daily AS
+SELECT
+    DATE(snapshot_at) AS stat_date,
+    AVG(total_tasks) AS avg_tasks,
+    AVG(overdue_tasks) AS avg_overdue,
+    AVG(today_tasks) AS avg_today
+FROM dashboard_todoist_snapshots
+GROUP BY DATE(snapshot_at);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_todoist_daily_date ON dashboard_todoist_daily(stat_date);
+
+-- Per-day kanban rollup backing get_kanban_trends (refreshed by update_daily_stats)
+CREATE MATERIALIZED VIEW IF NOT EXISTS dashboard_kanban_daily AS
+SELECT
+    DATE(snapshot_at) AS stat_date,
+    AVG(backlog_count) AS avg_backlog,
+    AVG(ready_count) AS avg_ready,
+    AVG(in_progress_count) AS avg_in_progress,
+    AVG(done_count) AS avg_done,
+    AVG(total_tasks) AS avg_total
+FROM dashboard_kanban_snapshots
+GROUP BY DATE(snapshot_at);
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_kanban_daily_date ON dashboard_kanban_daily(stat_date);
+
 -- Planning sessions (chat-based planning with Jeeves)
 CREATE TABLE IF NOT EXISTS planning_sessions (
     id SERIAL PRIMARY KEY,
@@ -156,7 +204,9 @@ CREATE TABLE IF NOT EXISTS planning_actions (
 
 CREATE INDEX IF NOT EXISTS idx_planning_actions_session ON planning_actions(session_id);
 CREATE INDEX IF NOT EXISTS idx_planning_actions_type ON planning_actions(action_type);
-CREATE INDEX IF NOT EXISTS idx_planning_actions_time ON planning_actions(action_at);
+-- action_type is included so get_planning_action_breakdown is an index-only scan
+DROP INDEX IF EXISTS idx_planning_actions_time;
+CREATE INDEX IF NOT EXISTS idx_planning_actions_time_type ON planning_actions(action_at, action_type);
 
 -- Chat messages in planning sessions
 CREATE TABLE IF NOT EXISTS planning_messages (
@@ -242,7 +292,9 @@ CREATE TABLE IF NOT EXISTS overnight_activity (
     created_at TIMESTAMP DEFAULT NOW()
 );
 
-CREATE INDEX IF NOT EXISTS idx_overnight_activity_sprint ON overnight_activity(sprint_id);
+-- Serves get_sprint_activities' filter and ORDER BY activity_at from one index
+DROP INDEX IF EXISTS idx_overnight_activity_sprint;
+CREATE INDEX IF NOT EXISTS idx_overnight_activity_sprint_time ON overnight_activity(sprint_id, activity_at);
 CREATE INDEX IF NOT EXISTS idx_overnight_activity_time ON overnight_activity(activity_at);
 
 -- Overnight sprint decisions
@@ -755,7 +807,20 @@ CREATE TABLE IF NOT EXISTS email_attachments (
     UNIQUE(account, message_id, filename)
 );
 
+-- Search vector tokenized once on write instead of per row at query time
+ALTER TABLE email_attachments ADD COLUMN IF NOT EXISTS content_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(extracted_text, ''))) STORED;
+
 CREATE INDEX IF NOT EXISTS idx_attachments_account ON email_attachments(account);
 CREATE INDEX IF NOT EXISTS idx_attachments_message ON email_attachments(message_id);
 CREATE INDEX IF NOT EXISTS idx_attachments_type ON email_attachments(content_type);
-CREATE INDEX IF NOT EXISTS idx_attachments_text ON email_attachments USING gin(to_tsvector('english', extracted_text));
+-- Append-only and only ever range-filtered, so a BRIN summary is enough
+CREATE INDEX IF NOT EXISTS idx_attachments_first_seen_brin
+    ON email_attachments USING brin(first_seen_at) WITH (pages_per_range = 32);
+DROP INDEX IF EXISTS idx_attachments_text;
+CREATE INDEX IF NOT EXISTS idx_attachments_tsv ON email_attachments USING gin(content_tsv);
+-- Attachments get_email_content_for_processing reads, already in filename order.
+-- extracted_text is not INCLUDEd: PDF text would overflow the btree tuple limit.
+CREATE INDEX IF NOT EXISTS idx_attachments_extracted
+    ON email_attachments(account, message_id, filename)
+    WHERE extraction_status = 'success' AND extracted_text IS NOT NULL;
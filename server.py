@@ -80,6 +80,7 @@ class Defaults:
     MAX_READY_TASKS = 5
     MAX_URGENT_EMAILS = 5
     MAX_PEOPLE_EMAILS = 7
+    MAX_SPRINTS = 100
 
     # Sprint quality gates
     QUALITY_GATES_TOTAL = 8
@@ -370,7 +371,7 @@ def fetch_kanban() -> dict[str, Any]:
         return result
 
     try:
-        with db.get_connection() as conn:
+        with db.get_connection(autocommit=True) as conn:
             cur = conn.cursor()
             cur.execute("""
                 SELECT id, title, description, column_name as column, tags,
@@ -696,19 +697,17 @@ def get_dashboard():
 
     if DB_AVAILABLE and store_snapshot:
         try:
-            if results['git'].get('status') == Status.OK:
-                db.store_git_snapshot(results['git'].get('repos', []))
-            if results['todoist'].get('status') == Status.OK:
-                db.store_todoist_snapshot(results['todoist'].get('tasks', []))
-            if results['kanban'].get('status') == Status.OK:
-                db.store_kanban_snapshot(results['kanban'].get('by_column', {}))
-            if results['linear'].get('status') == Status.OK:
-                db.store_linear_snapshot(
-                    results['linear'].get('issues', []),
-                    results['linear'].get('by_status', {})
-                )
-            # Update daily aggregates
-            db.update_daily_stats(results['git'], results['todoist'], results['kanban'])
+            def ok(source: str) -> bool:
+                return results[source].get('status') == Status.OK
+
+            # One pooled connection for every snapshot plus the daily aggregates
+            db.store_refresh_snapshots(
+                git_repos=results['git'].get('repos', []) if ok('git') else None,
+                todoist_tasks=results['todoist'].get('tasks', []) if ok('todoist') else None,
+                kanban_by_column=results['kanban'].get('by_column', {}) if ok('kanban') else None,
+                linear_issues=results['linear'].get('issues', []) if ok('linear') else None,
+                linear_by_status=results['linear'].get('by_status', {}) if ok('linear') else None,
+            )
         except Exception as e:
             storage_status = Status.ERROR
             storage_error = str(e)
@@ -1887,6 +1886,7 @@ def get_overnight_current():
 def get_overnight_sprints():
     """Get list of recent sprints. Prefers database, falls back to Obsidian."""
     limit = request.args.get('limit', 20, type=int)
+    limit = min(max(limit, 1), Defaults.MAX_SPRINTS)
     result = overnight_sprint.get_recent_sprints(limit=limit)
     if 'error' in result:
         return jsonify(result), 500
@@ -3079,6 +3079,18 @@ def get_priority_levels():
     })
 
 
+@app.route('/api/config/reference')
+def get_reference_bundle():
+    """Get all active reference tables in one response."""
+    if not DB_AVAILABLE:
+        return jsonify({'error': 'Database not available'}), 503
+
+    bundle = db.get_reference_bundle()
+    if not bundle:
+        return jsonify({'error': 'Failed to load reference data'}), 500
+    return jsonify(bundle)
+
+
 @app.route('/api/life/calculate-dashboard-xp', methods=['POST'])
 def calculate_dashboard_xp():
     """Calculate XP from dashboard activity using database rules."""
@@ -3161,7 +3173,7 @@ def get_notification_router():
             notifications_config = config.get('notifications', {})
             _notification_router = NotificationRouter(
                 notifications_config,
-                db_callback=db.log_notification if DB_AVAILABLE else None
+                db_callback=db.queue_notification_log if DB_AVAILABLE else None
             )
         except ImportError as e:
             logger.warning(f"Email automation not available: {e}")
@@ -3324,15 +3336,15 @@ def trigger_inbox_digest():
 
         # Setup database callbacks for detailed logging
         db_store = db.store_inbox_snapshot if DB_AVAILABLE else None
-        db_log = db.log_email_fetch if DB_AVAILABLE else None
-        db_cache = db.cache_inbox_message if DB_AVAILABLE else None
+        db_log = db.queue_email_fetch_log if DB_AVAILABLE else None
+        db_cache = db.cache_inbox_messages if DB_AVAILABLE else None
 
         fetcher = InboxFetcher(
             email_config,
             db_store_callback=db_store,
             db_log_callback=db_log
         )
-        digest = InboxDigest(fetcher, db_cache_message=db_cache)
+        digest = InboxDigest(fetcher, db_cache_messages=db_cache)
 
         # Track job run
         run_id = None
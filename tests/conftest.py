@@ -12,6 +12,19 @@ from datetime import datetime
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from server import app
+import database
+
+
+@pytest.fixture(autouse=True)
+def reset_db_state():
+    """Reset module-level database state so pooled connections and cached results don't leak between tests."""
+    yield
+    database.flush_history_writes()
+    database.close_pool()
+    database.invalidate_query_cache()
+    database._last_ok_at = 0.0
+    database._last_probe_latency_ms = None
+    database._rollups_refreshed_at.clear()
 
 
 @pytest.fixture
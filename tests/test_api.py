@@ -274,5 +274,20 @@ class TestSchoolTabEndpoint:
                 assert child['name'] in ['Elodie', 'Nathaniel', 'Florence']
 
 
+
+class TestOvernightSprintsEndpoint:
+    """Tests for /api/overnight/sprints endpoint."""
+
+    @pytest.mark.parametrize("requested,expected", [("0", 1), ("5", 5), ("100000", 100)])
+    def test_limit_clamped(self, client, requested, expected):
+        """Should clamp the sprint limit to a sane range."""
+        with patch('server.overnight_sprint.get_recent_sprints',
+                   return_value={'sprints': []}) as mock_recent:
+            response = client.get(f'/api/overnight/sprints?limit={requested}')
+
+        assert response.status_code == 200
+        mock_recent.assert_called_once_with(limit=expected)
+
+
 if __name__ == '__main__':
     pytest.main([__file__, '-v'])
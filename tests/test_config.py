@@ -262,6 +262,38 @@ class TestPriorityLevelsEndpoint:
         assert data['levels'][0]['name'] == 'Urgent'
 
 
+class TestReferenceBundleEndpoint:
+    """Tests for /api/config/reference endpoint."""
+
+    @patch('server.DB_AVAILABLE', True)
+    @patch('server.db.get_reference_bundle')
+    def test_get_reference_bundle(self, mock_get, client):
+        """Should return all reference tables in one response."""
+        mock_get.return_value = {
+            'activity_types': [{'code': 'run'}],
+            'kanban_columns': [{'code': 'backlog'}],
+            'priority_levels': [],
+            'xp_rules': [],
+            'game_config': {'DURATION_BONUS_MAX': 25}
+        }
+
+        response = client.get('/api/config/reference')
+        assert response.status_code == 200
+        data = json.loads(response.data)
+
+        assert data['activity_types'][0]['code'] == 'run'
+        assert data['game_config']['DURATION_BONUS_MAX'] == 25
+
+    @patch('server.DB_AVAILABLE', True)
+    @patch('server.db.get_reference_bundle')
+    def test_reference_bundle_failure(self, mock_get, client):
+        """Should return 500 when the bundle cannot be loaded."""
+        mock_get.return_value = {}
+
+        response = client.get('/api/config/reference')
+        assert response.status_code == 500
+
+
 class TestCalculateDashboardXp:
     """Tests for /api/life/calculate-dashboard-xp endpoint."""
 
@@ -5,6 +5,7 @@ Tests for centralized config loader module.
 import os
 import pytest
 import tempfile
+import yaml
 from pathlib import Path
 from unittest.mock import patch
 
@@ -32,6 +33,18 @@ class TestDatabaseConfig:
         assert params == {"dbname": "testdb", "host": "dbserver"}
 
 
+class TestConfigSlots:
+    """Tests for slotted config dataclasses."""
+
+    def test_configs_have_no_instance_dict(self):
+        """Should use __slots__ instead of a per-instance __dict__."""
+        config = AppConfig(email=EmailConfig(accounts=[EmailAccount(email="a@b.c", name="A")]))
+
+        for obj in (config, config.database, config.email, config.email.accounts[0],
+                    config.notifications.telegram, ConfigProxy(config)):
+            assert not hasattr(obj, "__dict__")
+
+
 class TestTodoistConfig:
     """Tests for TodoistConfig dataclass."""
 
@@ -61,6 +74,16 @@ class TestEmailConfig:
         assert len(configured) == 1
         assert configured[0].email == "test@example.com"
 
+    def test_configured_accounts_tracks_changes(self):
+        """Should reflect accounts added after construction."""
+        config = EmailConfig()
+        config.accounts.append(
+            EmailAccount(email="test@example.com", name="Test", app_password="secret")
+        )
+
+        assert [a.email for a in config.configured_accounts] == ["test@example.com"]
+        assert isinstance(config.configured_accounts, list)
+
 
 class TestLoadConfig:
     """Tests for load_config function."""
@@ -112,6 +135,61 @@ invalid: yaml: content:
             finally:
                 os.unlink(f.name)
 
+    def test_schema_rejects_invalid_types(self):
+        """Should report the offending path when YAML fails the schema."""
+        pytest.importorskip("fastjsonschema")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("server:\n  port: not-a-number\n")
+
+            with pytest.raises(ConfigurationError, match="server/port"):
+                load_config(config_path)
+
+    def test_schema_accepts_example_config(self):
+        """Should accept the shipped example config."""
+        example = Path(__file__).parent.parent / "config.example.yaml"
+        config = load_config(example)
+        assert config.server.port == 8889
+
+    def test_yaml_cached_until_file_changes(self):
+        """Should reuse parsed YAML until the file's mtime/size changes."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("server:\n  port: 9001\n")
+
+            with patch("config_loader.yaml.load", wraps=yaml.load) as mock_load:
+                assert load_config(config_path).server.port == 9001
+                assert load_config(config_path).server.port == 9001
+                assert mock_load.call_count == 1
+
+                config_path.write_text("server:\n  port: 19002\n")
+                os.utime(config_path, ns=(0, 10**9))
+                assert load_config(config_path).server.port == 19002
+                assert mock_load.call_count == 2
+
+    def test_env_resolution_skipped_without_references(self):
+        """Should skip ${VAR} resolution when the file has no references."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("todoist:\n  token: plain-token\n")
+
+            with patch("config_loader._resolve_env_value") as mock_resolve:
+                config = load_config(config_path)
+
+            mock_resolve.assert_not_called()
+            assert config.todoist.token == "plain-token"
+
+    def test_partial_env_reference_left_literal(self):
+        """Should only resolve values that are entirely a ${VAR} reference."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text('linear:\n  api_key: "key-${TEST_LINEAR_KEY}"\n')
+
+            with patch.dict(os.environ, {"TEST_LINEAR_KEY": "secret"}):
+                config = load_config(config_path)
+
+            assert config.linear.api_key == "key-${TEST_LINEAR_KEY}"
+
     def test_environment_variable_override(self):
         """Should override config with environment variables."""
         yaml_content = """
@@ -129,6 +207,19 @@ database:
             finally:
                 os.unlink(f.name)
 
+    def test_database_pool_settings(self):
+        """Should load pool sizes from YAML and the PgBouncer URL from environment."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("database:\n  pool_min: 2\n  pool_max: 8\n")
+
+            with patch.dict(os.environ, {"DASHBOARD_PGBOUNCER_URL": "postgresql://bouncer/nick"}):
+                config = load_config(config_path)
+
+            assert config.database.pool_min == 2
+            assert config.database.pool_max == 8
+            assert config.database.pgbouncer_url == "postgresql://bouncer/nick"
+
     def test_todoist_token_from_env(self):
         """Should load Todoist token from environment."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -140,6 +231,26 @@ database:
                 assert config.todoist.token == "env-token"
                 assert config.todoist.is_configured
 
+    def test_email_accounts_from_env(self):
+        """Should add indexed email accounts from environment variables."""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            env = {
+                "DASHBOARD_EMAIL_0_ADDRESS": "first@example.com",
+                "DASHBOARD_EMAIL_0_APP_PASSWORD": "pw0",
+                "DASHBOARD_EMAIL_1_ADDRESS": "second@example.com",
+                "DASHBOARD_EMAIL_1_NAME": "Second",
+            }
+
+            with patch.dict(os.environ, env):
+                config = load_config(config_path)
+
+            emails = [a.email for a in config.email.accounts]
+            assert emails == ["first@example.com", "second@example.com"]
+            assert config.email.accounts[0].name == "first"
+            assert config.email.accounts[1].name == "Second"
+            assert len(config.email.configured_accounts) == 1
+
     def test_env_variable_syntax_in_yaml(self):
         """Should resolve ${VAR} syntax in YAML values."""
         yaml_content = """
@@ -186,6 +297,18 @@ class TestValidateConfig:
         assert len(errors) == 1
         assert "email" in errors[0].lower()
 
+    def test_validate_missing_scan_path_warns_once(self, caplog):
+        """Should warn once per distinct missing git scan path without erroring."""
+        config = AppConfig()
+        config.git.scan_paths = ["/nonexistent/dashboard-path", "/nonexistent/dashboard-path"]
+
+        with caplog.at_level("WARNING", logger="config_loader"):
+            errors = validate_config(config)
+
+        assert errors == []
+        warnings = [r for r in caplog.records if "Git scan path does not exist" in r.getMessage()]
+        assert len(warnings) == 1
+
     def test_validate_invalid_port(self):
         """Should error on invalid port."""
         config = AppConfig()
@@ -223,6 +346,18 @@ class TestConfigProxy:
         assert "database" in proxy
         assert "nonexistent" not in proxy
 
+    def test_sections_built_lazily(self):
+        """Should only convert sections that are accessed."""
+        config = AppConfig()
+        proxy = ConfigProxy(config)
+
+        with patch.object(AppConfig, "to_section", wraps=config.to_section) as mock_section:
+            proxy["server"]
+            proxy["server"]
+
+        mock_section.assert_called_once_with("server")
+        assert list(proxy) == list(config.to_dict().keys())
+
 
 class TestAppConfigToDict:
     """Tests for AppConfig.to_dict method."""
@@ -239,3 +374,41 @@ class TestAppConfigToDict:
         assert d["todoist"]["token"] == "test-token"
         assert "server" in d
         assert "integrations" in d
+
+    def test_to_dict_reflects_changes(self):
+        """Should build fresh sections that track field changes."""
+        config = AppConfig()
+
+        first = config.to_dict()
+        first["server"]["port"] = 99
+        config.server.port = 1
+
+        assert config.to_dict()["server"]["port"] == 1
+        assert config.to_dict()["server"] is not config.to_dict()["server"]
+
+
+class TestLazyModuleConfig:
+    """Tests for lazy module-level config attribute."""
+
+    def test_module_config_matches_singleton(self):
+        """Should load config on first attribute access and track reloads."""
+        import config_loader
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            config_path = Path(tmpdir) / "config.yaml"
+            config_path.write_text("server:\n  port: 9123\n")
+
+            with patch.object(config_loader, "_config", None):
+                assert config_loader.config is config_loader.get_config()
+                reloaded = config_loader.reload_config(config_path)
+                assert config_loader.config is reloaded
+                assert config_loader.config.server.port == 9123
+
+            vars(config_loader).pop("config", None)
+
+    def test_unknown_attribute_raises(self):
+        """Should raise AttributeError for unknown module attributes."""
+        import config_loader
+
+        with pytest.raises(AttributeError):
+            config_loader.not_a_setting
@@ -0,0 +1,1621 @@
+"""Tests for dashboard snapshot and analytics database functions."""
+
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock, call, patch, MagicMock
+
+
+@pytest.fixture(autouse=True)
+def load_psycopg2():
+    """Bind psycopg2 helpers that get_connection() normally loads on first use."""
+    import database
+    database._load_psycopg2()
+
+
+def _mock_connection(mock_get_conn):
+    """Wire a mocked connection/cursor pair into a patched get_connection."""
+    mock_cursor = MagicMock()
+    mock_conn = MagicMock()
+    mock_conn.cursor.return_value = mock_cursor
+    mock_conn.__enter__ = Mock(return_value=mock_conn)
+    mock_conn.__exit__ = Mock(return_value=False)
+    mock_get_conn.return_value = mock_conn
+    return mock_conn, mock_cursor
+
+
+class TestStoreGitSnapshot:
+    """Test store_git_snapshot batching."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_inserts_all_repos_in_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should send every repo row through a single execute_values call."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_git_snapshot([
+            {"name": "alpha", "branch": "main", "commit_count": 3, "is_dirty": True},
+            {"name": "beta", "branch": "dev"},
+        ])
+
+        mock_execute_values.assert_called_once()
+        rows = mock_execute_values.call_args[0][2]
+        assert rows == [
+            ("alpha", "main", 3, True, 0, 0),
+            ("beta", "dev", 0, False, 0, 0),
+        ]
+        mock_cursor.execute.assert_called_once_with(database._ASYNC_COMMIT_SQL)
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_large_snapshot_uses_copy(self, mock_get_conn, mock_execute_values):
+        """Should stream large snapshots through COPY in text format."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        repos = [
+            {"name": f"repo-{i}", "branch": "main", "commit_count": i}
+            for i in range(database.SnapshotConfig.COPY_MIN_ROWS)
+        ]
+        repos[0]["branch"] = "feat/tab\there\\slash"
+        repos[1]["branch"] = None
+
+        database.store_git_snapshot(repos)
+
+        mock_execute_values.assert_not_called()
+        sql, buf = mock_cursor.copy_expert.call_args[0]
+        assert "COPY dashboard_git_snapshots" in sql
+        lines = buf.getvalue().splitlines()
+        assert len(lines) == len(repos)
+        assert lines[0] == "repo-0\tfeat/tab\\there\\\\slash\t0\tFalse\t0\t0"
+        assert lines[1] == "repo-1\t\\N\t1\tFalse\t0\t0"
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_empty_repos_skips_database(self, mock_get_conn):
+        """Should not touch the database when there are no repos."""
+        import database
+
+        database.store_git_snapshot([])
+
+        mock_get_conn.assert_not_called()
+
+
+class TestStoreTodoistSnapshot:
+    """Test store_todoist_snapshot aggregation."""
+
+    @patch("database.get_connection")
+    def test_aggregates_counts(self, mock_get_conn):
+        """Should count overdue/today tasks and group by project and priority."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_todoist_snapshot([
+            {"project": "Home", "priority": 4, "is_overdue": True},
+            {"project": "Home", "priority": 1, "is_today": True},
+            {"priority": 2, "is_today": True},
+        ])
+
+        params = mock_cursor.execute.call_args[0][1]
+        total, overdue, today, by_project, by_priority = params
+        assert (total, overdue, today) == (3, 1, 2)
+        assert by_project.adapted == {"Home": 2, "Unknown": 1}
+        assert by_priority.adapted == {1: 1, 2: 1, 3: 0, 4: 1}
+        mock_conn.commit.assert_called_once()
+
+
+class TestTrendQueryParameters:
+    """Test trend and analytics queries bind days as a real parameter."""
+
+    @pytest.mark.parametrize("func_name,args", [
+        ("get_inbox_trends", (14,)),
+        ("get_school_trends", (14,)),
+        ("get_git_trends", (14,)),
+        ("get_todoist_trends", (14,)),
+        ("get_kanban_trends", (14,)),
+        ("get_linear_trends", (14,)),
+        ("get_daily_summary", (14,)),
+        ("get_repo_history", ("repo", 14)),
+        ("get_planning_sessions", (14,)),
+        ("get_planning_action_breakdown", (14,)),
+        ("get_planning_totals", (14,)),
+        ("get_notification_history", (14,)),
+        ("get_notification_stats", (14,)),
+        ("get_job_runs", (None, 14)),
+        ("get_inbox_message_stats", (14,)),
+        ("search_attachment_content", ("form", None, 14)),
+        ("get_attachment_stats", (14,)),
+    ])
+    @patch("database.get_connection")
+    def test_days_not_inlined_in_literal(self, mock_get_conn, func_name, args):
+        """Should not substitute days inside an INTERVAL string literal."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = {}
+
+        getattr(database, func_name)(*args)
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "'%s days'" not in sql
+        assert "INTERVAL '1 day' * %s::int" in sql
+        assert 14 in params
+
+    @pytest.mark.parametrize("func_name", ["get_email_fetch_logs", "get_email_fetch_stats"])
+    @patch("database.get_connection")
+    def test_hours_not_inlined_in_literal(self, mock_get_conn, func_name):
+        """Should bind the hours window as a parameter of a fixed interval."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = []
+        mock_cursor.fetchone.return_value = {}
+
+        getattr(database, func_name)(hours=6)
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "'%s hours'" not in sql
+        assert "INTERVAL '1 hour' * %s::int" in sql
+        assert 6 in params
+
+
+class TestQueryCache:
+    """Test TTL caching of analytics queries."""
+
+    @patch("database.get_connection")
+    def test_trends_cached_between_calls(self, mock_get_conn):
+        """Should serve repeated calls with the same args from cache."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"date": "2026-01-01", "total_commits": 5}]
+
+        first = database.get_git_trends(30)
+        second = database.get_git_trends(30)
+
+        assert first == second
+        assert mock_cursor.execute.call_count == 1
+
+        database.get_git_trends(7)
+        assert mock_cursor.execute.call_count == 2
+
+    @patch("database.get_connection")
+    def test_callers_get_independent_copies(self, mock_get_conn):
+        """Should not let a caller's changes leak into the cached result."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"date": "2026-01-01", "total_commits": 5}]
+
+        first = database.get_git_trends(30)
+        first[0]["total_commits"] = 99
+        first.append({"date": "extra"})
+        second = database.get_git_trends(30)
+        second[0]["date"] = "changed"
+
+        assert database.get_git_trends(30) == [{"date": "2026-01-01", "total_commits": 5}]
+        assert mock_cursor.execute.call_count == 1
+
+    @patch("database.get_connection")
+    def test_snapshot_store_invalidates_cache(self, mock_get_conn):
+        """Should re-query after a new snapshot is stored."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"date": "2026-01-01", "avg_tasks": 3}]
+
+        database.get_todoist_trends(30)
+        database.store_todoist_snapshot([{"project": "Home"}])
+        database.get_todoist_trends(30)
+
+        select_calls = [c for c in mock_cursor.execute.call_args_list if "SELECT" in c[0][0]]
+        assert len(select_calls) == 2
+
+    @patch("database.get_connection")
+    def test_empty_results_not_cached(self, mock_get_conn):
+        """Should not cache empty results, which may indicate an error."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = []
+
+        database.get_daily_summary(7)
+        database.get_daily_summary(7)
+
+        assert mock_cursor.execute.call_count == 2
+
+    @patch("database.get_connection")
+    def test_planning_totals_invalidated_by_ending_session(self, mock_get_conn):
+        """Ending a planning session should invalidate cached planning totals."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"total_sessions": 1}
+
+        database.get_planning_totals(30)
+        database.get_planning_totals(30)
+        assert mock_cursor.execute.call_count == 1
+
+        database.end_planning_session(42, {})
+        database.get_planning_totals(30)
+        assert mock_cursor.execute.call_count == 3
+
+
+    @patch("database.get_connection")
+    def test_cache_size_bounded(self, mock_get_conn):
+        """Should evict the oldest entry instead of growing past MAX_ENTRIES."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"date": "2026-01-01", "avg_commits": 1}]
+
+        with patch.object(database.QueryCacheConfig, "MAX_ENTRIES", 3):
+            for name in ("a", "b", "c", "d"):
+                database.get_repo_history(name)
+
+            assert len(database._query_cache) == 3
+            database.get_repo_history("a")
+            assert mock_cursor.execute.call_count == 5
+
+    @patch("database.get_connection")
+    def test_inbox_trends_invalidated_by_inbox_store(self, mock_get_conn):
+        """Should re-query inbox trends after a new inbox snapshot."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"date": "2026-01-01", "account": "work"}]
+
+        database.get_inbox_trends(7)
+        database.get_inbox_trends(7)
+        with patch("database.execute_values"):
+            database.store_inbox_snapshot([{"account": "work"}])
+        database.get_inbox_trends(7)
+
+        select_calls = [c for c in mock_cursor.execute.call_args_list if "SELECT" in c[0][0]]
+        assert len(select_calls) == 2
+
+
+    @patch("database.get_connection")
+    def test_reference_data_invalidated_by_config_write(self, mock_get_conn):
+        """Should cache configuration reads until a configuration table changes."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"code": "run", "base_xp": 10}]
+
+        database.get_activity_types()
+        database.get_activity_types()
+        assert mock_cursor.execute.call_count == 1
+
+        database.upsert_activity_type({"code": "run"})
+        database.get_activity_types()
+        assert mock_cursor.execute.call_count == 3
+
+    @patch("database.get_connection")
+    def test_snapshot_store_keeps_reference_cache(self, mock_get_conn):
+        """Should only invalidate the cache domain a write affects."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"code": "run", "base_xp": 10}]
+
+        database.get_activity_types()
+        database.store_todoist_snapshot([{"project": "Home"}])
+        database.get_activity_types()
+
+        select_calls = [c for c in mock_cursor.execute.call_args_list if "FROM activity_types" in c[0][0]]
+        assert len(select_calls) == 1
+
+    @pytest.mark.parametrize("func_name", [
+        "get_notification_stats", "get_email_fetch_stats", "get_attachment_stats",
+    ])
+    @patch("database.get_connection")
+    def test_history_stats_cached(self, mock_get_conn, func_name):
+        """Should aggregate history stats at most once per TTL window."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"total_attachments": 2}
+
+        first = getattr(database, func_name)()
+        assert getattr(database, func_name)() == first
+        assert mock_cursor.execute.call_count == 1
+
+
+class TestFetchJsonAgg:
+    """Test history listings aggregated to JSON server-side."""
+
+    @pytest.mark.parametrize("func_name,order_by", [
+        ("get_notification_history", "sent_at DESC"),
+        ("get_job_runs", "started_at DESC"),
+        ("get_email_fetch_logs", "logged_at DESC"),
+    ])
+    @patch("database.get_connection")
+    def test_rows_parsed_from_json_array(self, mock_get_conn, func_name, order_by):
+        """Should wrap the listing in json_agg and parse the single result."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"rows": '[{"id": 2}, {"id": 1}]'}
+
+        result = getattr(database, func_name)()
+
+        sql = mock_cursor.execute.call_args[0][0]
+        assert f"json_agg(t ORDER BY {order_by})" in sql
+        assert result == [{"id": 2}, {"id": 1}]
+        mock_cursor.fetchall.assert_not_called()
+
+    @patch("database.get_connection")
+    def test_timestamps_and_decimals_restored(self, mock_get_conn):
+        """Should return datetimes and Decimals like a regular cursor would."""
+        import database
+        from datetime import datetime
+        from decimal import Decimal
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"rows": json.dumps([{
+            "id": 1, "started_at": "2026-01-05T09:30:00.1234",
+            "completed_at": None, "duration_seconds": "12.50",
+        }])}
+
+        row = database.get_job_runs()[0]
+
+        assert "duration_seconds::text AS duration_seconds" in mock_cursor.execute.call_args[0][0]
+        assert row["started_at"] == datetime(2026, 1, 5, 9, 30, 0, 123400)
+        assert row["completed_at"] is None
+        assert row["duration_seconds"] == Decimal("12.50")
+        assert str(row["duration_seconds"]) == "12.50"
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_loads_with_or_without_orjson(self, use_orjson):
+        """Should parse server JSON the same with or without orjson."""
+        import database
+
+        with patch.object(database, "orjson", database.orjson if use_orjson else None):
+            assert database._loads_json('[{"a": null}]') == [{"a": None}]
+
+
+class TestWriteBehindHistory:
+    """Test queued history logging through the background writer."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_queued_rows_written_in_one_batch(self, mock_get_conn, mock_execute_values):
+        """Should write a burst of queued rows with one commit, grouped by table."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.queue_notification_log("ntfy", "inbox", "Title", "Body", "normal", True)
+        database.queue_email_fetch_log("work", "fetch", "3 unread", True)
+        database.queue_notification_log("slack", "school", "Title", "Body", "high", False, "timeout")
+        database.flush_history_writes()
+
+        tables = {c[0][1].split()[2]: c[0][2] for c in mock_execute_values.call_args_list}
+        assert tables == {
+            "notification_history": [
+                ("ntfy", "inbox", "Title", "Body", "normal", True, None, None),
+                ("slack", "school", "Title", "Body", "high", False, "timeout", None),
+            ],
+            "email_fetch_logs": [("work", "fetch", "3 unread", True, None)],
+        }
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_queueing_does_not_touch_database(self, mock_get_conn):
+        """Should return before the row is written."""
+        import database
+
+        _mock_connection(mock_get_conn)
+        release = threading.Event()
+        with patch("database.time.sleep", side_effect=lambda _: release.wait(5)):
+            database.queue_email_fetch_log("work", "fetch", "ok", True)
+            mock_get_conn.assert_not_called()
+            release.set()
+            database.flush_history_writes()
+
+        mock_get_conn.assert_called_once()
+
+
+class TestSearchAttachmentContent:
+    """Test attachment full-text search."""
+
+    @patch("database.get_connection")
+    def test_searches_stored_tsvector(self, mock_get_conn):
+        """Should match and rank on the stored content_tsv column."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"id": 1}]
+
+        assert database.search_attachment_content("permission slip", account="home") == [{"id": 1}]
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "a.content_tsv @@ q.query" in sql
+        assert "to_tsvector" not in sql
+        assert "ORDER BY rank DESC" in sql
+        assert params == ["permission slip", 30, "home", 50]
+
+
+class TestStatsGroupingSets:
+    """Test two-way stats breakdowns come from a single query."""
+
+    @patch("database.get_connection")
+    def test_notification_stats_split_by_grouping(self, mock_get_conn):
+        """Should build both breakdowns from one GROUPING SETS result."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([
+            {"channel": "ntfy", "source": None, "is_channel": True,
+             "total": 3, "successful": 2, "failed": 1},
+            {"channel": None, "source": "inbox", "is_channel": False,
+             "total": 3, "successful": 2, "failed": 1},
+        ])
+
+        stats = database.get_notification_stats(7)
+
+        mock_cursor.execute.assert_called_once()
+        assert "GROUPING SETS ((channel), (source))" in mock_cursor.execute.call_args[0][0]
+        assert stats == {
+            "by_channel": {"ntfy": {"channel": "ntfy", "total": 3, "successful": 2, "failed": 1}},
+            "by_source": {"inbox": 3},
+            "days": 7,
+        }
+
+    @patch("database.get_connection")
+    def test_email_fetch_stats_split_by_grouping(self, mock_get_conn):
+        """Should build per-account and per-operation stats from one query."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([
+            {"account": "work", "operation": None, "is_account": True,
+             "total_ops": 4, "successful": 4, "failed": 0, "last_fetch": "t"},
+            {"account": None, "operation": "fetch", "is_account": False,
+             "total_ops": 4, "successful": 4, "failed": 0, "last_fetch": "t"},
+        ])
+
+        stats = database.get_email_fetch_stats(24)
+
+        mock_cursor.execute.assert_called_once()
+        assert stats["by_account"]["work"]["total_ops"] == 4
+        assert stats["by_operation"] == {"fetch": {"operation": "fetch", "count": 4, "successful": 4}}
+
+
+class TestBulkLookups:
+    """Test ANY()/unnest-based multi-key lookups."""
+
+    @patch("database.get_connection")
+    def test_activity_types_by_codes(self, mock_get_conn):
+        """Should fetch every code with one ANY() query, keyed by code."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([{"code": "run"}, {"code": "gym"}])
+
+        result = database.get_activity_types_by_codes(("run", "gym"))
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "code = ANY(%s)" in sql
+        assert params == (["run", "gym"],)
+        assert result == {"run": {"code": "run"}, "gym": {"code": "gym"}}
+
+    @patch("database.get_connection")
+    def test_attachments_for_messages_grouped(self, mock_get_conn):
+        """Should fetch all pairs in one query and group by (account, message_id)."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([
+            {"account": "work", "message_id": "m1", "filename": "a.pdf"},
+            {"account": "work", "message_id": "m1", "filename": "b.pdf"},
+            {"account": "home", "message_id": "m2", "filename": "c.txt"},
+        ])
+
+        result = database.get_attachments_for_messages([("work", "m1"), ("home", "m2")])
+
+        mock_cursor.execute.assert_called_once()
+        assert mock_cursor.execute.call_args[0][1] == (["work", "home"], ["m1", "m2"])
+        assert result == {
+            ("work", "m1"): [{"filename": "a.pdf"}, {"filename": "b.pdf"}],
+            ("home", "m2"): [{"filename": "c.txt"}],
+        }
+
+    @patch("database.get_connection")
+    def test_empty_input_skips_query(self, mock_get_conn):
+        """Should not touch the database for empty key lists."""
+        import database
+
+        assert database.get_activity_types_by_codes([]) == {}
+        assert database.get_attachments_for_messages([]) == {}
+        mock_get_conn.assert_not_called()
+
+
+class TestEmailFetchLogSummaries:
+    """Test the narrow email fetch log listing."""
+
+    @patch("database.get_connection")
+    def test_summary_leaves_out_text_columns(self, mock_get_conn):
+        """Should select only the summary columns with the usual filters."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"rows": "[]"}
+
+        database.get_email_fetch_log_summaries(account="work", hours=6, limit=10)
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "SELECT id, account, operation, success, logged_at" in sql
+        assert "details" not in sql and "error_message" not in sql
+        assert params == [6, "work", 10]
+
+    @patch("database.get_connection")
+    def test_detail_by_id(self, mock_get_conn):
+        """Should load one full entry by ID."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"id": 5, "details": "3 unread"}
+
+        assert database.get_email_fetch_log(5) == {"id": 5, "details": "3 unread"}
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "error_message" in sql
+        assert params == (5,)
+
+
+class TestConvertConfigValue:
+    """Test game config value conversion."""
+
+    @pytest.mark.parametrize("value,data_type,expected", [
+        ("5", "integer", 5),
+        ("1.5", "float", 1.5),
+        ("Yes", "boolean", True),
+        ("off", "boolean", False),
+        ('{"a": [1]}', "json", {"a": [1]}),
+        ("hello", "string", "hello"),
+        ("raw", None, "raw"),
+    ])
+    def test_converts_by_data_type(self, value, data_type, expected):
+        """Should convert by declared type and pass unknown types through."""
+        import database
+
+        assert database._convert_config_value(value, data_type) == expected
+
+
+class TestReferenceBundle:
+    """Test get_reference_bundle single round-trip fetch."""
+
+    @patch("database.get_connection")
+    def test_bundle_partitioned_by_table(self, mock_get_conn):
+        """Should fetch every reference table in one execute and key rows by table."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([
+            {"t": "activity_types", "j": [{"code": "run"}]},
+            {"t": "kanban_columns", "j": [{"code": "backlog"}]},
+            {"t": "priority_levels", "j": []},
+            {"t": "xp_rules", "j": []},
+            {"t": "game_config", "j": [
+                {"key": "DURATION_BONUS_MAX", "value": "25", "data_type": "integer"},
+            ]},
+        ])
+
+        bundle = database.get_reference_bundle()
+
+        mock_cursor.execute.assert_called_once_with(database._REFERENCE_BUNDLE_SQL)
+        assert bundle["activity_types"] == [{"code": "run"}]
+        assert bundle["kanban_columns"] == [{"code": "backlog"}]
+        assert bundle["priority_levels"] == []
+        assert bundle["game_config"] == {"DURATION_BONUS_MAX": 25}
+
+    @patch("database.get_connection")
+    def test_bundle_error_returns_empty(self, mock_get_conn):
+        """Should return an empty dict when the query fails."""
+        import database
+
+        mock_get_conn.side_effect = Exception("boom")
+
+        assert database.get_reference_bundle() == {}
+
+
+class TestStoreLinearSnapshot:
+    """Test store_linear_snapshot JSON adaptation."""
+
+    @patch("database.get_connection")
+    def test_status_counts_passed_as_json(self, mock_get_conn):
+        """Should pass status counts as psycopg2 Json adapters."""
+        import database
+        from psycopg2.extras import Json
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_linear_snapshot(
+            [{"id": 1}, {"id": 2}],
+            {"Todo": [{"id": 1}], "Done": [{"id": 2}]}
+        )
+
+        total, by_status, by_assignee = mock_cursor.execute.call_args[0][1]
+        assert total == 2
+        assert isinstance(by_status, Json)
+        assert by_status.adapted == {"Todo": 1, "Done": 1}
+        assert by_assignee.adapted == {}
+
+
+class TestStoreInboxSchoolSnapshots:
+    """Test store_inbox_snapshot and store_school_snapshot batching."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_inbox_accounts_in_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should insert every account through a single execute_values call."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_inbox_snapshot([
+            {"account": "work", "name": "Work", "total_unread": 4,
+             "urgent": [{}], "from_people": [{}, {}], "newsletters": 1, "status": "ok"},
+            {"account": "home"},
+        ])
+
+        mock_execute_values.assert_called_once()
+        assert mock_execute_values.call_args[0][2] == [
+            ("work", "Work", 4, 1, 2, 1, "ok"),
+            ("home", "", 0, 0, 0, 0, "unknown"),
+        ]
+        mock_cursor.execute.assert_called_once_with(database._ASYNC_COMMIT_SQL)
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_school_children_in_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should insert every child through a single execute_values call."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_school_snapshot(
+            {"Ada": {"emails": 3, "actions": 1}, "Ben": {}},
+            {"HIGH": 2, "INFO": 5},
+        )
+
+        mock_execute_values.assert_called_once()
+        assert mock_execute_values.call_args[0][2] == [
+            ("Ada", 3, 1, 2, 0, 0, 5),
+            ("Ben", 0, 0, 2, 0, 0, 5),
+        ]
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_many_accounts_use_copy(self, mock_get_conn, mock_execute_values):
+        """Should stream large inbox snapshots through COPY."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_inbox_snapshot(
+            [{"account": f"acct-{i}"} for i in range(database.SnapshotConfig.COPY_MIN_ROWS)]
+        )
+
+        mock_execute_values.assert_not_called()
+        sql, buf = mock_cursor.copy_expert.call_args[0]
+        assert "COPY dashboard_inbox_snapshots" in sql
+        assert buf.getvalue().splitlines()[0] == "acct-0\t\t0\t0\t0\t0\tunknown"
+
+    @patch("database.get_connection")
+    def test_empty_input_skips_database(self, mock_get_conn):
+        """Should not touch the database when there is nothing to store."""
+        import database
+
+        database.store_inbox_snapshot([])
+        database.store_school_snapshot({}, {})
+
+        mock_get_conn.assert_not_called()
+
+
+class TestUpdateDailyStats:
+    """Test update_daily_stats aggregation."""
+
+    @patch("database.get_connection")
+    def test_aggregates_from_latest_snapshots_in_sql(self, mock_get_conn):
+        """Should aggregate today's latest snapshots in a single upsert."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.update_daily_stats()
+
+        sql = mock_cursor.execute.call_args_list[0][0][0]
+        assert "FROM dashboard_git_snapshots" in sql
+        assert "FROM dashboard_todoist_snapshots" in sql
+        assert "INSERT INTO dashboard_daily_stats" in sql
+        assert "ON CONFLICT (stat_date)" in sql
+
+    @patch("database.get_connection")
+    def test_refreshes_daily_rollups(self, mock_get_conn):
+        """Should refresh every daily trend rollup after committing stats."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.update_daily_stats()
+
+        refreshes = [c[0][0] for c in mock_cursor.execute.call_args_list[1:]]
+        assert refreshes == [
+            f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}"
+            for view in ("dashboard_git_daily", "dashboard_todoist_daily", "dashboard_kanban_daily")
+        ]
+        assert mock_get_conn.call_args_list[-1] == call(autocommit=True)
+        mock_conn.commit.assert_called_once()
+
+
+class TestRefreshDailyRollups:
+    """Test the throttled daily rollup refresh."""
+
+    @patch("database.get_connection")
+    def test_refresh_throttled_per_view(self, mock_get_conn):
+        """Should skip views refreshed within the refresh interval."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database._refresh_daily_rollups()
+        database._refresh_daily_rollups()
+
+        assert mock_cursor.execute.call_count == len(database._DAILY_ROLLUPS)
+
+    @patch("database.get_connection")
+    def test_failure_logged_and_retried(self, mock_get_conn):
+        """Should log a failed refresh without raising and retry it next call."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.execute.side_effect = [None, Exception("lock timeout"), None, None]
+
+        with patch("database.logger") as mock_logger:
+            database._refresh_daily_rollups()
+            database._refresh_daily_rollups()
+
+        assert "dashboard_todoist_daily" in mock_logger.error.call_args[0][0]
+        retried = [c[0][0] for c in mock_cursor.execute.call_args_list[2:]]
+        assert retried == [
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_todoist_daily",
+            "REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_kanban_daily",
+        ]
+
+
+class TestStoreRefreshSnapshots:
+    """Test store_refresh_snapshots connection reuse and batching."""
+
+    @staticmethod
+    def _render_sql(mock_cursor):
+        """Have mogrify return the statement text so batches can be inspected."""
+        mock_cursor.mogrify.side_effect = lambda sql, params=None: sql.encode()
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_single_batch_for_all_sources(self, mock_get_conn, mock_execute_values):
+        """Should send every snapshot and the daily stats as one batch on one connection."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+
+        database.store_refresh_snapshots(
+            git_repos=[{"name": "repo-a", "commit_count": 1}],
+            todoist_tasks=[{"project": "Inbox"}],
+            kanban_by_column={"backlog": [{}]},
+            linear_issues=[],
+            linear_by_status={},
+        )
+
+        # One connection for the writes, one for the trend view refresh
+        assert mock_get_conn.call_args_list == [call(), call(autocommit=True)]
+        assert isinstance(mock_execute_values.call_args[0][0], database._StatementBatch)
+        batch_sql, *refresh_sql = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        statements = batch_sql.split(b";")
+        assert statements[0] == database._ASYNC_COMMIT_SQL.encode()
+        assert b"INSERT INTO dashboard_todoist_snapshots" in statements[1]
+        assert b"INSERT INTO dashboard_kanban_snapshots" in statements[2]
+        assert b"INSERT INTO dashboard_linear_snapshots" in statements[3]
+        assert b"INSERT INTO dashboard_daily_stats" in statements[4]
+        assert all(sql.startswith("REFRESH MATERIALIZED VIEW") for sql in refresh_sql)
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_copy_flushes_queued_statements_first(self, mock_get_conn):
+        """Should send queued statements before a large git COPY."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+        calls = []
+        mock_cursor.execute.side_effect = lambda sql, *a: calls.append("execute")
+        mock_cursor.copy_expert.side_effect = lambda sql, buf: calls.append("copy")
+
+        batch = database._StatementBatch(mock_cursor)
+        batch.execute("SELECT 1")
+        batch.copy_expert("COPY t FROM STDIN", None)
+        batch.flush()
+
+        assert calls == ["execute", "copy"]
+
+    @patch("database.get_connection")
+    def test_skips_missing_sources(self, mock_get_conn):
+        """Should only write the daily stats when no sources are given."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+
+        database.store_refresh_snapshots()
+
+        batch_sql = mock_cursor.execute.call_args_list[0][0][0]
+        assert batch_sql.split(b";")[1].lstrip().startswith(b"WITH latest_git")
+        # No snapshots were written, so no trend view needs refreshing
+        assert mock_cursor.execute.call_count == 1
+        mock_get_conn.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_refreshes_only_written_rollups(self, mock_get_conn):
+        """Should only refresh the trend views whose snapshots were stored."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+
+        database.store_refresh_snapshots(kanban_by_column={"backlog": []})
+
+        refreshes = [c[0][0] for c in mock_cursor.execute.call_args_list[1:]]
+        assert refreshes == ["REFRESH MATERIALIZED VIEW CONCURRENTLY dashboard_kanban_daily"]
+
+    @patch("database.get_connection")
+    def test_refresh_failure_keeps_snapshots(self, mock_get_conn):
+        """Should not raise when only the trend view refresh fails."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+        mock_cursor.execute.side_effect = [None, Exception("refresh failed")]
+
+        database.store_refresh_snapshots(todoist_tasks=[])
+
+        mock_conn.commit.assert_called_once()
+        mock_conn.rollback.assert_not_called()
+
+    @patch("database.get_connection")
+    def test_rolls_back_and_raises_on_failure(self, mock_get_conn):
+        """Should roll back the whole refresh and re-raise on error."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        self._render_sql(mock_cursor)
+        mock_cursor.execute.side_effect = Exception("insert failed")
+
+        with pytest.raises(Exception, match="insert failed"):
+            database.store_refresh_snapshots(todoist_tasks=[])
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+
+class TestStoreKanbanSnapshot:
+    """Test store_kanban_snapshot column counts."""
+
+    @patch("database.get_connection")
+    def test_column_counts_and_total(self, mock_get_conn):
+        """Should count known columns and total every column."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.store_kanban_snapshot({
+            "backlog": [{}, {}],
+            "in-progress": [{}],
+            "archived": [{}],
+        })
+
+        params = mock_cursor.execute.call_args[0][1]
+        assert params == (2, 0, 1, 0, 0, 4)
+
+
+class TestPlanningBulkInserts:
+    """Test multi-row planning inserts."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_messages_return_ids_from_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should insert every message with RETURNING and hand back the IDs."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_execute_values.return_value = [{"id": 11}, {"id": 12}]
+
+        ids = database.insert_planning_messages(42, [
+            {"role": "user", "content": "plan my day"},
+            {"role": "assistant", "content": "sure", "tokens_used": 20},
+        ])
+
+        assert ids == [11, 12]
+        args, kwargs = mock_execute_values.call_args
+        assert "RETURNING id" in args[1]
+        assert args[2] == [(42, "user", "plan my day", None), (42, "assistant", "sure", 20)]
+        assert kwargs["fetch"] is True
+        mock_conn.commit.assert_called_once()
+
+    def test_actions_in_fresh_process_load_psycopg2_first(self, monkeypatch):
+        """Should not touch Json before get_connection() has loaded psycopg2."""
+        import database
+        from contextlib import contextmanager
+
+        monkeypatch.setattr(database, "_psycopg2_loaded", False)
+        monkeypatch.setattr(database, "Json", None)
+        mock_conn = MagicMock()
+
+        @contextmanager
+        def fresh_get_connection(autocommit=False):
+            database._load_psycopg2()
+            monkeypatch.setattr(database, "execute_values", Mock(return_value=[{"id": 3}]))
+            yield mock_conn
+
+        monkeypatch.setattr(database, "get_connection", fresh_get_connection)
+
+        ids = database.insert_planning_actions(1, [{"action_type": "x", "details": {}}])
+
+        assert ids == [3]
+        assert database.execute_values.call_args[0][2][0][5].adapted == {}
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_actions_return_ids_and_invalidate_cache(self, mock_get_conn, mock_execute_values):
+        """Should insert every action in one statement and invalidate cached analytics."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_execute_values.return_value = [{"id": 7}]
+
+        with patch("database.invalidate_query_cache") as mock_invalidate:
+            ids = database.insert_planning_actions(42, [
+                {"action_type": "defer", "details": {"days": 1}},
+            ])
+
+        assert ids == [7]
+        row = mock_execute_values.call_args[0][2][0]
+        assert row[:5] == (42, "defer", None, None, None)
+        assert row[5].adapted == {"days": 1}
+        mock_invalidate.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_empty_input_skips_database(self, mock_get_conn):
+        """Should return no IDs without touching the database."""
+        import database
+
+        assert database.insert_planning_messages(42, []) == []
+        assert database.insert_planning_actions(42, []) == []
+        mock_get_conn.assert_not_called()
+
+
+class TestSprintBulkFetches:
+    """Test multi-sprint related-data fetches."""
+
+    @pytest.mark.parametrize("func_name,table", [
+        ("get_sprint_activities_bulk", "overnight_activity"),
+        ("get_sprint_decisions_bulk", "overnight_decisions"),
+        ("get_sprint_deviations_bulk", "overnight_deviations"),
+    ])
+    @patch("database.get_connection")
+    def test_one_query_grouped_by_sprint(self, mock_get_conn, func_name, table):
+        """Should fetch every sprint's rows in one query and group them by sprint."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [
+            {"sprint_id": 1, "what": "a"},
+            {"sprint_id": 1, "what": "b"},
+            {"sprint_id": 3, "what": "c"},
+        ]
+
+        result = getattr(database, func_name)([1, 2, 3])
+
+        assert result == {1: [{"what": "a"}, {"what": "b"}], 3: [{"what": "c"}]}
+        sql, params = mock_cursor.execute.call_args[0]
+        assert f"FROM {table}" in sql
+        assert "sprint_id = ANY(%s)" in sql
+        assert params == ([1, 2, 3],)
+
+    @patch("database.get_connection")
+    def test_no_ids_skips_database(self, mock_get_conn):
+        """Should return an empty mapping without querying."""
+        import database
+
+        assert database.get_sprint_activities_bulk([]) == {}
+        mock_get_conn.assert_not_called()
+
+
+class TestSprintBulkInserts:
+    """Test batched overnight sprint child-record inserts."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_activities_inserted_in_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should insert every activity with one execute_values call and commit."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        assert database.insert_sprint_activities_bulk(7, [
+            {"activity_at": "t1", "activity_type": "progress", "what": "a"},
+            {"activity_at": "t2", "activity_type": "blocked", "what": "b", "why": "x"},
+        ])
+
+        mock_execute_values.assert_called_once()
+        assert mock_execute_values.call_args[0][2] == [
+            (7, "t1", "progress", "a", None, None),
+            (7, "t2", "blocked", "b", "x", None),
+        ]
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_empty_list_skips_database(self, mock_get_conn):
+        """Should not open a connection when there is nothing to insert."""
+        import database
+
+        assert database.insert_sprint_deviations_bulk(7, [])
+        mock_get_conn.assert_not_called()
+
+    @patch("database.insert_sprint_decisions_bulk")
+    def test_single_row_wrapper_delegates(self, mock_bulk):
+        """Single-row insert should delegate to the bulk variant."""
+        import database
+
+        database.insert_sprint_decision(7, "t1", "Which?", decision="This")
+
+        sprint_id, rows = mock_bulk.call_args[0]
+        assert sprint_id == 7
+        assert rows[0]["question"] == "Which?"
+        assert rows[0]["decision"] == "This"
+
+
+class TestUpsertSprint:
+    """Test upsert_sprint statement shape."""
+
+    @patch("database.get_connection")
+    def test_row_form_update_matches_parameters(self, mock_get_conn):
+        """Should bind one parameter per column and keep the sprint window on update."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"id": 5}
+
+        assert database.upsert_sprint({"date": "2026-01-30"}, {}) == 5
+
+        prepare_sql, (execute_sql, params) = (
+            mock_cursor.execute.call_args_list[0][0][0],
+            mock_cursor.execute.call_args_list[1][0],
+        )
+        assert f"${len(database._SPRINT_COLUMNS)}," in prepare_sql
+        assert len(params) == len(database._SPRINT_COLUMNS)
+        update_clause = prepare_sql.split("DO UPDATE SET")[1]
+        assert "window_start" not in update_clause
+        assert "EXCLUDED.obsidian_path, NOW())" in update_clause
+
+
+class TestPreparedStatements:
+    """Test server-side prepared statement reuse."""
+
+    @patch("database.get_connection")
+    def test_prepared_once_per_connection(self, mock_get_conn):
+        """Should PREPARE on first use and only EXECUTE afterwards."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"id": 1}
+
+        database.insert_planning_message(42, "user", "hello")
+        database.insert_planning_message(42, "assistant", "hi", 10)
+
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert len(statements) == 3
+        assert statements[0].startswith("PREPARE insert_planning_message AS")
+        assert "VALUES ($1, $2, $3, $4)" in statements[0]
+        assert statements[1] == statements[2] == "EXECUTE insert_planning_message (%s, %s, %s, %s)"
+        assert mock_cursor.execute.call_args_list[2][0][1] == (42, "assistant", "hi", 10)
+
+    @patch("database.get_connection")
+    def test_new_connection_prepares_again(self, mock_get_conn):
+        """Should PREPARE again on a connection that has not seen the statement."""
+        import database
+
+        for _ in range(2):
+            mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+            mock_cursor.connection = mock_conn
+            mock_cursor.fetchone.return_value = {"id": 1}
+
+            database.insert_planning_action(42, "defer")
+
+            assert mock_cursor.execute.call_args_list[0][0][0].startswith(
+                "PREPARE insert_planning_action AS"
+            )
+
+
+    @pytest.mark.parametrize("func_name,args,statement", [
+        ("get_activity_type", ("run",), "get_activity_type"),
+        ("get_last_successful_run", ("daily-digest",), "get_last_successful_run"),
+        ("get_email_content_for_processing", ("work", "msg-1"), "get_email_content"),
+    ])
+    @patch("database.get_connection")
+    def test_hot_lookups_prepared(self, mock_get_conn, func_name, args, statement):
+        """Should run hot single-row lookups through prepared statements."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = None
+
+        getattr(database, func_name)(*args)
+
+        statements = [c[0][0] for c in mock_cursor.execute.call_args_list]
+        assert statements[0].startswith(f"PREPARE {statement} AS")
+        assert statements[1] == f"EXECUTE {statement} (%s" + ", %s" * (len(args) - 1) + ")"
+
+
+class TestEndPlanningSession:
+    """Test end_planning_session statement."""
+
+    @patch("database.get_connection")
+    def test_counts_computed_in_single_statement(self, mock_get_conn):
+        """Should compute both counts in one CTE-backed UPDATE."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {
+            "id": 42, "duration_seconds": 60, "messages_count": 3, "actions_count": 1
+        }
+
+        result = database.end_planning_session(42, {"notes": "done"})
+
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        assert sql.lstrip().startswith("WITH counts AS")
+        assert params["id"] == 42
+        assert params["final_state"].adapted == {"notes": "done"}
+        assert result["messages_count"] == 3
+
+
+class TestTransaction:
+    """Test the transaction() context manager."""
+
+    @patch("database.get_connection")
+    def test_commits_once_on_success(self, mock_get_conn):
+        """Should commit once after all statements in the block."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        with database.transaction() as cur:
+            cur.execute("SELECT 1")
+            cur.execute("SELECT 2")
+
+        assert mock_cursor.execute.call_count == 2
+        mock_conn.commit.assert_called_once()
+        mock_conn.rollback.assert_not_called()
+
+    @patch("database.get_connection")
+    def test_rolls_back_on_error(self, mock_get_conn):
+        """Should roll back and re-raise when the block fails."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        with pytest.raises(RuntimeError):
+            with database.transaction():
+                raise RuntimeError("boom")
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+    @patch("database.get_connection")
+    def test_non_durable_skips_wal_flush_wait(self, mock_get_conn):
+        """Should turn off synchronous_commit for the transaction when not durable."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        with database.transaction(durable=False) as cur:
+            cur.execute("INSERT 1")
+
+        assert mock_cursor.execute.call_args_list[0][0][0] == "SET LOCAL synchronous_commit = off"
+        mock_conn.commit.assert_called_once()
+
+
+class TestSaveSprintWithRelated:
+    """Test single-transaction sprint sync."""
+
+    @patch("database.get_connection")
+    def test_all_writes_share_one_commit(self, mock_get_conn):
+        """Should upsert, then clear and insert child rows in one batch, with a single commit."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"id": 7}
+        mock_cursor.mogrify.side_effect = lambda sql, params: b"<" + sql.strip().encode() + b">"
+
+        sprint_id = database.save_sprint_with_related(
+            {"date": "2026-02-01"}, {},
+            [{"activity_at": "t1", "activity_type": "progress", "what": "a"}],
+            [{"decided_at": "t1", "question": "q"}],
+            [],
+        )
+
+        assert sprint_id == 7
+        mock_get_conn.assert_called_once()
+        batch = mock_cursor.execute.call_args_list[-1][0][0]
+        statements = batch.split(b";")
+        assert len(statements) == 3
+        assert b"DELETE FROM overnight_deviations" in statements[0]
+        assert b"INSERT INTO overnight_activity" in statements[1]
+        assert b"INSERT INTO overnight_decisions" in statements[2]
+        assert b"overnight_deviations" not in statements[2]
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_returns_none_and_rolls_back_on_error(self, mock_get_conn):
+        """Should roll back the whole sync when a statement fails."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.execute.side_effect = Exception("db down")
+
+        assert database.save_sprint_with_related({"date": "2026-02-01"}, {}, [], [], []) is None
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+
+class TestClearSprintRelatedData:
+    """Test clear_sprint_related_data statement."""
+
+    @patch("database.get_connection")
+    def test_clears_all_tables_in_one_statement(self, mock_get_conn):
+        """Should delete from all three child tables with a single execute."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        assert database.clear_sprint_related_data(7)
+
+        mock_cursor.execute.assert_called_once()
+        sql, params = mock_cursor.execute.call_args[0]
+        for table in ("overnight_activity", "overnight_decisions", "overnight_deviations"):
+            assert f"DELETE FROM {table}" in sql
+        assert params == {"sprint_id": 7}
+        mock_conn.commit.assert_called_once()
+
+
+class TestRowsReturnedDirectly:
+    """Test read helpers return cursor rows without copying."""
+
+    @pytest.mark.parametrize("func_name,args", [
+        ("get_sprints", ()),
+        ("get_sprint_activities", (7,)),
+        ("get_sprint_decisions", (7,)),
+        ("get_sprint_deviations", (7,)),
+        ("get_planning_sessions", ()),
+        ("get_planning_action_breakdown", ()),
+        ("get_linear_trends", (14,)),
+        ("get_kanban_columns", ()),
+        ("get_priority_levels", ()),
+        ("get_attachments_for_message", ("work", "msg-1")),
+    ])
+    @patch("database.get_connection")
+    def test_fetchall_result_returned(self, mock_get_conn, func_name, args):
+        """Should return the list from fetchall() as-is."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        rows = [{"id": 1}]
+        mock_cursor.fetchall.return_value = rows
+
+        assert getattr(database, func_name)(*args) is rows
+
+
+class TestJsonParameters:
+    """Test JSONB columns are passed as psycopg2 Json adapters."""
+
+    @patch("database.get_connection")
+    def test_planning_action_details(self, mock_get_conn):
+        """Should adapt action details with Json rather than json.dumps."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchone.return_value = {"id": 1}
+
+        database.insert_planning_action(42, "defer", details={"days": 2})
+
+        params = mock_cursor.execute.call_args[0][1]
+        assert params[-1].adapted == {"days": 2}
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_sprint_decision_pal_responses(self, mock_get_conn, mock_execute_values):
+        """Should adapt pal_responses with Json, defaulting to an empty object."""
+        import database
+
+        _mock_connection(mock_get_conn)
+
+        database.insert_sprint_decision(7, "t1", "Which?")
+
+        row = mock_execute_values.call_args[0][2][0]
+        assert row[7].adapted == {}
+
+    @pytest.mark.parametrize("condition,expected", [
+        ({"field": "commits"}, {"field": "commits"}),
+        (None, {}),
+    ])
+    @patch("database.get_connection")
+    def test_xp_rule_condition(self, mock_get_conn, condition, expected):
+        """Should bind the rule condition as a Json adapter without a SQL cast."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+
+        database.upsert_xp_rule({"code": "commits", "condition": condition})
+
+        sql, params = mock_cursor.execute.call_args[0]
+        assert "::jsonb" not in sql
+        assert params["condition"].adapted == expected
+
+
+class TestCheckHealth:
+    """Test check_health probing."""
+
+    @patch("database.psycopg2.connect")
+    def test_probe_uses_dedicated_connection(self, mock_connect):
+        """Should probe on its own short-timeout connection and close it."""
+        import database
+
+        result = database.check_health()
+
+        assert result["healthy"] is True
+        assert "latency_ms" in result
+        assert mock_connect.call_args[1]["connect_timeout"] == database.HealthConfig.PROBE_CONNECT_TIMEOUT
+        mock_connect.return_value.close.assert_called_once()
+
+    @patch("database.psycopg2.connect")
+    def test_recent_success_skips_probe(self, mock_connect):
+        """Should report healthy without probing after recent successful use."""
+        import database
+
+        database._last_ok_at = time.monotonic()
+
+        result = database.check_health()
+
+        assert result["healthy"] is True
+        assert result["cached"] is True
+        mock_connect.assert_not_called()
+
+    @patch("database.psycopg2.connect")
+    def test_cached_and_probed_results_share_keys(self, mock_connect):
+        """Should return the same keys whether or not the probe ran."""
+        import database
+
+        probed = database.check_health()
+        database._last_ok_at = time.monotonic()
+        cached = database.check_health()
+
+        assert probed.keys() == cached.keys()
+        assert probed["cached"] is False
+        assert cached["latency_ms"] == probed["latency_ms"]
+
+    @patch("database.get_connection")
+    @patch("database.psycopg2.connect")
+    def test_probe_failure_reported(self, mock_connect, mock_get_conn):
+        """Should report the error when the probe cannot connect."""
+        import database
+        import psycopg2
+
+        mock_connect.side_effect = psycopg2.OperationalError("timeout expired")
+
+        result = database.check_health()
+
+        assert result["healthy"] is False
+        assert "timeout expired" in result["error"]
+        mock_get_conn.assert_not_called()
+
+
+class TestPoolAcquisition:
+    """Test pool sizing, waiting and PgBouncer mode."""
+
+    def test_pool_size_from_config(self):
+        """Should use configured sizes, keeping min within max."""
+        import database
+        from config_loader import DatabaseConfig
+
+        assert database._pool_size(DatabaseConfig(pool_min=8, pool_max=4)) == (4, 4)
+        assert database._pool_size(DatabaseConfig()) == (
+            min(database.PoolConfig.MIN_CONNECTIONS, database.PoolConfig.MAX_CONNECTIONS),
+            database.PoolConfig.MAX_CONNECTIONS,
+        )
+
+    @patch("database.time.sleep")
+    def test_getconn_retries_until_free(self, mock_sleep):
+        """Should retry while the pool is exhausted and return once a connection frees up."""
+        import database
+        from psycopg2 import pool
+
+        conn_pool = MagicMock(closed=False)
+        conn = MagicMock()
+        conn_pool.getconn.side_effect = [pool.PoolError("connection pool exhausted"), conn]
+
+        assert database._getconn(conn_pool) is conn
+        mock_sleep.assert_called_once_with(database.PoolConfig.GETCONN_RETRY_SECONDS)
+
+    @patch("database.PoolConfig.GETCONN_TIMEOUT_SECONDS", 0)
+    def test_getconn_raises_pool_exhausted(self):
+        """Should raise PoolExhausted once the wait timeout passes."""
+        import database
+        from psycopg2 import pool
+
+        conn_pool = MagicMock(closed=False, maxconn=3)
+        conn_pool.getconn.side_effect = pool.PoolError("connection pool exhausted")
+
+        with pytest.raises(database.PoolExhausted, match="max=3"):
+            database._getconn(conn_pool)
+
+    @patch("database._getconn")
+    def test_get_connection_logs_pool_exhausted(self, mock_getconn):
+        """Should log pool exhaustion before re-raising it to the caller."""
+        import database
+
+        database._connection_pool = MagicMock()
+        mock_getconn.side_effect = database.PoolExhausted("No pooled connection available")
+
+        with patch("database.logger") as mock_logger:
+            with pytest.raises(database.PoolExhausted):
+                with database.get_connection():
+                    pass
+
+        assert "No pooled connection available" in mock_logger.error.call_args[0][0]
+
+    @patch("database.init_pool")
+    @patch("database.psycopg2.connect")
+    @patch("database.get_config")
+    def test_pgbouncer_skips_in_process_pool(self, mock_config, mock_connect, mock_init_pool):
+        """Should connect through PgBouncer without creating a pool or preparing statements."""
+        import database
+        from config_loader import AppConfig, DatabaseConfig
+
+        dsn = "postgresql://localhost:6432/nick"
+        mock_config.return_value = AppConfig(database=DatabaseConfig(pgbouncer_url=dsn))
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.fetchone.return_value = {"id": 1}
+
+        database.insert_planning_message(42, "user", "hello")
+
+        mock_init_pool.assert_not_called()
+        assert mock_connect.call_args[0][0] == dsn
+        sql = mock_cursor.execute.call_args[0][0]
+        assert "INSERT INTO planning_messages" in sql
+        assert "PREPARE" not in sql
+        mock_connect.return_value.close.assert_called_once()
+
+
+class TestDbParams:
+    """Test cached psycopg2 connection parameters."""
+
+    def test_params_built_once_per_config(self):
+        """Should reuse params for the same config and rebuild for a new one."""
+        import database
+        from config_loader import DatabaseConfig
+
+        config = DatabaseConfig(name="a")
+        with patch.object(DatabaseConfig, "to_psycopg2_params",
+                          autospec=True, side_effect=lambda self: {"dbname": self.name}) as mock_params:
+            first = database._db_params(config)
+            assert database._db_params(config) is first
+            assert mock_params.call_count == 1
+
+            assert database._db_params(DatabaseConfig(name="b")) == {"dbname": "b"}
+            assert mock_params.call_count == 2
+
+
+class TestScratchCursor:
+    """Test per-connection cursor reuse."""
+
+    def test_reuses_cursor_until_closed(self):
+        """Should return the same cursor for a connection until it is closed."""
+        import database
+
+        conn = MagicMock()
+        conn.cursor.side_effect = lambda: MagicMock(closed=False)
+
+        first = database._scratch_cursor(conn)
+        assert database._scratch_cursor(conn) is first
+        assert conn.cursor.call_count == 1
+
+        first.closed = True
+        assert database._scratch_cursor(conn) is not first
+        assert conn.cursor.call_count == 2
+
+    def test_forgets_closed_connections(self):
+        """Should drop the cursor when get_connection closes a direct connection."""
+        import database
+
+        conn = MagicMock(closed=True)
+        with patch("database.get_config") as mock_config, \
+                patch("database.psycopg2.connect", return_value=conn):
+            mock_config.return_value.database.pgbouncer_url = "postgresql://bouncer/db"
+            with database.get_connection() as c:
+                database._scratch_cursor(c)
+                assert conn in database._scratch_cursors
+
+        assert conn not in database._scratch_cursors
+
+
+class TestAutocommitReads:
+    """Test read-only blocks run without an explicit transaction."""
+
+    def test_autocommit_reset_on_return(self):
+        """Should enable autocommit for the block and restore it afterwards."""
+        import database
+
+        conn = MagicMock(closed=False, autocommit=False)
+        with patch("database.get_config") as mock_config, \
+                patch("database.psycopg2.connect", return_value=conn):
+            mock_config.return_value.database.pgbouncer_url = "postgresql://bouncer/db"
+            with database.get_connection(autocommit=True) as c:
+                assert c.autocommit is True
+
+        assert conn.autocommit is False
+
+    @patch("database.get_connection")
+    def test_reads_request_autocommit(self, mock_get_conn):
+        """Should check out read-only connections in autocommit mode."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.fetchall.return_value = [{"id": 1}]
+
+        database.get_sprints()
+
+        mock_get_conn.assert_called_once_with(autocommit=True)
+
+
+class TestCursorIteration:
+    """Test keyed lookups are built straight from the cursor."""
+
+    @patch("database.get_connection")
+    def test_game_config_reads_rows_from_cursor(self, mock_get_conn):
+        """Should build the config mapping without a fetchall() list."""
+        import database
+
+        mock_conn, mock_cursor = _mock_connection(mock_get_conn)
+        mock_cursor.__iter__.return_value = iter([
+            {"key": "xp_multiplier", "value": "2", "data_type": "integer"},
+            {"key": "enabled", "value": "true", "data_type": "boolean"},
+        ])
+
+        assert database.get_game_config() == {"xp_multiplier": 2, "enabled": True}
+        mock_cursor.fetchall.assert_not_called()
+
+
+class TestDumpsJson:
+    """Test JSONB parameter serialization."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_int_keys_and_nesting(self, use_orjson):
+        """Should encode int-keyed counters the same with or without orjson."""
+        import database
+
+        with patch.object(database, "orjson", database.orjson if use_orjson else None):
+            encoded = database._dumps_json({1: 2, "nested": [1, {"a": None}]})
+
+        assert json.loads(encoded) == {"1": 2, "nested": [1, {"a": None}]}
@@ -175,6 +175,29 @@ class TestInboxFetcher:
         assert result.status == "error"
         assert "app_password" in result.error.lower()
 
+    def test_fetch_all_accounts_concurrent_keeps_order(self):
+        from email_automation.inbox import InboxFetcher
+        import threading
+
+        config = {"accounts": [{"email": f"a{i}@example.com", "app_password": "x"} for i in range(3)]}
+        fetcher = InboxFetcher(config)
+        barrier = threading.Barrier(3, timeout=5)
+
+        def fake_fetch(account, app_password, name, priority, max_results):
+            from email_automation.inbox.fetcher import AccountInbox
+            barrier.wait()  # only passes if all three run at once
+            inbox = AccountInbox(account=account, name=name, priority=priority, total_unread=1)
+            if account == "a1@example.com":
+                inbox.status, inbox.error = "error", "boom"
+            return inbox
+
+        fetcher.fetch_account = fake_fetch
+        result = fetcher.fetch_all_accounts(store_to_db=False)
+
+        assert [a.account for a in result.accounts] == [f"a{i}@example.com" for i in range(3)]
+        assert result.total_unread == 2
+        assert result.errors == ["a1@example.com: boom"]
+
 
 class TestInboxDigest:
     """Test inbox digest formatting."""
@@ -212,6 +235,133 @@ class TestInboxDigest:
         assert "10 unread" in title
         assert "Test" in body
 
+    def _fetcher(self):
+        from email_automation.inbox import InboxFetcher
+        from email_automation.inbox.fetcher import AccountInbox, FetchResult
+        from datetime import datetime
+        from unittest.mock import Mock
+
+        fetcher = Mock(spec=InboxFetcher)
+        fetcher.fetch_all_accounts.return_value = FetchResult(
+            accounts=[AccountInbox(account="test@example.com", name="Test", priority="high", total_unread=3)],
+            total_unread=3,
+            total_urgent=0,
+            total_duration_ms=100,
+            fetched_at=datetime.now(),
+            errors=[]
+        )
+        return fetcher
+
+    def test_formatters_reuse_one_fetch(self):
+        from email_automation.inbox import InboxDigest
+
+        fetcher = self._fetcher()
+        digest = InboxDigest(fetcher)
+
+        digest.generate()
+        digest.format_for_notification()
+        digest.format_urgent_only()
+        digest.get_summary_stats()
+
+        fetcher.fetch_all_accounts.assert_called_once_with(store_to_db=True)
+
+    def test_unstored_fetch_not_reused_for_store(self):
+        from email_automation.inbox import InboxDigest
+
+        fetcher = self._fetcher()
+        digest = InboxDigest(fetcher)
+
+        digest.get_summary_stats()
+        digest.generate()
+
+        assert [c.kwargs["store_to_db"] for c in fetcher.fetch_all_accounts.call_args_list] == [False, True]
+
+    def test_format_urgent_only_skips_digest_when_quiet(self):
+        from email_automation.inbox import InboxDigest
+        from unittest.mock import patch
+
+        digest = InboxDigest(self._fetcher())
+        with patch.object(digest, "generate") as mock_generate:
+            assert digest.format_urgent_only() is None
+        mock_generate.assert_not_called()
+
+    def test_format_urgent_only_reads_messages(self):
+        from email_automation.inbox import InboxDigest
+        from email_automation.inbox.fetcher import AccountInbox, EmailMessage
+        from unittest.mock import patch
+
+        fetcher = self._fetcher()
+        result = fetcher.fetch_all_accounts.return_value
+        msg = EmailMessage(id="1", subject="Invoice overdue", from_name="Alice",
+                           from_email="alice@example.com", date="")
+        result.accounts = [AccountInbox(account="test@example.com", name="Test",
+                                        priority="high", total_unread=1, urgent=[msg])]
+        result.total_urgent = 1
+
+        digest = InboxDigest(fetcher)
+        with patch.object(AccountInbox, "to_dict") as mock_to_dict:
+            title, body = digest.format_urgent_only()
+            digest.format_for_notification()
+
+        mock_to_dict.assert_not_called()
+        assert title == "1 Urgent Email(s)"
+        assert body == "*Test*: Invoice overdue\n  From: Alice"
+
+    def test_cache_messages_dedupes_urgent_from_people(self):
+        from email_automation.inbox import InboxDigest
+        from email_automation.inbox.fetcher import AccountInbox, EmailMessage
+        from unittest.mock import Mock
+
+        def message(msg_id):
+            return EmailMessage(id=msg_id, subject="s", from_name="n", from_email="e", date="")
+
+        fetcher = self._fetcher()
+        result = fetcher.fetch_all_accounts.return_value
+        result.accounts = [AccountInbox(
+            account="test@example.com", name="Test", priority="high",
+            urgent=[message("1")], from_people=[message("1"), message("2")],
+        )]
+        db_cache = Mock(return_value=True)
+
+        InboxDigest(fetcher, db_cache_messages=db_cache).generate()
+
+        rows = db_cache.call_args[0][0]
+        assert [(r["message_id"], r["is_urgent"]) for r in rows] == [("1", True), ("2", False)]
+
+    def test_per_message_callback_still_supported(self):
+        from email_automation.inbox import InboxDigest
+        from email_automation.inbox.fetcher import AccountInbox, EmailMessage
+        from unittest.mock import Mock
+
+        fetcher = self._fetcher()
+        result = fetcher.fetch_all_accounts.return_value
+        msg = EmailMessage(id="1", subject="s", from_name="n", from_email="e", date="")
+        result.accounts = [AccountInbox(account="test@example.com", name="Test",
+                                        priority="high", urgent=[msg])]
+        db_cache = Mock(side_effect=[Exception("db down")])
+
+        InboxDigest(fetcher, db_cache_message=db_cache).generate()
+
+        db_cache.assert_called_once_with(
+            account="test@example.com", message_id="1", subject="s", from_name="n",
+            from_email="e", date_header="", is_urgent=True, is_from_person=True,
+        )
+
+    def test_invalidate_and_zero_ttl_refetch(self):
+        from email_automation.inbox import InboxDigest
+
+        fetcher = self._fetcher()
+        digest = InboxDigest(fetcher)
+        digest.generate()
+        digest.invalidate()
+        digest.generate()
+        assert fetcher.fetch_all_accounts.call_count == 2
+
+        uncached = InboxDigest(fetcher, cache_ttl=0)
+        uncached.generate()
+        uncached.generate()
+        assert fetcher.fetch_all_accounts.call_count == 4
+
 
 class TestJobRegistry:
     """Test job registry."""
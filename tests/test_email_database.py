@@ -8,8 +8,9 @@ from datetime import datetime
 class TestCacheInboxMessage:
     """Test cache_inbox_message function with body_text parameter."""
 
+    @patch("database.execute_values")
     @patch("database.get_connection")
-    def test_cache_message_with_body_text(self, mock_get_conn):
+    def test_cache_message_with_body_text(self, mock_get_conn, mock_execute_values):
         """Test caching message with full body text."""
         import database
 
@@ -34,18 +35,19 @@ class TestCacheInboxMessage:
         )
 
         assert result is True
-        mock_cursor.execute.assert_called_once()
+        mock_execute_values.assert_called_once()
 
         # Verify body_text is in the SQL parameters
-        call_args = mock_cursor.execute.call_args
-        sql = call_args[0][0]
-        params = call_args[0][1]
+        call_args = mock_execute_values.call_args
+        sql = call_args[0][1]
+        params = call_args[0][2][0]
 
         assert "body_text" in sql
         assert "This is the full email body content." in params
 
+    @patch("database.execute_values")
     @patch("database.get_connection")
-    def test_cache_message_without_body_text(self, mock_get_conn):
+    def test_cache_message_without_body_text(self, mock_get_conn, mock_execute_values):
         """Test caching message without body_text (None default)."""
         import database
 
@@ -68,8 +70,8 @@ class TestCacheInboxMessage:
         assert result is True
 
         # Verify None is passed for body_text
-        call_args = mock_cursor.execute.call_args
-        params = call_args[0][1]
+        call_args = mock_execute_values.call_args
+        params = call_args[0][2][0]
         # body_text should be None (last param before execute)
         assert None in params
 
@@ -108,24 +110,20 @@ class TestGetEmailContentForProcessing:
         mock_conn.__exit__ = Mock(return_value=False)
         mock_get_conn.return_value = mock_conn
 
-        # First query returns message data
-        mock_cursor.fetchone.side_effect = [
-            {
-                "subject": "Test Email",
-                "from_name": "School Office",
-                "from_email": "office@school.com",
-                "body_text": "Dear Parents, please return the form by Friday."
-            }
-        ]
-
-        # Second query returns attachments
-        mock_cursor.fetchall.return_value = [
-            {
-                "filename": "letter.pdf",
-                "content_type": "application/pdf",
-                "extracted_text": "Content from the PDF attachment."
-            }
-        ]
+        # One query returns message data with its attachments aggregated
+        mock_cursor.fetchone.return_value = {
+            "subject": "Test Email",
+            "from_name": "School Office",
+            "from_email": "office@school.com",
+            "body_text": "Dear Parents, please return the form by Friday.",
+            "attachments": [
+                {
+                    "filename": "letter.pdf",
+                    "content_type": "application/pdf",
+                    "text": "Content from the PDF attachment."
+                }
+            ]
+        }
 
         result = database.get_email_content_for_processing(
             account="parent@example.com",
@@ -179,9 +177,9 @@ class TestGetEmailContentForProcessing:
             "subject": "Plain Email",
             "from_name": "Someone",
             "from_email": "someone@example.com",
-            "body_text": "Just text, no attachments."
+            "body_text": "Just text, no attachments.",
+            "attachments": []  # No attachments
         }
-        mock_cursor.fetchall.return_value = []  # No attachments
 
         result = database.get_email_content_for_processing(
             account="test@example.com",
@@ -208,9 +206,9 @@ class TestGetEmailContentForProcessing:
             "subject": "No Body Stored",
             "from_name": "Sender",
             "from_email": "sender@example.com",
-            "body_text": None  # NULL in database
+            "body_text": None,  # NULL in database
+            "attachments": []
         }
-        mock_cursor.fetchall.return_value = []
 
         result = database.get_email_content_for_processing(
             account="test@example.com",
@@ -223,13 +221,14 @@ class TestGetEmailContentForProcessing:
 class TestStoreAttachment:
     """Test store_attachment function."""
 
+    @patch("database.execute_values")
     @patch("database.get_connection")
-    def test_store_attachment_with_text(self, mock_get_conn):
+    def test_store_attachment_with_text(self, mock_get_conn, mock_execute_values):
         """Test storing attachment with extracted text."""
         import database
 
         mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = {"id": 42}
+        mock_execute_values.return_value = [{"id": 42}]
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.__enter__ = Mock(return_value=mock_conn)
@@ -247,15 +246,16 @@ class TestStoreAttachment:
         )
 
         assert result == 42
-        mock_cursor.execute.assert_called_once()
+        mock_execute_values.assert_called_once()
 
+    @patch("database.execute_values")
     @patch("database.get_connection")
-    def test_store_attachment_failed_extraction(self, mock_get_conn):
+    def test_store_attachment_failed_extraction(self, mock_get_conn, mock_execute_values):
         """Test storing attachment with failed extraction."""
         import database
 
         mock_cursor = MagicMock()
-        mock_cursor.fetchone.return_value = {"id": 43}
+        mock_execute_values.return_value = [{"id": 43}]
         mock_conn = MagicMock()
         mock_conn.cursor.return_value = mock_cursor
         mock_conn.__enter__ = Mock(return_value=mock_conn)
@@ -276,6 +276,96 @@ class TestStoreAttachment:
         assert result == 43
 
         # Verify error message is in parameters
-        call_args = mock_cursor.execute.call_args
-        params = call_args[0][1]
+        call_args = mock_execute_values.call_args
+        params = call_args[0][2][0]
         assert "PDF parsing error" in params
+
+
+class TestCacheInboxMessages:
+    """Test cache_inbox_messages batch upsert."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_duplicate_keys_collapsed(self, mock_get_conn, mock_execute_values):
+        """Should write each message once, keeping its last entry and known body."""
+        import database
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = Mock(return_value=mock_conn)
+        mock_conn.__exit__ = Mock(return_value=False)
+        mock_get_conn.return_value = mock_conn
+
+        result = database.cache_inbox_messages([
+            {"account": "work", "message_id": "m1", "is_urgent": True, "body_text": "Body"},
+            {"account": "work", "message_id": "m2"},
+            {"account": "work", "message_id": "m1", "is_urgent": False},
+        ])
+
+        assert result is True
+        rows = mock_execute_values.call_args[0][2]
+        assert [(r[1], r[6], r[8]) for r in rows] == [("m1", False, "Body"), ("m2", False, None)]
+        mock_conn.commit.assert_called_once()
+
+    @patch("database.get_connection")
+    def test_empty_batch_skips_database(self, mock_get_conn):
+        """Should not open a connection for an empty batch."""
+        import database
+
+        assert database.cache_inbox_messages([]) is True
+        mock_get_conn.assert_not_called()
+
+
+class TestStoreAttachments:
+    """Test store_attachments batch upsert."""
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_returns_ids_from_one_statement(self, mock_get_conn, mock_execute_values):
+        """Should insert every attachment in one call and return their IDs."""
+        import database
+
+        mock_conn = MagicMock()
+        mock_conn.__enter__ = Mock(return_value=mock_conn)
+        mock_conn.__exit__ = Mock(return_value=False)
+        mock_get_conn.return_value = mock_conn
+        mock_execute_values.return_value = [{"id": 1}, {"id": 2}]
+
+        result = database.store_attachments([
+            {"account": "work", "message_id": "m1", "filename": "a.pdf"},
+            {"account": "work", "message_id": "m1", "filename": "b.txt"},
+        ])
+
+        assert result == [1, 2]
+        mock_execute_values.assert_called_once()
+        assert mock_execute_values.call_args[1]["fetch"] is True
+
+    @patch("database.execute_values")
+    @patch("database.get_connection")
+    def test_large_batch_copied_then_merged(self, mock_get_conn, mock_execute_values):
+        """Should COPY large batches into a temp table and upsert from it."""
+        import database
+
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = [{"id": i} for i in range(40)]
+        mock_conn = MagicMock()
+        mock_conn.cursor.return_value = mock_cursor
+        mock_conn.__enter__ = Mock(return_value=mock_conn)
+        mock_conn.__exit__ = Mock(return_value=False)
+        mock_get_conn.return_value = mock_conn
+
+        result = database.store_attachments([
+            {"account": "work", "message_id": f"m{i}", "filename": "a.txt",
+             "extracted_text": "line one\nline\ttwo"}
+            for i in range(40)
+        ])
+
+        assert result == list(range(40))
+        mock_execute_values.assert_not_called()
+        copy_sql, buf = mock_cursor.copy_expert.call_args[0]
+        assert copy_sql.startswith("COPY tmp_email_attachments (account, message_id")
+        assert "line one\\nline\\ttwo" in buf.getvalue()
+        merge_sql = mock_cursor.execute.call_args[0][0]
+        assert "SELECT account, message_id" in merge_sql
+        assert "FROM tmp_email_attachments" in merge_sql
+        assert "ON CONFLICT (account, message_id, filename)" in merge_sql
+        mock_conn.commit.assert_called_once()